@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -122,6 +123,22 @@ else:
         }
     }
 
+# Cache
+# Cache match (snapshot hari ini, h2h, leaderboard, jadwal per hari, facet) dibaca
+# ribuan viewer dan diinvalidasi juga dari proses terpisah (advance_match_status),
+# jadi di production cache harus in-memory dan dipakai bersama semua proses:
+# Redis lewat REDIS_URL (mis. redis://localhost:6379/0). Tanpa REDIS_URL
+# (development/test): LocMem per proses (default Django).
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif PRODUCTION:
+    raise ImproperlyConfigured('REDIS_URL wajib diisi di production (cache bersama antar proses).')
 
 
 # Password validation
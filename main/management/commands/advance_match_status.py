@@ -0,0 +1,43 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from matches import scheduler
+
+
+class Command(BaseCommand):
+    # receiver match_status_changed berjalan di proses ini: cache bersama (settings.CACHES)
+    # dan broker PostgreSQL (matches.live) yang membuat efeknya terlihat di worker web
+    help = "Ubah status match (scheduled -> live -> finished) berdasarkan tipoff_at"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Jalan terus setiap --interval detik (untuk dijalankan sebagai proses/worker)",
+        )
+        parser.add_argument("--interval", type=int, default=30, help="Jeda antar putaran (detik)")
+        parser.add_argument(
+            "--duration-minutes",
+            type=int,
+            default=int(scheduler.GAME_DURATION.total_seconds() // 60),
+            help="Lama pertandingan sebelum live dianggap finished",
+        )
+        parser.add_argument("--batch-size", type=int, default=scheduler.BATCH_SIZE)
+
+    def handle(self, *args, **opt):
+        duration = timedelta(minutes=opt["duration_minutes"])
+        while True:
+            counts = scheduler.run(duration=duration, batch_size=opt["batch_size"])
+            if any(counts.values()) or not opt["loop"]:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{counts['live']} match jadi live, {counts['finished']} match jadi finished."
+                ))
+            held = scheduler.overdue(duration=duration).count()
+            if held:
+                self.stdout.write(self.style.WARNING(
+                    f"{held} match live melewati durasi tapi skornya seri; tidak ditutup otomatis."
+                ))
+            if not opt["loop"]:
+                return
+            time.sleep(opt["interval"])
@@ -3,7 +3,8 @@ from datetime import datetime
 from django.core.management.base import BaseCommand, CommandError
 from django.utils.timezone import make_aware, is_naive
 from openpyxl import load_workbook
-from matches.models import Match
+from matches.models import Match, Team
+from matches import signals, standings
 
 class Command(BaseCommand):
     help = "Import dataset matches from Excel (.xlsx)"
@@ -30,6 +31,8 @@ class Command(BaseCommand):
         idx = {name: headers.index(name) for name in headers}
 
         count = 0
+        writes = []  # efek samping (standing, cache, live) dijalankan sekali di akhir
+        teams = {}  # cache nama -> Team supaya tidak query per baris
         for row in ws.iter_rows(min_row=2, values_only=True):
             if not row or all(v is None for v in row):
                 continue
@@ -54,12 +57,15 @@ class Command(BaseCommand):
                 "image_url": row[idx.get("image_url")] or None,
             }
 
-            Match.objects.update_or_create(
-                home_team=home_team,
-                away_team=away_team,
-                tipoff_at=tipoff_at,
-                defaults=defaults,
-            )
+            for name in (home_team, away_team):
+                if name not in teams:
+                    teams[name] = Team.objects.get_or_create(name=name)[0]
+            lookup = {"home_team": teams[home_team], "away_team": teams[away_team], "tipoff_at": tipoff_at}
+            existing = Match.objects.filter(**lookup).first()
+            before = standings.snapshot(existing) if existing else None
+            match, _ = Match.objects.update_or_create(**lookup, defaults=defaults)
+            writes.append((match, before, None))
             count += 1
 
+        signals.matches_written(writes)
         self.stdout.write(self.style.SUCCESS(f"{count} matches berhasil diimport."))
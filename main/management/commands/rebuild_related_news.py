@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from news import related
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang index TF-IDF dan daftar berita terkait dengan IDF terbaru"
+
+    def handle(self, *args, **opt):
+        count = related.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Berita terkait untuk {count} berita dibangun ulang."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from matches import standings
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang tabel Standing dari seluruh match finished"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Hanya bandingkan dengan tabel yang ada, tanpa menulis",
+        )
+
+    def handle(self, *args, **opt):
+        if opt["check"]:
+            problems = standings.diff_all()
+            for (season_id, team_id), detail in problems:
+                self.stdout.write(f"season={season_id} team={team_id}: {detail}")
+            if problems:
+                raise CommandError(f"{len(problems)} baris standing tidak sesuai.")
+            self.stdout.write(self.style.SUCCESS("Standing sudah sesuai."))
+            return
+
+        count = standings.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"{count} baris standing dibangun ulang."))
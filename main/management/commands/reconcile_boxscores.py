@@ -0,0 +1,54 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from matches import reconcile
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Cocokkan total pts box score dengan skor akhir match dan cek made <= attempt"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=50, help="Maksimal baris detail per jenis masalah")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Jalan terus setiap --interval detik (untuk dijalankan sebagai proses/worker)",
+        )
+        parser.add_argument("--interval", type=int, default=60 * 60, help="Jeda antar putaran (detik)")
+
+    def handle(self, *args, **opt):
+        while True:
+            if not opt["loop"]:
+                problems = self.report(opt["limit"])
+                if problems:
+                    raise CommandError(f"{problems} match bermasalah.")
+                return
+            try:
+                self.report(opt["limit"])
+            except Exception as exc:
+                # worker jalan terus; putaran berikutnya memakai koneksi DB baru
+                logger.exception("Rekonsiliasi box score gagal")
+                self.stderr.write(f"Putaran gagal: {exc}")
+                close_old_connections()
+            time.sleep(opt["interval"])
+
+    def report(self, limit):
+        result = reconcile.run(limit)
+        sections = (
+            ("skor", result["scores"], result["score_count"], reconcile.format_score),
+            ("tembakan", result["shooting"], result["shooting_count"], reconcile.format_shooting),
+        )
+        for label, rows, count, fmt in sections:
+            for row in rows:
+                self.stdout.write(fmt(row))
+            if count > len(rows):
+                self.stdout.write(f"... {count - len(rows)} match lain ({label})")
+
+        problems = result["problems"]
+        summary = f"{result['score_count']} match skor tidak cocok, {result['shooting_count']} match made > attempt."
+        self.stdout.write(self.style.ERROR(summary) if problems else self.style.SUCCESS(summary))
+        return problems
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Team, Player, Season, Match
+from .models import Team, Player, Season, Match, MatchPeriod, Standing
 
 @admin.register(Player)
 class PlayerAdmin(admin.ModelAdmin):
@@ -15,4 +15,19 @@ class PlayerAdmin(admin.ModelAdmin):
 
 admin.site.register(Team)
 admin.site.register(Season)
-admin.site.register(Match)
+
+
+class MatchPeriodInline(admin.TabularInline):
+    model = MatchPeriod
+    extra = 0
+
+
+@admin.register(Match)
+class MatchAdmin(admin.ModelAdmin):
+    inlines = [MatchPeriodInline]
+
+@admin.register(Standing)
+class StandingAdmin(admin.ModelAdmin):
+    list_display = ['team', 'season', 'wins', 'losses', 'points_for', 'points_against', 'streak']
+    list_filter = ['season']
+    readonly_fields = ['updated_at']
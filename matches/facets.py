@@ -0,0 +1,87 @@
+# matches/facets.py
+"""
+Facet jumlah match per status ("Scheduled (n) / Live (n) / ...") dan per tim
+untuk hasil pencarian halaman jadwal/hasil.
+
+Semua angka datang dari satu query: GROUP BY pasangan (home, away) dengan
+satu COUNT(... FILTER status=...) per status, lalu dijumlahkan di Python —
+total status = jumlah semua baris, jumlah tim = baris di mana tim itu home
+atau away. Hasil di-cache per kata kunci; karena kata kunci tidak bisa
+di-enumerate, invalidasi menaikkan nomor generasi di key (`invalidate`).
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Match
+
+CACHE_TIMEOUT = 60 * 60
+GENERATION_KEY = "matches:facets:gen"
+
+
+def _generation():
+    gen = cache.get(GENERATION_KEY)
+    if gen is None:
+        cache.add(GENERATION_KEY, 1, None)
+        gen = cache.get(GENERATION_KEY, 1)
+    return gen
+
+
+def cache_key(q, generation):
+    digest = hashlib.md5(q.casefold().encode()).hexdigest()
+    return f"matches:facets:{generation}:{digest}"
+
+
+def compute(qs):
+    """
+    Return {"statuses": [{"status", "label", "count"}], "teams": [{"id", "name", "count"}], "total"}
+    dalam satu query atas `qs`.
+    """
+    rows = (
+        qs.order_by()
+        .values("home_team_id", "home_team__name", "away_team_id", "away_team__name")
+        .annotate(**{
+            status: Count("pk", filter=Q(status=status)) for status in Match.Status.values
+        })
+    )
+    statuses = dict.fromkeys(Match.Status.values, 0)
+    teams = {}
+    for row in rows:
+        games = 0
+        for status in statuses:
+            statuses[status] += row[status]
+            games += row[status]
+        for side in ("home", "away"):
+            team = teams.setdefault(row[f"{side}_team_id"], {
+                "id": row[f"{side}_team_id"], "name": row[f"{side}_team__name"], "count": 0,
+            })
+            team["count"] += games
+
+    return {
+        "statuses": [
+            {"status": status, "label": label, "count": statuses[status]}
+            for status, label in Match.Status.choices
+        ],
+        "teams": sorted(teams.values(), key=lambda t: (-t["count"], t["name"])),
+        "total": sum(statuses.values()),
+    }
+
+
+def for_search(q, search):
+    """Facet untuk kata kunci `q`; `search(qs, q)` = filter pencarian halaman list."""
+    q = (q or "").strip()
+    key = cache_key(q, _generation())
+    data = cache.get(key)
+    if data is None:
+        data = compute(search(Match.objects.all(), q))
+        cache.set(key, data, CACHE_TIMEOUT)
+    return data
+
+
+def invalidate():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # belum pernah dibaca, jadi belum ada yang perlu dibuang
+        pass
@@ -1,6 +1,10 @@
 from django import forms
-from .models import Team, Player, Match, PlayerBoxScore
+from .models import QUARTERS, Team, Player, Match, PlayerBoxScore, period_label, periods_from_fields
+from .schedule_days import day_start
+from django.db import transaction
 from django.db.models import Q
+from datetime import timedelta
+from decimal import Decimal
 
 
 # --- Tambahkan util kelas dark ---
@@ -46,9 +50,41 @@ class PlayerForm(forms.ModelForm):
 # =========================
 # Match
 # =========================
+class TeamNameField(forms.CharField):
+    """
+    Input teks nama tim -> instance Team.
+    Tim yang belum ada dikembalikan sebagai Team baru (belum disimpan) kalau
+    `create=True`; form yang memakainya menyimpan tim itu saat save().
+    """
+
+    def __init__(self, *args, create=False, **kwargs):
+        self.create = create
+        kwargs.setdefault("max_length", 100)
+        super().__init__(*args, **kwargs)
+
+    def prepare_value(self, value):
+        if isinstance(value, Team):
+            return value.name
+        if isinstance(value, int):
+            team = Team.objects.filter(pk=value).only("name").first()
+            return team.name if team else value
+        return value
+
+    def clean(self, value):
+        name = super().clean(value)
+        if not name:
+            return None
+        team = Team.objects.filter(name=name).first()
+        if team is None:
+            if not self.create:
+                raise forms.ValidationError("Tim tidak ditemukan.")
+            team = Team(name=name)
+        return team
+
+
 class MatchForm(forms.ModelForm):
-    home_team = forms.CharField(max_length=100, label="Home Team")
-    away_team = forms.CharField(max_length=100, label="Away Team")
+    home_team = TeamNameField(label="Home Team", create=True)
+    away_team = TeamNameField(label="Away Team", create=True)
 
     class Meta:
         model = Match
@@ -65,12 +101,17 @@ class MatchForm(forms.ModelForm):
         self.fields["away_team"].widget.attrs.update({"placeholder": "Nama tim tandang", "class": _BASE_INPUT})
         self.fields["home_score"].widget.attrs.update({"class": _BASE_INPUT})
         self.fields["away_score"].widget.attrs.update({"class": _BASE_INPUT})
+        if self.instance.pk:
+            # version baris saat form dibuka; save_if_current() menolak kalau sudah basi
+            self.fields["version"] = forms.IntegerField(
+                min_value=1, widget=forms.HiddenInput, initial=self.instance.version
+            )
 
     def clean(self):
         cleaned = super().clean()
         h = cleaned.get("home_team")
         a = cleaned.get("away_team")
-        if h and a and h == a:
+        if h and a and h.name == a.name:
             self.add_error("away_team", "Tim kandang dan tandang tidak boleh sama.")
 
         # Validate negative scores
@@ -83,33 +124,140 @@ class MatchForm(forms.ModelForm):
 
         return cleaned
 
+    def _get_validation_exclusions(self):
+        # tim baru belum punya pk; validasi FK/constraint-nya dilewati, dibuat saat save()
+        exclude = super()._get_validation_exclusions()
+        for name in ("home_team", "away_team"):
+            team = self.cleaned_data.get(name)
+            if team is not None and team.pk is None:
+                exclude.add(name)
+        return exclude
+
+    def _attach_teams(self):
+        for name in ("home_team", "away_team"):
+            team = self.cleaned_data[name]
+            if team.pk is None:
+                team, _ = Team.objects.get_or_create(name=team.name)
+            setattr(self.instance, name, team)
+
+    def save(self, commit=True):
+        if commit:
+            self._attach_teams()
+        return super().save(commit=commit)
+
+    def save_if_current(self):
+        """Simpan edit hanya kalau `version` dari form masih sama dengan di DB; False kalau basi."""
+        self._attach_teams()
+        return super().save(commit=False).save_checked(self.cleaned_data["version"])
+
+
+
+class MatchScoreForm(forms.Form):
+    """
+    Skor per-periode: Q1-Q4, OT yang sudah tersimpan, plus satu slot OT kosong
+    supaya overtime berikutnya selalu bisa ditambahkan (tanpa batas jumlah).
+    Nama field tetap `q1_home`, `ot1_away`, dst.
+    """
+    MAX_OVERTIMES = 20
+
+    # version baris saat form dibuka; dipakai untuk deteksi edit bersamaan (409)
+    version = forms.IntegerField(min_value=1, widget=forms.HiddenInput)
+
+    def __init__(self, data=None, *args, instance=None, **kwargs):
+        super().__init__(data, *args, **kwargs)
+        self.instance = instance
+        existing = {}
+        if instance is not None and instance.pk:
+            existing = {p.number: (p.home_points, p.away_points) for p in instance.periods.all()}
+            self.initial.setdefault("version", instance.version)
+
+        last = max([QUARTERS, *existing, *periods_from_fields(data or {})])
+        overtimes = min(last - QUARTERS + 1, self.MAX_OVERTIMES)
+
+        for number in range(1, QUARTERS + overtimes + 1):
+            label = period_label(number)
+            home, away = existing.get(number, (None, None))
+            for side, value in (("home", home), ("away", away)):
+                self.fields[f"{label}_{side}"] = forms.IntegerField(
+                    label=f"{label.upper()} {side}",
+                    required=False,
+                    min_value=0,
+                    initial=value,
+                    widget=forms.NumberInput(attrs={"min": 0, "step": 1, "class": _BASE_INPUT}),
+                )
+
+class MatchQueryForm(forms.Form):
+    """
+    Filter /matches/api/ (semua opsional). Tanggal = hari kalender lokal, inklusif;
+    `team` cocok dengan tim home maupun away.
+    """
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+    team = forms.IntegerField(required=False, min_value=1)
+    status = forms.ChoiceField(required=False, choices=Match.Status.choices)
+    season = forms.IntegerField(required=False, min_value=1)
+    venue = forms.CharField(required=False, max_length=120)
 
+    def clean(self):
+        cleaned = super().clean()
+        start, end = cleaned.get("date_from"), cleaned.get("date_to")
+        if start and end and start > end:
+            self.add_error("date_to", "date_to tidak boleh sebelum date_from.")
+        return cleaned
 
-class MatchScoreForm(forms.ModelForm):
-    class Meta:
-        model = Match
-        fields = [
-            "q1_home", "q1_away", "q2_home", "q2_away",
-            "q3_home", "q3_away", "q4_home", "q4_away",
-            "ot1_home", "ot1_away", "ot2_home", "ot2_away", "ot3_home", "ot3_away",
-        ]
-        widgets = {
-            k: forms.NumberInput(attrs={"min": 0, "step": 1})
-            for k in [
-                "q1_home","q1_away","q2_home","q2_away","q3_home","q3_away","q4_home","q4_away",
-                "ot1_home","ot1_away","ot2_home","ot2_away","ot3_home","ot3_away",
-            ]
-        }
+    def apply(self, qs):
+        """
+        Terapkan filter yang terisi ke `qs` (panggil setelah is_valid()).
+        Return list queryset untuk keyset_page(): filter `team` dipecah jadi
+        cabang home dan away (bukan OR) supaya masing-masing memakai index
+        (home_team|away_team, tipoff_at) dan tetap urut tanpa sort.
+        """
+        data = self.cleaned_data
+        if data.get("date_from"):
+            qs = qs.filter(tipoff_at__gte=day_start(data["date_from"]))
+        if data.get("date_to"):
+            qs = qs.filter(tipoff_at__lt=day_start(data["date_to"] + timedelta(days=1)))
+        if data.get("status"):
+            qs = qs.filter(status=data["status"])
+        if data.get("season"):
+            qs = qs.filter(season_id=data["season"])
+        if data.get("venue"):
+            qs = qs.filter(venue=data["venue"])
+        if data.get("team"):
+            return [qs.filter(home_team_id=data["team"]), qs.filter(away_team_id=data["team"])]
+        return [qs]
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        for f in self.fields.values():
-            f.widget.attrs.update({"class": _BASE_INPUT})
 
 # =========================
 # Player Box Score
 # =========================
 
+BOXSCORE_STAT_FIELDS = [
+    "pts", "reb", "ast", "stl", "blk", "tov", "pf",
+    "fg_made", "fg_att", "tp_made", "tp_att", "ft_made", "ft_att",
+    "plus_minus",
+]
+
+
+def parse_minutes(raw):
+    """'mm:ss' atau angka menit -> float menit. ValueError kalau format salah."""
+    raw = (raw or "").strip() if isinstance(raw, str) else raw
+    if isinstance(raw, str) and ":" in raw:
+        m, s = map(int, raw.split(":"))
+        if m < 0 or s < 0 or s >= 60:
+            raise ValueError
+        return m + s / 60
+    return float(raw) if raw not in ("", None) else 0.0
+
+
+def shooting_error(cleaned):
+    """Pesan error kalau made > attempt, atau None."""
+    for made, att, label in (("fg_made", "fg_att", "FG"), ("tp_made", "tp_att", "3PT"), ("ft_made", "ft_att", "FT")):
+        if (cleaned.get(made) or 0) > (cleaned.get(att) or 0):
+            return f"{label} made tidak boleh melebihi {label} attempt."
+    return None
+
+
 class PlayerBoxScoreForm(forms.ModelForm):
     # Player sebagai dropdown
     player = forms.ModelChoiceField(
@@ -118,7 +266,7 @@ class PlayerBoxScoreForm(forms.ModelForm):
         label="Player",
         widget=forms.Select(attrs={"class": _BASE_SELECT}),
     )
-    team = forms.CharField(max_length=100, label="Team")
+    team = TeamNameField(label="Team")
 
     def __init__(self, *args, **kwargs):
         self.match = kwargs.pop('match', None)
@@ -126,7 +274,7 @@ class PlayerBoxScoreForm(forms.ModelForm):
         if self.match:
             # Filter player choices to players from home and away teams
             self.fields['player'].queryset = Player.objects.filter(
-                team__in=[self.match.home_team, self.match.away_team]
+                team__in=[self.match.home_team.name, self.match.away_team.name]
             ).order_by("full_name")
     class Meta:
         model = PlayerBoxScore
@@ -178,16 +326,16 @@ class PlayerBoxScoreForm(forms.ModelForm):
         if self.match:
             # Set initial team value if editing
             if self.instance and self.instance.pk:
-                self.initial['team'] = self.instance.team
+                self.initial['team'] = self.instance.team.name
 
     def clean(self):
         cleaned = super().clean()
 
         # --- validasi player di team terpilih ---
-        team_name = cleaned.get("team")
+        team = cleaned.get("team")
         player_obj = cleaned.get("player")
 
-        if not team_name:
+        if not team:
             self.add_error("team", "Masukkan nama tim.")
             return cleaned
 
@@ -196,20 +344,13 @@ class PlayerBoxScoreForm(forms.ModelForm):
             return cleaned
 
         # pastikan pemain di team yang dipilih
-        if player_obj.team != team_name:
+        if player_obj.team != team.name:
             self.add_error("player", "Pemain tidak berada di tim yang dipilih.")
             return cleaned
 
         # --- minutes: izinkan 'mm:ss' atau angka ---
-        raw_minutes = (cleaned.get("minutes") or "").strip()
         try:
-            if isinstance(raw_minutes, str) and ":" in raw_minutes:
-                m, s = map(int, raw_minutes.split(":"))
-                if m < 0 or s < 0 or s >= 60:
-                    raise ValueError
-                minutes = m + s / 60
-            else:
-                minutes = float(raw_minutes) if raw_minutes != "" else 0.0
+            minutes = parse_minutes(cleaned.get("minutes") or "")
         except ValueError:
             self.add_error("minutes", "Gunakan angka atau format mm:ss yang valid, contoh 25:30.")
             return cleaned
@@ -220,20 +361,125 @@ class PlayerBoxScoreForm(forms.ModelForm):
         cleaned["minutes"] = minutes
 
         # --- validasi statistik logis ---
-        fg_made = cleaned.get("fg_made") or 0
-        fg_att  = cleaned.get("fg_att")  or 0
-        tp_made = cleaned.get("tp_made") or 0
-        tp_att  = cleaned.get("tp_att")  or 0
-        ft_made = cleaned.get("ft_made") or 0
-        ft_att  = cleaned.get("ft_att")  or 0
-
-        if fg_made > fg_att:
-            raise forms.ValidationError("FG made tidak boleh melebihi FG attempt.")
-        if tp_made > tp_att:
-            raise forms.ValidationError("3PT made tidak boleh melebihi 3PT attempt.")
-        if ft_made > ft_att:
-            raise forms.ValidationError("FT made tidak boleh melebihi FT attempt.")
+        error = shooting_error(cleaned)
+        if error:
+            raise forms.ValidationError(error)
+
+        return cleaned
+
+
+class BoxScoreRowForm(forms.Form):
+    """
+    Satu baris box score dalam input massal (BulkBoxScoreForm).
+    Pemain divalidasi terhadap `roster` ({pk: Player}) yang dimuat sekali
+    untuk seluruh tim, bukan satu query per baris. Form biasa (bukan
+    ModelForm): instance dibangun sendiri oleh BulkBoxScoreForm, field stat
+    diambil dari model supaya batas nilainya tetap sama.
+    """
+    player = forms.IntegerField()
+    is_starter = forms.BooleanField(required=False)
+    minutes = forms.CharField(required=False)
+
+    def __init__(self, *args, roster=None, **kwargs):
+        self.roster = roster or {}
+        super().__init__(*args, **kwargs)
+        for name in BOXSCORE_STAT_FIELDS:
+            self.fields[name] = PlayerBoxScore._meta.get_field(name).formfield(required=False)
 
+    def clean_player(self):
+        pk = self.cleaned_data["player"]
+        if pk not in self.roster:
+            raise forms.ValidationError("Pemain tidak berada di tim yang dipilih.")
+        return self.roster[pk]
+
+    def clean_minutes(self):
+        try:
+            minutes = parse_minutes(self.cleaned_data.get("minutes"))
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Gunakan angka atau format mm:ss yang valid, contoh 25:30.")
+        if minutes < 0 or minutes >= 100:
+            raise forms.ValidationError("Menit bermain tidak valid.")
+        return Decimal(str(round(minutes, 2)))
+
+    def clean(self):
+        cleaned = super().clean()
+        for name in BOXSCORE_STAT_FIELDS:
+            if cleaned.get(name) is None:
+                cleaned[name] = 0
+        error = shooting_error(cleaned)
+        if error:
+            raise forms.ValidationError(error)
         return cleaned
 
 
+class BulkBoxScoreForm:
+    """
+    Validasi box score satu tim sekaligus (di memori), lalu tulis dengan
+    bulk_create/bulk_update dalam satu transaksi.
+    """
+    VALUE_FIELDS = ["team", "is_starter", "minutes", *BOXSCORE_STAT_FIELDS]
+
+    def __init__(self, match, data):
+        self.match = match
+        self.data = data if isinstance(data, dict) else {}
+        self.errors = {}
+        self.rows = []
+
+    def is_valid(self):
+        team_name = str(self.data.get("team") or "").strip()
+        rows = self.data.get("players")
+        team = {t.name: t for t in (self.match.home_team, self.match.away_team)}.get(team_name)
+        if team is None:
+            self.errors["team"] = ["Team boxscore harus home atau away pada match ini."]
+        if not isinstance(rows, list) or not rows:
+            self.errors["players"] = ["Kirim minimal satu baris pemain."]
+        if self.errors:
+            return False
+
+        roster = {p.pk: p for p in Player.objects.filter(team=team.name)}
+        seen = set()
+        for i, row in enumerate(rows):
+            form = BoxScoreRowForm(data=row if isinstance(row, dict) else {}, roster=roster)
+            if not form.is_valid():
+                self.errors[str(i)] = form.errors.get_json_data()
+                continue
+            player = form.cleaned_data["player"]
+            if player.pk in seen:
+                self.errors[str(i)] = {"player": [{"message": "Pemain muncul lebih dari sekali.", "code": "duplicate"}]}
+                continue
+            seen.add(player.pk)
+            self.rows.append(form.cleaned_data)
+        self.team = team
+        self.replace = bool(self.data.get("replace"))
+        return not self.errors
+
+    @transaction.atomic
+    def save(self):
+        """Return (jumlah dibuat, jumlah diperbarui, jumlah dihapus)."""
+        player_ids = [row["player"].pk for row in self.rows]
+        existing = {
+            b.player_id: b
+            for b in PlayerBoxScore.objects.select_for_update().filter(
+                Q(team=self.team) | Q(player_id__in=player_ids), match=self.match
+            )
+        }
+        to_create, to_update = [], []
+        for row in self.rows:
+            box = existing.pop(row["player"].pk, None)
+            if box is None:
+                box = PlayerBoxScore(match=self.match, player=row["player"], tipoff_at=self.match.tipoff_at)
+                to_create.append(box)
+            else:
+                to_update.append(box)
+            box.team = self.team
+            for name in self.VALUE_FIELDS[1:]:
+                setattr(box, name, row[name])
+
+        PlayerBoxScore.objects.bulk_create(to_create)
+        PlayerBoxScore.objects.bulk_update(to_update, self.VALUE_FIELDS)
+        deleted = 0
+        if self.replace and existing:
+            deleted, _ = PlayerBoxScore.objects.filter(pk__in=[b.pk for b in existing.values()]).delete()
+        return len(to_create), len(to_update), deleted
+
+
@@ -0,0 +1,105 @@
+# matches/h2h.py
+"""
+Head-to-head antar dua tim.
+
+Semua pertemuan A vs B diambil lewat dua cabang kesetaraan yang masing-masing
+dilayani index (home_team, away_team): (home=A, away=B) OR (home=B, away=A).
+Agregat seri (menang/kalah/seri, margin) di-cache per pasangan tim dengan key
+yang tidak bergantung urutan, dan dihapus setiap kali match di antara
+keduanya ditulis (lihat `invalidate_for_match`).
+"""
+from django.core.cache import cache
+from django.db.models import Case, Count, F, Q, Sum, When
+
+from .models import Match
+
+CACHE_TIMEOUT = 60 * 60 * 24
+RECENT_LIMIT = 10
+MAX_RECENT_LIMIT = 50
+
+
+def _pair(team_a, team_b):
+    return (team_a, team_b) if team_a <= team_b else (team_b, team_a)
+
+
+def cache_key(team_a, team_b):
+    lo, hi = _pair(team_a, team_b)
+    return f"matches:h2h:{lo}:{hi}"
+
+
+def meetings(team_a, team_b):
+    return Match.objects.filter(
+        Q(home_team_id=team_a, away_team_id=team_b) | Q(home_team_id=team_b, away_team_id=team_a)
+    )
+
+
+def _compute(lo, hi):
+    """Satu aggregate atas match finished; margin dari sudut pandang tim `lo`."""
+    lo_home = Q(home_team_id=lo)
+    lo_margin = Case(
+        When(lo_home, then=F("home_score") - F("away_score")),
+        default=F("away_score") - F("home_score"),
+    )
+    row = meetings(lo, hi).filter(status=Match.Status.FINISHED).aggregate(
+        games=Count("pk"),
+        lo_wins=Count("pk", filter=(lo_home & Q(home_score__gt=F("away_score")))
+                      | (~lo_home & Q(away_score__gt=F("home_score")))),
+        hi_wins=Count("pk", filter=(lo_home & Q(home_score__lt=F("away_score")))
+                      | (~lo_home & Q(away_score__lt=F("home_score")))),
+        margin=Sum(lo_margin),
+    )
+    row["margin"] = row["margin"] or 0
+    row["ties"] = row["games"] - row["lo_wins"] - row["hi_wins"]
+    return row
+
+
+def series(team_a, team_b):
+    """
+    Rekap seri dari sudut pandang `team_a`:
+    {"games", "wins", "losses", "ties", "avg_margin"}. Paling banyak satu query.
+    """
+    lo, hi = _pair(team_a, team_b)
+    key = cache_key(lo, hi)
+    row = cache.get(key)
+    if row is None:
+        row = _compute(lo, hi)
+        cache.set(key, row, CACHE_TIMEOUT)
+
+    flip = team_a != lo
+    wins, losses = (row["hi_wins"], row["lo_wins"]) if flip else (row["lo_wins"], row["hi_wins"])
+    margin = -row["margin"] if flip else row["margin"]
+    return {
+        "games": row["games"],
+        "wins": wins,
+        "losses": losses,
+        "ties": row["ties"],
+        "avg_margin": round(margin / row["games"], 1) if row["games"] else 0.0,
+    }
+
+
+def recent(team_a, team_b, limit=RECENT_LIMIT):
+    """N pertemuan terakhir yang sudah selesai (tim ikut di-join, periode di-prefetch)."""
+    return list(
+        meetings(team_a, team_b)
+        .filter(status=Match.Status.FINISHED)
+        .select_related("home_team", "away_team")
+        .with_periods()
+        .order_by("-tipoff_at", "-id")[:limit]
+    )
+
+
+def invalidate(team_a, team_b):
+    cache.delete(cache_key(team_a, team_b))
+
+
+def invalidate_for_match(match, before=None):
+    """
+    Hapus cache pasangan tim match ini. `before` = standings.snapshot() sebelum
+    ditulis, supaya pasangan lama ikut dibersihkan kalau timnya diganti.
+    """
+    pairs = set()
+    if before:
+        pairs.add(_pair(before[1], before[2]))
+    if match.home_team_id and match.away_team_id:
+        pairs.add(_pair(match.home_team_id, match.away_team_id))
+    cache.delete_many([cache_key(*p) for p in pairs])
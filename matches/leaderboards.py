@@ -0,0 +1,86 @@
+# matches/leaderboards.py
+"""
+Leaderboard per season (rata-rata per game) dari PlayerBoxScore match finished.
+
+Satu query per stat: GROUP BY pemain -> AVG + COUNT, pemain yang belum
+memenuhi minimal game dibuang di HAVING, lalu RANK() OVER (ORDER BY avg DESC)
+dihitung di database dan hanya baris rank <= LIMIT yang dikirim balik.
+Hasil lengkap satu season di-cache dan dihapus setiap box score / status match
+di season itu berubah.
+"""
+import math
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Max, Window
+from django.db.models.functions import Rank
+
+from .models import Match, PlayerBoxScore, Standing
+
+STATS = ("pts", "reb", "ast", "stl", "blk")
+LIMIT = 10
+# pemain harus tampil di >= 50% game tim dengan game terbanyak di season tsb
+MIN_GAMES_RATIO = 0.5
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def cache_key(season_id):
+    return f"matches:leaders:{season_id if season_id is not None else 'none'}"
+
+
+def min_games(season_id):
+    most = Standing.objects.filter(season_id=season_id).aggregate(
+        most=Max(F("wins") + F("losses"))
+    )["most"]
+    return max(1, math.ceil((most or 0) * MIN_GAMES_RATIO))
+
+
+def leaders(season_id, stat, qualifier, limit=LIMIT):
+    """Top `limit` (ikut yang seri) untuk satu stat dalam satu query."""
+    rows = (
+        PlayerBoxScore.objects.filter(match__season_id=season_id, match__status=Match.Status.FINISHED)
+        .values("player_id", "player__full_name", "player__team")
+        .annotate(
+            games=Count("id"),
+            per_game=Avg(stat),
+            rank=Window(Rank(), order_by=Avg(stat).desc()),
+        )
+        .filter(games__gte=qualifier, rank__lte=limit)
+        .order_by("rank", "player__full_name")
+    )
+    return [
+        {
+            "rank": r["rank"],
+            "player_id": r["player_id"],
+            "player": r["player__full_name"],
+            "team": r["player__team"],
+            "games": r["games"],
+            "per_game": round(r["per_game"], 1),
+        }
+        for r in rows
+    ]
+
+
+def season_leaders(season_id):
+    """{"min_games": n, "leaders": {stat: [...]}} — dari cache kalau ada."""
+    key = cache_key(season_id)
+    data = cache.get(key)
+    if data is None:
+        qualifier = min_games(season_id)
+        data = {
+            "min_games": qualifier,
+            "leaders": {stat: leaders(season_id, stat, qualifier) for stat in STATS},
+        }
+        cache.set(key, data, CACHE_TIMEOUT)
+    return data
+
+
+def invalidate(*season_ids):
+    cache.delete_many([cache_key(s) for s in set(season_ids)])
+
+
+def invalidate_for_match(match, before=None):
+    """Season match sekarang + season sebelum ditulis (standings.snapshot())."""
+    seasons = {match.season_id}
+    if before:
+        seasons.add(before[0])
+    invalidate(*seasons)
@@ -0,0 +1,279 @@
+# matches/live.py
+"""
+Live scoreboard: pub/sub (lokal atau LISTEN/NOTIFY PostgreSQL) + Server-Sent Events.
+
+Setiap penulisan match (signals.match_written) memanggil `publish_match(match)`
+dengan instance yang sudah ada di memori, jadi satu write di DB di-fan-out ke
+semua viewer hanya dengan satu query kecil untuk skor per-periode (nol kalau
+periode sudah di-prefetch).
+
+Broker:
+  - PostgreSQL (production): `PostgresBroker`, publish = NOTIFY (terkirim saat
+    transaksi commit) sehingga event dari worker lain maupun dari proses
+    advance_match_status sampai ke semua proses; tiap proses punya satu
+    thread LISTEN yang meneruskan ke subscriber lokalnya.
+  - Selain itu (SQLite dev/test): `LocalBroker`, hanya lokal per proses.
+
+Dua bentuk stream dengan protokol yang sama:
+  - `aevent_stream()` (async) dipakai kalau aplikasi dijalankan lewat ASGI
+    (dribbl_id.asgi, mis. uvicorn): viewer hanya berupa coroutine yang
+    menunggu asyncio.Queue, tidak memegang thread maupun koneksi DB.
+  - `event_stream()` (sync) untuk WSGI: setiap viewer memegang satu
+    thread worker selama terhubung (koneksi DB dilepas setelah snapshot).
+    Jumlah viewer serentak dibatasi jumlah thread, jadi jalankan gunicorn
+    dengan `-k gthread --threads N` sesuai perkiraan viewer, atau pakai ASGI.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import queue
+import select
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.db import connection, connections
+
+from .models import Match
+
+HEARTBEAT_SECONDS = 15
+DELETED = "deleted"
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBroker:
+    """Fan-out sederhana: satu Queue per subscriber, publish = put ke semua queue."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        # asyncio.Queue -> event loop pemiliknya (publish bisa datang dari thread lain)
+        self._async_subscribers = {}
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=self.maxsize)
+        with self._lock:
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+            self._async_subscribers.pop(q, None)
+
+    def subscribe_async(self):
+        """Queue untuk coroutine di event loop yang sedang berjalan."""
+        q = asyncio.Queue(maxsize=self.maxsize)
+        with self._lock:
+            self._async_subscribers[q] = asyncio.get_running_loop()
+        return q
+
+    def publish(self, event, data):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            async_subscribers = list(self._async_subscribers.items())
+        for q in subscribers:
+            try:
+                q.put_nowait((event, data))
+            except queue.Full:
+                # viewer terlalu lambat; buang event daripada memblokir penulis skor
+                pass
+        for q, loop in async_subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, q, (event, data))
+            except RuntimeError:
+                # loop viewer sudah ditutup
+                pass
+        return len(subscribers) + len(async_subscribers)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers) + len(self._async_subscribers)
+
+
+def _offer(q, item):
+    try:
+        q.put_nowait(item)
+    except asyncio.QueueFull:
+        pass
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Pub/sub antar proses lewat LISTEN/NOTIFY PostgreSQL. `publish()` hanya
+    mengirim NOTIFY; event (termasuk milik proses ini sendiri) dikirim ke
+    subscriber lokal oleh thread listener yang dijalankan saat subscriber pertama.
+    """
+    CHANNEL = "matches_live"
+    RECONNECT_SECONDS = 5
+
+    def __init__(self, maxsize=256, alias="default"):
+        super().__init__(maxsize)
+        self.alias = alias
+        self._listener = None
+
+    def publish(self, event, data):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.CHANNEL, json.dumps([event, data])])
+        return self.subscriber_count
+
+    def subscribe(self):
+        self._ensure_listener()
+        return super().subscribe()
+
+    def subscribe_async(self):
+        self._ensure_listener()
+        return super().subscribe_async()
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="matches-live-listener", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            # koneksi khusus di luar pool Django: LISTEN butuh autocommit dan hidup selama proses
+            wrapper = connections.create_connection(self.alias)
+            try:
+                wrapper.ensure_connection()
+                raw = wrapper.connection
+                raw.autocommit = True
+                with raw.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.CHANNEL}")
+                while True:
+                    if select.select([raw], [], [], HEARTBEAT_SECONDS) == ([], [], []):
+                        continue
+                    raw.poll()
+                    while raw.notifies:
+                        event, data = json.loads(raw.notifies.pop(0).payload)
+                        LocalBroker.publish(self, event, data)
+            except Exception:
+                logger.exception("Listener live scoreboard terputus; menyambung ulang.")
+                time.sleep(self.RECONNECT_SECONDS)
+            finally:
+                wrapper.close()
+
+
+broker = PostgresBroker() if connection.vendor == "postgresql" else LocalBroker()
+
+
+def match_state(match):
+    return {
+        "id": match.pk,
+        "status": match.status,
+        "home_score": match.home_score,
+        "away_score": match.away_score,
+        "periods": {label: [home, away] for label, home, away in match.period_scores()},
+    }
+
+
+def publish_match(match):
+    """
+    Kirim keadaan terbaru match ke semua viewer. Skor per-periode dibaca dengan
+    satu query kecil, kecuali periode sudah di-prefetch (with_periods(), mis. batch scheduler).
+    """
+    return broker.publish("match", match_state(match))
+
+
+def publish_deleted(match_id):
+    """Beri tahu viewer bahwa match dihapus (dikirim sebagai status `deleted`)."""
+    return broker.publish("match", {"id": match_id, "status": DELETED})
+
+
+def _sse(event, data, event_id=None):
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class _Tracker:
+    """Keadaan terakhir per match untuk satu viewer; mengubah event broker menjadi chunk SSE."""
+
+    def __init__(self, match_id):
+        self.match_id = match_id
+        self.seq = itertools.count(1)
+        self.last = {}
+
+    def snapshot(self):
+        qs = Match.objects.filter(status=Match.Status.LIVE).with_periods()
+        if self.match_id is not None:
+            qs = qs.filter(pk=self.match_id)
+        self.last = {m.pk: match_state(m) for m in qs}
+        return _sse("snapshot", list(self.last.values()), next(self.seq))
+
+    def handle(self, event, state):
+        """Chunk SSE untuk satu event broker, atau None kalau tidak relevan bagi viewer ini."""
+        if event != "match":
+            return _sse(event, state, next(self.seq))
+
+        pk = state["id"]
+        if self.match_id is not None and pk != self.match_id:
+            return None
+        previous = self.last.get(pk)
+        if previous is None and state["status"] != Match.Status.LIVE:
+            return None
+
+        delta = {k: v for k, v in state.items() if previous is None or previous.get(k) != v}
+        if state["status"] == Match.Status.LIVE:
+            self.last[pk] = state
+        else:
+            self.last.pop(pk, None)
+        if not delta:
+            return None
+        delta["id"] = pk
+        return _sse("score", delta, next(self.seq))
+
+
+def event_stream(match_id=None, heartbeat=HEARTBEAT_SECONDS, source=None):
+    """
+    Generator SSE untuk match berstatus live (atau satu match kalau `match_id`).
+      - `snapshot`: keadaan penuh semua match live saat terhubung
+      - `score`:    hanya field yang berubah (+ id) setiap ada publish
+    Match yang keluar dari status live (termasuk `deleted`) dikirim sekali lagi lalu tidak dilacak.
+    """
+    source = source or broker
+    q = source.subscribe()
+    try:
+        tracker = _Tracker(match_id)
+        yield "retry: 3000\n\n"
+        yield tracker.snapshot()
+        # setelah snapshot tidak ada query lagi; jangan tahan koneksi DB selama stream
+        if not connection.in_atomic_block:
+            connection.close()
+
+        while True:
+            try:
+                event, state = q.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ": ping\n\n"
+                continue
+            chunk = tracker.handle(event, state)
+            if chunk:
+                yield chunk
+    finally:
+        source.unsubscribe(q)
+
+
+async def aevent_stream(match_id=None, heartbeat=HEARTBEAT_SECONDS, source=None):
+    """Versi async `event_stream()` untuk ASGI; protokol dan urutan event sama."""
+    source = source or broker
+    q = source.subscribe_async()
+    try:
+        tracker = _Tracker(match_id)
+        yield "retry: 3000\n\n"
+        yield await sync_to_async(tracker.snapshot)()
+
+        while True:
+            try:
+                event, state = await asyncio.wait_for(q.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            chunk = tracker.handle(event, state)
+            if chunk:
+                yield chunk
+    finally:
+        source.unsubscribe(q)
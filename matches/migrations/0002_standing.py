@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Standing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team', models.CharField(max_length=100)),
+                ('wins', models.PositiveSmallIntegerField(default=0)),
+                ('losses', models.PositiveSmallIntegerField(default=0)),
+                ('points_for', models.PositiveIntegerField(default=0)),
+                ('points_against', models.PositiveIntegerField(default=0)),
+                ('home_wins', models.PositiveSmallIntegerField(default=0)),
+                ('home_losses', models.PositiveSmallIntegerField(default=0)),
+                ('away_wins', models.PositiveSmallIntegerField(default=0)),
+                ('away_losses', models.PositiveSmallIntegerField(default=0)),
+                ('streak', models.SmallIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('season', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='matches.season')),
+            ],
+            options={
+                'ordering': ['-wins', 'losses', 'team'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('season__isnull', False)), fields=('season', 'team'), name='standing_unique_season_team'), models.UniqueConstraint(condition=models.Q(('season__isnull', True)), fields=('team',), name='standing_unique_team_no_season')],
+            },
+        ),
+    ]
@@ -0,0 +1,91 @@
+"""
+Langkah 1/2 mengganti kolom nama tim (CharField) di Match, PlayerBoxScore, dan
+Standing dengan ForeignKey ke Team: tambah kolom FK sementara lalu petakan nama
+tim yang sudah ada ke baris Team (dibuat kalau belum ada). Bisa dibalik.
+Kolom lama dibuang di 0005 (migrasi terpisah supaya di PostgreSQL UPDATE data
+dan ALTER TABLE tidak berada dalam satu transaksi).
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _team_ids(Team, names):
+    names = {n for n in names if n}
+    existing = dict(Team.objects.filter(name__in=names).values_list("name", "id"))
+    Team.objects.bulk_create(Team(name=n) for n in names - existing.keys())
+    return dict(Team.objects.filter(name__in=names).values_list("name", "id"))
+
+
+def forwards(apps, schema_editor):
+    Team = apps.get_model("matches", "Team")
+    Match = apps.get_model("matches", "Match")
+    PlayerBoxScore = apps.get_model("matches", "PlayerBoxScore")
+    Standing = apps.get_model("matches", "Standing")
+
+    names = set(Match.objects.values_list("home_team", flat=True))
+    names |= set(Match.objects.values_list("away_team", flat=True))
+    names |= set(PlayerBoxScore.objects.values_list("team", flat=True))
+    names |= set(Standing.objects.values_list("team", flat=True))
+    ids = _team_ids(Team, names)
+
+    # satu UPDATE per nama tim, bukan per baris
+    for name, team_id in ids.items():
+        Match.objects.filter(home_team=name).update(home_team_ref=team_id)
+        Match.objects.filter(away_team=name).update(away_team_ref=team_id)
+        PlayerBoxScore.objects.filter(team=name).update(team_ref=team_id)
+        Standing.objects.filter(team=name).update(team_ref=team_id)
+
+
+def backwards(apps, schema_editor):
+    Team = apps.get_model("matches", "Team")
+    Match = apps.get_model("matches", "Match")
+    PlayerBoxScore = apps.get_model("matches", "PlayerBoxScore")
+    Standing = apps.get_model("matches", "Standing")
+
+    for team_id, name in Team.objects.values_list("id", "name"):
+        Match.objects.filter(home_team_ref=team_id).update(home_team=name)
+        Match.objects.filter(away_team_ref=team_id).update(away_team=name)
+        PlayerBoxScore.objects.filter(team_ref=team_id).update(team=name)
+        Standing.objects.filter(team_ref=team_id).update(team=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0003_match_version'),
+    ]
+
+    operations = [
+        # 1. lepas index/constraint lama yang memakai kolom string (saat dibalik,
+        #    dibuat ulang setelah nama tim terisi kembali)
+        migrations.RemoveConstraint(model_name='match', name='match_home_neq_away'),
+        migrations.RemoveIndex(model_name='match', name='matches_mat_home_te_1982d0_idx'),
+        migrations.RemoveIndex(model_name='playerboxscore', name='matches_pla_match_i_1ec2c2_idx'),
+        migrations.RemoveConstraint(model_name='standing', name='standing_unique_season_team'),
+        migrations.RemoveConstraint(model_name='standing', name='standing_unique_team_no_season'),
+
+        # 2. kolom FK sementara (nullable)
+        migrations.AddField(
+            model_name='match',
+            name='home_team_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='matches.team'),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='away_team_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='matches.team'),
+        ),
+        migrations.AddField(
+            model_name='playerboxscore',
+            name='team_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='matches.team'),
+        ),
+        migrations.AddField(
+            model_name='standing',
+            name='team_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='matches.team'),
+        ),
+
+        # 3. petakan nama -> Team
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,78 @@
+"""
+Langkah 2/2: buang kolom nama tim lama, pakai nama field lama untuk FK, lalu
+buat ulang index/constraint di atas kolom integer.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0004_team_foreign_keys'),
+    ]
+
+    operations = [
+        # default '' hanya supaya migrasi balik bisa menambah kolom NOT NULL;
+        # isinya diisi ulang oleh RunPython di 0004
+        migrations.AlterField(model_name='match', name='home_team', field=models.CharField(default='', max_length=100)),
+        migrations.AlterField(model_name='match', name='away_team', field=models.CharField(default='', max_length=100)),
+        migrations.AlterField(model_name='playerboxscore', name='team', field=models.CharField(default='', max_length=100)),
+        migrations.AlterField(model_name='standing', name='team', field=models.CharField(default='', max_length=100)),
+
+        # buang kolom string, pakai nama lama untuk FK
+        migrations.RemoveField(model_name='match', name='home_team'),
+        migrations.RemoveField(model_name='match', name='away_team'),
+        migrations.RemoveField(model_name='playerboxscore', name='team'),
+        migrations.RemoveField(model_name='standing', name='team'),
+        migrations.RenameField(model_name='match', old_name='home_team_ref', new_name='home_team'),
+        migrations.RenameField(model_name='match', old_name='away_team_ref', new_name='away_team'),
+        migrations.RenameField(model_name='playerboxscore', old_name='team_ref', new_name='team'),
+        migrations.RenameField(model_name='standing', old_name='team_ref', new_name='team'),
+        migrations.AlterField(
+            model_name='match',
+            name='home_team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='home_matches', to='matches.team'),
+        ),
+        migrations.AlterField(
+            model_name='match',
+            name='away_team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='away_matches', to='matches.team'),
+        ),
+        migrations.AlterField(
+            model_name='playerboxscore',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='box_scores', to='matches.team'),
+        ),
+        migrations.AlterField(
+            model_name='standing',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='matches.team'),
+        ),
+        migrations.AlterModelOptions(
+            name='standing',
+            options={'ordering': ['-wins', 'losses', 'team__name']},
+        ),
+
+        # index/constraint baru di atas kolom integer
+        migrations.AddConstraint(
+            model_name='match',
+            constraint=models.CheckConstraint(condition=models.Q(('home_team', models.F('away_team')), _negated=True), name='match_home_neq_away'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['home_team', 'away_team'], name='matches_mat_home_te_a56e02_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerboxscore',
+            index=models.Index(fields=['match', 'team'], name='matches_pla_match_i_41a1be_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='standing',
+            constraint=models.UniqueConstraint(condition=models.Q(('season__isnull', False)), fields=('season', 'team'), name='standing_unique_season_team'),
+        ),
+        migrations.AddConstraint(
+            model_name='standing',
+            constraint=models.UniqueConstraint(condition=models.Q(('season__isnull', True)), fields=('team',), name='standing_unique_team_no_season'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+"""
+Langkah 1/2: salin Match.tipoff_at ke PlayerBoxScore.tipoff_at (nullable dulu),
+diisi dengan satu UPDATE ... SET = (subquery). NOT NULL + index game log di 0007.
+"""
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def forwards(apps, schema_editor):
+    Match = apps.get_model("matches", "Match")
+    PlayerBoxScore = apps.get_model("matches", "PlayerBoxScore")
+    PlayerBoxScore.objects.update(
+        tipoff_at=Subquery(Match.objects.filter(pk=OuterRef("match_id")).values("tipoff_at")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0005_drop_team_name_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playerboxscore',
+            name='tipoff_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
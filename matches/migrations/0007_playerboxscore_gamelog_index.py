@@ -0,0 +1,28 @@
+"""
+Langkah 2/2: tipoff_at box score wajib diisi, dan index (player) diganti index
+game log (player, -tipoff_at, -id) yang juga melayani filter per pemain.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0006_playerboxscore_tipoff_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='playerboxscore',
+            name='tipoff_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.RemoveIndex(
+            model_name='playerboxscore',
+            name='matches_pla_player__337cfa_idx',
+        ),
+        migrations.AddIndex(
+            model_name='playerboxscore',
+            index=models.Index(fields=['player', '-tipoff_at', '-id'], name='boxscore_player_gamelog_idx'),
+        ),
+    ]
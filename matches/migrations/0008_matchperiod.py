@@ -0,0 +1,63 @@
+"""
+Langkah 1/2: tabel MatchPeriod (satu baris per periode yang terisi) dan salin
+isi kolom q1..q4 / ot1..ot3 ke sana tanpa kehilangan data (NULL per sisi tetap
+NULL). Kolom lama dibuang di 0009.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+OLD_PERIODS = ("q1", "q2", "q3", "q4", "ot1", "ot2", "ot3")
+OLD_FIELDS = tuple(f"{p}_{side}" for p in OLD_PERIODS for side in ("home", "away"))
+
+
+def forwards(apps, schema_editor):
+    Match = apps.get_model("matches", "Match")
+    MatchPeriod = apps.get_model("matches", "MatchPeriod")
+    batch = []
+    for row in Match.objects.values_list("pk", *OLD_FIELDS).iterator(chunk_size=2000):
+        pk, values = row[0], row[1:]
+        for number in range(1, len(OLD_PERIODS) + 1):
+            home, away = values[2 * number - 2], values[2 * number - 1]
+            if home is not None or away is not None:
+                batch.append(MatchPeriod(match_id=pk, number=number, home_points=home, away_points=away))
+        if len(batch) >= 2000:
+            MatchPeriod.objects.bulk_create(batch)
+            batch = []
+    MatchPeriod.objects.bulk_create(batch)
+
+
+def backwards(apps, schema_editor):
+    Match = apps.get_model("matches", "Match")
+    MatchPeriod = apps.get_model("matches", "MatchPeriod")
+    if MatchPeriod.objects.filter(number__gt=len(OLD_PERIODS)).exists():
+        raise RuntimeError("Ada match dengan lebih dari 3 OT; kolom lama hanya muat sampai ot3.")
+    for p in MatchPeriod.objects.iterator(chunk_size=2000):
+        label = OLD_PERIODS[p.number - 1]
+        Match.objects.filter(pk=p.match_id).update(
+            **{f"{label}_home": p.home_points, f"{label}_away": p.away_points}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0007_playerboxscore_gamelog_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveSmallIntegerField()),
+                ('home_points', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('away_points', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='periods', to='matches.match')),
+            ],
+            options={
+                'ordering': ['number'],
+                'constraints': [models.UniqueConstraint(fields=('match', 'number'), name='match_period_unique_number'), models.CheckConstraint(condition=models.Q(('number__gte', 1)), name='match_period_number_gte_1')],
+            },
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
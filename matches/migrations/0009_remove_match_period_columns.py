@@ -0,0 +1,29 @@
+"""
+Langkah 2/2: buang kolom skor per-periode lama di Match (isinya sudah ada di
+MatchPeriod sejak 0008).
+"""
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0008_matchperiod'),
+    ]
+
+    operations = [
+        migrations.RemoveField(model_name='match', name='q1_home'),
+        migrations.RemoveField(model_name='match', name='q1_away'),
+        migrations.RemoveField(model_name='match', name='q2_home'),
+        migrations.RemoveField(model_name='match', name='q2_away'),
+        migrations.RemoveField(model_name='match', name='q3_home'),
+        migrations.RemoveField(model_name='match', name='q3_away'),
+        migrations.RemoveField(model_name='match', name='q4_home'),
+        migrations.RemoveField(model_name='match', name='q4_away'),
+        migrations.RemoveField(model_name='match', name='ot1_home'),
+        migrations.RemoveField(model_name='match', name='ot1_away'),
+        migrations.RemoveField(model_name='match', name='ot2_home'),
+        migrations.RemoveField(model_name='match', name='ot2_away'),
+        migrations.RemoveField(model_name='match', name='ot3_home'),
+        migrations.RemoveField(model_name='match', name='ot3_away'),
+    ]
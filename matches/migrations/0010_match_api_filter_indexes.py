@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0009_remove_match_period_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='match',
+            name='venue',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['season', 'tipoff_at'], name='match_season_tipoff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['venue', 'tipoff_at'], name='match_venue_tipoff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['home_team', 'tipoff_at'], name='match_home_tipoff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['away_team', 'tipoff_at'], name='match_away_tipoff_idx'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 # matches/models.py
-from django.db import models
+import re
+
+from django.db import models, transaction
+from django.db.models import Max, Sum
 from django.core.exceptions import ValidationError
 import uuid
 
@@ -58,6 +61,47 @@ class Season(models.Model):
 # ---------------------------
 # Game / Match
 # ---------------------------
+QUARTERS = 4
+_PERIOD_FIELD_RE = re.compile(r"^(q|ot)(\d+)_(home|away)$")
+
+
+def period_label(number):
+    """1-4 -> 'q1'..'q4', 5 -> 'ot1', 6 -> 'ot2', dst."""
+    return f"q{number}" if number <= QUARTERS else f"ot{number - QUARTERS}"
+
+
+def periods_from_fields(data):
+    """
+    {"q1_home": 20, "ot1_away": 5, ...} -> {nomor_periode: [home, away]}.
+    Key lain diabaikan; periode yang kedua sisinya kosong dibuang.
+    """
+    periods = {}
+    for key, value in data.items():
+        m = _PERIOD_FIELD_RE.match(key)
+        if not m:
+            continue
+        kind, n, side = m.group(1), int(m.group(2)), m.group(3)
+        if n < 1 or (kind == "q" and n > QUARTERS):
+            continue
+        number = n if kind == "q" else QUARTERS + n
+        periods.setdefault(number, [None, None])[side == "away"] = value
+    return {n: v for n, v in periods.items() if v != [None, None]}
+
+
+class MatchQuerySet(models.QuerySet):
+    def with_periods(self):
+        """Semua periode untuk seluruh match di queryset dalam satu query tambahan."""
+        return self.prefetch_related("periods")
+
+    def with_period_totals(self):
+        """Anotasi total per sisi dan periode terakhir, dihitung di database."""
+        return self.annotate(
+            home_period_total=Sum("periods__home_points"),
+            away_period_total=Sum("periods__away_points"),
+            last_period=Max("periods__number"),
+        )
+
+
 class Match(models.Model):
     class Status(models.TextChoices):
         SCHEDULED = "scheduled", "Scheduled"
@@ -67,10 +111,10 @@ class Match(models.Model):
 
     uuid = models.UUIDField(editable=False, unique=True, db_index=True, default=uuid.uuid4)
     season = models.ForeignKey(Season, on_delete=models.SET_NULL, null=True, blank=True, related_name="matches")
-    home_team = models.CharField(max_length=100)
-    away_team = models.CharField(max_length=100)
+    home_team = models.ForeignKey(Team, on_delete=models.PROTECT, related_name="home_matches")
+    away_team = models.ForeignKey(Team, on_delete=models.PROTECT, related_name="away_matches")
     tipoff_at = models.DateTimeField(db_index=True, help_text="Waktu mulai pertandingan (tip-off)")
-    venue = models.CharField(max_length=120, blank=True, db_index=True)
+    venue = models.CharField(max_length=120, blank=True)
     image_url = models.URLField(blank=True, help_text="URL gambar pertandingan dari Google")
     status = models.CharField(max_length=10, choices=Status.choices, default=Status.SCHEDULED, db_index=True)
 
@@ -78,23 +122,12 @@ class Match(models.Model):
     home_score = models.PositiveSmallIntegerField(default=0)
     away_score = models.PositiveSmallIntegerField(default=0)
 
-    # Skor per kuarter (opsional, memudahkan tampilan box score sederhana)
-    q1_home = models.PositiveSmallIntegerField(null=True, blank=True)
-    q1_away = models.PositiveSmallIntegerField(null=True, blank=True)
-    q2_home = models.PositiveSmallIntegerField(null=True, blank=True)
-    q2_away = models.PositiveSmallIntegerField(null=True, blank=True)
-    q3_home = models.PositiveSmallIntegerField(null=True, blank=True)
-    q3_away = models.PositiveSmallIntegerField(null=True, blank=True)
-    q4_home = models.PositiveSmallIntegerField(null=True, blank=True)
-    q4_away = models.PositiveSmallIntegerField(null=True, blank=True)
-
-    # Dukungan OT (pakai sampai 3 OT, tambah lagi kalau perlu)
-    ot1_home = models.PositiveSmallIntegerField(null=True, blank=True)
-    ot1_away = models.PositiveSmallIntegerField(null=True, blank=True)
-    ot2_home = models.PositiveSmallIntegerField(null=True, blank=True)
-    ot2_away = models.PositiveSmallIntegerField(null=True, blank=True)
-    ot3_home = models.PositiveSmallIntegerField(null=True, blank=True)
-    ot3_away = models.PositiveSmallIntegerField(null=True, blank=True)
+    # Skor per periode ada di MatchPeriod (related_name="periods")
+
+    # Optimistic locking: naik setiap kali baris ditulis
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = MatchQuerySet.as_manager()
 
     class Meta:
         ordering = ["-tipoff_at"]
@@ -107,23 +140,105 @@ class Match(models.Model):
         indexes = [
             models.Index(fields=["home_team", "away_team"]),
             models.Index(fields=["status", "tipoff_at"]),
+            # API filter (/matches/api/): setiap filter kesetaraan + urutan tipoff_at;
+            # filter tim = dua cabang home/away (UNION ALL), masing-masing punya index sendiri
+            models.Index(fields=["season", "tipoff_at"], name="match_season_tipoff_idx"),
+            models.Index(fields=["venue", "tipoff_at"], name="match_venue_tipoff_idx"),
+            models.Index(fields=["home_team", "tipoff_at"], name="match_home_tipoff_idx"),
+            models.Index(fields=["away_team", "tipoff_at"], name="match_away_tipoff_idx"),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # tipoff_at terakhir yang diketahui ada di DB (None = tidak diketahui, mis. field di-defer)
+        instance._db_tipoff_at = instance.__dict__.get("tipoff_at")
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or "tipoff_at" in fields:
+            self._db_tipoff_at = self.__dict__.get("tipoff_at")
+
+    def save(self, *args, **kwargs):
+        existing = self.pk is not None
+        update_fields = kwargs.get("update_fields")
+        writes_tipoff = update_fields is None or "tipoff_at" in update_fields
+        tipoff_moved = existing and writes_tipoff and self.tipoff_at != getattr(self, "_db_tipoff_at", None)
+        if existing:
+            self.version += 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
+        if tipoff_moved:
+            # salinan tipoff_at di box score (untuk index game log) ikut digeser
+            self.box_scores.exclude(tipoff_at=self.tipoff_at).update(tipoff_at=self.tipoff_at)
+        if writes_tipoff:
+            self._db_tipoff_at = self.tipoff_at
+
     def __str__(self):
-        return f"{self.away_team} @ {self.home_team} — {self.tipoff_at:%Y-%m-%d %H:%M}"
+        return f"{self.away_team.name} @ {self.home_team.name} — {self.tipoff_at:%Y-%m-%d %H:%M}"
+
+    def period_scores(self):
+        """[(label, home, away), ...] urut periode; memakai prefetch with_periods() kalau ada."""
+        return [(period_label(p.number), p.home_points, p.away_points) for p in self.periods.all()]
 
     @property
     def went_to_ot(self) -> bool:
-        return any(v is not None for v in [self.ot1_home, self.ot1_away, self.ot2_home, self.ot2_away, self.ot3_home, self.ot3_away])
+        return any(p.number > QUARTERS for p in self.periods.all())
 
     def recalc_totals_from_periods(self, save=True):
-        """Opsional helper untuk menjumlah ulang total dari per-kuarter/OT."""
-        parts_home = [self.q1_home, self.q2_home, self.q3_home, self.q4_home, self.ot1_home, self.ot2_home, self.ot3_home]
-        parts_away = [self.q1_away, self.q2_away, self.q3_away, self.q4_away, self.ot1_away, self.ot2_away, self.ot3_away]
-        self.home_score = sum(p or 0 for p in parts_home)
-        self.away_score = sum(p or 0 for p in parts_away)
+        """Opsional helper untuk menjumlah ulang total dari per-kuarter/OT (SUM di database)."""
+        totals = self.periods.aggregate(home=Sum("home_points"), away=Sum("away_points"))
+        self.home_score = totals["home"] or 0
+        self.away_score = totals["away"] or 0
         if save:
             self.save(update_fields=["home_score", "away_score"])
+
+    @transaction.atomic
+    def save_checked(self, expected_version, **kwargs):
+        """
+        save() biasa, tapi hanya kalau version di DB masih `expected_version`
+        (baris dikunci dulu); return False tanpa menulis apa pun kalau sudah basi.
+        """
+        current = Match.objects.select_for_update().filter(pk=self.pk).values_list("version", flat=True).first()
+        if current != expected_version:
+            return False
+        self.version = current
+        self.save(**kwargs)
+        return True
+
+    @transaction.atomic
+    def apply_period_scores(self, periods, expected_version):
+        """
+        Tulis skor per-periode (`{"q1_home": .., "ot4_away": ..}`), total, dan
+        version. Baris Match ditulis dengan satu UPDATE bersyarat
+        `WHERE version = expected_version`; return False kalau baris sudah diubah
+        orang lain (version berbeda) dan tidak ada yang ditulis.
+        """
+        expected = expected_version
+        scores = periods_from_fields(periods)
+        values = {
+            "home_score": sum(h or 0 for h, _ in scores.values()),
+            "away_score": sum(a or 0 for _, a in scores.values()),
+            "version": expected + 1,
+        }
+        updated = Match.objects.filter(pk=self.pk, version=expected).update(**values)
+        if not updated:
+            return False
+
+        MatchPeriod.objects.filter(match_id=self.pk).exclude(number__in=scores).delete()
+        MatchPeriod.objects.bulk_create(
+            [MatchPeriod(match_id=self.pk, number=n, home_points=h, away_points=a)
+             for n, (h, a) in sorted(scores.items())],
+            update_conflicts=True,
+            unique_fields=["match", "number"],
+            update_fields=["home_points", "away_points"],
+        )
+        for field, value in values.items():
+            setattr(self, field, value)
+        getattr(self, "_prefetched_objects_cache", {}).pop("periods", None)
+        return True
     
     @property
     def is_live(self) -> bool:
@@ -149,10 +264,35 @@ class Match(models.Model):
 # ---------------------------
 # Box Score (stat pemain per pertandingan)
 # ---------------------------
+class MatchPeriod(models.Model):
+    """
+    Skor satu periode match. number 1-4 = kuarter, 5 = OT1, 6 = OT2, dst
+    (tanpa batas jumlah overtime). Sisi yang belum diisi disimpan NULL.
+    """
+    match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name="periods")
+    number = models.PositiveSmallIntegerField()
+    home_points = models.PositiveSmallIntegerField(null=True, blank=True)
+    away_points = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["number"]
+        constraints = [
+            models.UniqueConstraint(fields=["match", "number"], name="match_period_unique_number"),
+            models.CheckConstraint(condition=models.Q(number__gte=1), name="match_period_number_gte_1"),
+        ]
+
+    def __str__(self):
+        return f"{self.match_id} {self.label}: {self.home_points}-{self.away_points}"
+
+    @property
+    def label(self):
+        return period_label(self.number)
+
+
 class PlayerBoxScore(models.Model):
     match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name="box_scores")
     player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="box_scores")
-    team = models.CharField(max_length=100)
+    team = models.ForeignKey(Team, on_delete=models.PROTECT, related_name="box_scores")
 
     # Basic info
     is_starter = models.BooleanField(default=False)
@@ -178,17 +318,28 @@ class PlayerBoxScore(models.Model):
     # Advanced
     plus_minus = models.SmallIntegerField(default=0)
 
+    # Salinan Match.tipoff_at supaya game log pemain bisa dibaca urut langsung
+    # dari index (player, -tipoff_at, -id) tanpa join + sort ke tabel Match.
+    tipoff_at = models.DateTimeField(editable=False)
+
     class Meta:
         unique_together = ("match", "player")
         ordering = ["-is_starter", "-minutes", "player__full_name"]
         indexes = [
             models.Index(fields=["match", "team"]),
-            models.Index(fields=["player"]),
+            models.Index(fields=["player", "-tipoff_at", "-id"], name="boxscore_player_gamelog_idx"),
         ]
 
     def __str__(self):
         return f"{self.player} - {self.match}"
 
+    def save(self, *args, **kwargs):
+        self.tipoff_at = self.match.tipoff_at
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "tipoff_at"}
+        super().save(*args, **kwargs)
+
     @property
     def fg_pct(self) -> float:
         return self.fg_made / self.fg_att if self.fg_att > 0 else 0.0
@@ -201,3 +352,65 @@ class PlayerBoxScore(models.Model):
     def ft_pct(self) -> float:
         return self.ft_made / self.ft_att if self.ft_att > 0 else 0.0
 
+
+# ---------------------------
+# Klasemen (materialized dari Match berstatus finished)
+# ---------------------------
+class Standing(models.Model):
+    """
+    Satu baris per (season, team). Diperbarui oleh matches.standings setiap kali
+    match selesai / skornya berubah; `rebuild_standings` menghitung ulang dari nol.
+    season NULL = match tanpa season.
+    """
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, null=True, blank=True, related_name="standings")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="standings")
+
+    wins = models.PositiveSmallIntegerField(default=0)
+    losses = models.PositiveSmallIntegerField(default=0)
+    points_for = models.PositiveIntegerField(default=0)
+    points_against = models.PositiveIntegerField(default=0)
+
+    home_wins = models.PositiveSmallIntegerField(default=0)
+    home_losses = models.PositiveSmallIntegerField(default=0)
+    away_wins = models.PositiveSmallIntegerField(default=0)
+    away_losses = models.PositiveSmallIntegerField(default=0)
+
+    # > 0 = menang beruntun, < 0 = kalah beruntun
+    streak = models.SmallIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-wins", "losses", "team__name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["season", "team"],
+                condition=models.Q(season__isnull=False),
+                name="standing_unique_season_team",
+            ),
+            models.UniqueConstraint(
+                fields=["team"],
+                condition=models.Q(season__isnull=True),
+                name="standing_unique_team_no_season",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.team} {self.wins}-{self.losses} ({self.season or '-'})"
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses
+
+    @property
+    def win_pct(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def point_diff(self) -> int:
+        return self.points_for - self.points_against
+
+    @property
+    def streak_display(self) -> str:
+        if not self.streak:
+            return "-"
+        return f"{'W' if self.streak > 0 else 'L'}{abs(self.streak)}"
@@ -0,0 +1,85 @@
+# matches/pagination.py
+"""
+Keyset (cursor) pagination untuk daftar Match, dikunci pada (tipoff_at, id).
+
+Berbeda dengan OFFSET, biaya per halaman tetap konstan sedalam apa pun arsipnya:
+query selalu mulai dari posisi cursor memakai index `tipoff_at` /
+`(status, tipoff_at)` lalu mengambil PAGE_SIZE + 1 baris.
+Dipakai juga untuk game log PlayerBoxScore (punya salinan `tipoff_at`).
+"""
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(match):
+    raw = f"{match.tipoff_at.isoformat()}|{match.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Kembalikan (tipoff_at, pk) atau None kalau cursor kosong/rusak."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        ts, pk = raw.rsplit("|", 1)
+        tipoff_at = parse_datetime(ts)
+        pk = int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    if tipoff_at is None:
+        return None
+    return tipoff_at, pk
+
+
+def parse_page_size(raw, default=PAGE_SIZE):
+    try:
+        size = int(raw)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _after(qs, position, descending):
+    if not position:
+        return qs
+    tipoff_at, pk = position
+    if descending:
+        return qs.filter(Q(tipoff_at__lt=tipoff_at) | Q(tipoff_at=tipoff_at, id__lt=pk))
+    return qs.filter(Q(tipoff_at__gt=tipoff_at) | Q(tipoff_at=tipoff_at, id__gt=pk))
+
+
+def keyset_query(qs, cursor=None, descending=False):
+    """
+    Queryset terurut (tipoff_at, id) mulai setelah `cursor`.
+    `qs` boleh juga list queryset yang saling lepas (mis. match tim sebagai home
+    dan sebagai away): cursor diterapkan per cabang lalu digabung UNION ALL,
+    jadi tiap cabang dibaca urut dari index-nya sendiri dan hasilnya di-merge
+    tanpa sort (OR dalam satu WHERE memaksa database mengurutkan semua baris).
+    """
+    order = ("-tipoff_at", "-id") if descending else ("tipoff_at", "id")
+    position = decode_cursor(cursor)
+    branches = [_after(b, position, descending) for b in (qs if isinstance(qs, list) else [qs])]
+    if len(branches) == 1:
+        return branches[0].order_by(*order)
+    first, *rest = (b.order_by() for b in branches)
+    return first.union(*rest, all=True).order_by(*order)
+
+
+def keyset_page(qs, cursor=None, descending=False, size=PAGE_SIZE):
+    """
+    Ambil satu halaman dari `qs` (queryset atau list cabang, lihat keyset_query()) setelah `cursor`.
+    Return: (list_match, next_cursor_or_None)
+    """
+    rows = list(keyset_query(qs, cursor, descending)[: size + 1])
+    has_next = len(rows) > size
+    rows = rows[:size]
+    next_cursor = encode_cursor(rows[-1]) if has_next and rows else None
+    return rows, next_cursor
@@ -0,0 +1,86 @@
+# matches/reconcile.py
+"""
+Rekonsiliasi box score terhadap skor akhir match, seluruhnya di database.
+
+Dua query GROUP BY match_id atas seluruh tabel PlayerBoxScore — tidak ada
+instance model yang dibuat, hanya baris yang bermasalah yang dikirim balik
+(difilter di HAVING, dipotong LIMIT; sisanya hanya dihitung):
+  - `score_mismatches`: SUM(pts) tim home/away != Match.home_score/away_score
+    untuk match finished yang punya box score, plus baris box score yang
+    timnya bukan home/away match tsb.
+  - `shooting_violations`: jumlah baris dengan made > attempt per jenis tembakan.
+"""
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Match, PlayerBoxScore
+
+SHOTS = (("fg", "fg_made", "fg_att"), ("tp", "tp_made", "tp_att"), ("ft", "ft_made", "ft_att"))
+
+
+def score_mismatches():
+    is_home = Q(team_id=F("match__home_team_id"))
+    is_away = Q(team_id=F("match__away_team_id"))
+    return (
+        PlayerBoxScore.objects.filter(match__status=Match.Status.FINISHED)
+        .order_by()
+        .values("match_id", "match__home_score", "match__away_score")
+        .annotate(
+            home_pts=Coalesce(Sum("pts", filter=is_home), 0),
+            away_pts=Coalesce(Sum("pts", filter=is_away), 0),
+            stray=Count("pk", filter=~is_home & ~is_away),
+        )
+        .filter(
+            ~Q(home_pts=F("match__home_score"))
+            | ~Q(away_pts=F("match__away_score"))
+            | Q(stray__gt=0)
+        )
+        .order_by("match_id")
+    )
+
+
+def shooting_violations():
+    counts = {key: Count("pk", filter=Q(**{f"{made}__gt": F(att)})) for key, made, att in SHOTS}
+    any_bad = Q()
+    for key in counts:
+        any_bad |= Q(**{f"{key}__gt": 0})
+    return (
+        PlayerBoxScore.objects.order_by()
+        .values("match_id")
+        .annotate(**counts)
+        .filter(any_bad)
+        .order_by("match_id")
+    )
+
+
+def run(limit=None):
+    """
+    Return {"scores": [...], "shooting": [...], "score_count", "shooting_count", "problems"}.
+    Daftar baris dipotong di SQL (LIMIT `limit`); jumlah per jenis dan jumlah match
+    bermasalah (gabungan keduanya) dihitung dengan COUNT di database.
+    """
+    scores, shooting = score_mismatches(), shooting_violations()
+    ids = scores.order_by().values_list("match_id").union(shooting.order_by().values_list("match_id"))
+    return {
+        "scores": list(scores[:limit]),
+        "shooting": list(shooting[:limit]),
+        "score_count": scores.count(),
+        "shooting_count": shooting.count(),
+        "problems": ids.count(),
+    }
+
+
+def format_score(row):
+    parts = [f"match={row['match_id']}"]
+    if row["home_pts"] != row["match__home_score"]:
+        parts.append(f"home pts={row['home_pts']} skor={row['match__home_score']}")
+    if row["away_pts"] != row["match__away_score"]:
+        parts.append(f"away pts={row['away_pts']} skor={row['match__away_score']}")
+    if row["stray"]:
+        parts.append(f"{row['stray']} baris tim lain")
+    return " ".join(parts)
+
+
+def format_shooting(row):
+    bad = " ".join(f"{key}={row[key]}" for key, _, _ in SHOTS if row[key])
+    return f"match={row['match_id']} made>att: {bad}"
@@ -0,0 +1,132 @@
+# matches/schedule_days.py
+"""
+Jadwal dikelompokkan per hari kalender lokal (TIME_ZONE, Asia/Jakarta).
+
+Pengelompokan dihitung di database dengan TruncDate(tipoff_at, tzinfo=zona
+aktif): satu query GROUP BY hari memberi daftar hari satu halaman beserta
+jumlah match yang belum selesai. Hari yang sudah lewat dan semua match-nya
+finished jarang berubah lagi, jadi fragment HTML-nya di-cache dan dihapus saat
+ada match di hari itu ditulis (`invalidate_for_match`). Invalidasi hanya
+sampai ke proses lain kalau cache-nya bersama (settings.CACHES di production);
+FINAL_DAY_TTL membatasi berapa lama koreksi skor bisa tertinggal kalau
+invalidasi tidak sampai (mis. LocMem per proses). Hari ini, hari mendatang,
+dan hari lalu yang masih punya match terbuka dirender ulang dari satu query match.
+"""
+from datetime import datetime, time as dtime, timedelta
+from itertools import groupby
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Match
+
+DAYS_PER_PAGE = 7
+FINAL_DAY_TTL = 60 * 60
+
+
+def cache_key(day):
+    return f"matches:schedule:day:{day.isoformat()}"
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, dtime.min))
+
+
+def local_day(dt):
+    return timezone.localdate(dt)
+
+
+def _with_day(qs):
+    return qs.annotate(day=TruncDate("tipoff_at", tzinfo=timezone.get_current_timezone()))
+
+
+def decode_cursor(cursor):
+    """Cursor = tanggal terakhir halaman sebelumnya (YYYY-MM-DD); rusak -> None."""
+    try:
+        return parse_date(cursor or "")
+    except ValueError:
+        return None
+
+
+def day_buckets(qs, after=None, size=DAYS_PER_PAGE):
+    """
+    Satu query: hari-hari (setelah `after`) yang punya match di `qs`.
+    Return: (list {"day", "games", "open"}, next_cursor_or_None)
+    """
+    if after:
+        qs = qs.filter(tipoff_at__gte=day_start(after + timedelta(days=1)))
+    rows = list(
+        _with_day(qs.order_by())
+        .values("day")
+        .annotate(games=Count("pk"), open=Count("pk", filter=~Q(status=Match.Status.FINISHED)))
+        .order_by("day")[: size + 1]
+    )
+    has_next = len(rows) > size
+    rows = rows[:size]
+    next_cursor = rows[-1]["day"].isoformat() if has_next and rows else None
+    return rows, next_cursor
+
+
+def is_final(bucket, today):
+    return bucket["day"] < today and not bucket["open"]
+
+
+def render_day(day, games):
+    # tanpa request: fragment dipakai bersama semua pengunjung
+    return render_to_string("matches/_schedule_day.html", {"day": day, "games": games})
+
+
+def page(qs, cursor=None, size=DAYS_PER_PAGE, use_cache=True):
+    """
+    Satu halaman jadwal per hari.
+    Return: (list {"day", "games", "html"}, match_yang_dirender_ulang, next_cursor)
+    Hari final yang ada di cache tidak menyentuh tabel match sama sekali.
+    """
+    buckets, next_cursor = day_buckets(qs, decode_cursor(cursor), size)
+    today = timezone.localdate()
+    final = {b["day"] for b in buckets if use_cache and is_final(b, today)}
+    cached = cache.get_many([cache_key(d) for d in final]) if final else {}
+
+    stale = [b["day"] for b in buckets if cache_key(b["day"]) not in cached]
+    matches = []
+    if stale:
+        matches = list(
+            _with_day(qs)
+            .filter(tipoff_at__gte=day_start(stale[0]), tipoff_at__lt=day_start(stale[-1] + timedelta(days=1)))
+            .filter(day__in=stale)
+            .select_related("home_team", "away_team")
+            .order_by("tipoff_at", "id")
+        )
+
+    rendered = {day: render_day(day, list(rows)) for day, rows in groupby(matches, key=lambda m: m.day)}
+    fresh_final = {cache_key(d): html for d, html in rendered.items() if d in final}
+    if fresh_final:
+        cache.set_many(fresh_final, timeout=FINAL_DAY_TTL)
+
+    days = [
+        {"day": b["day"], "games": b["games"],
+         "html": cached.get(cache_key(b["day"])) or rendered.get(b["day"], "")}
+        for b in buckets
+    ]
+    return days, matches, next_cursor
+
+
+def invalidate(*days):
+    cache.delete_many([cache_key(d) for d in days if d])
+
+
+def invalidate_for_match(match, before=None):
+    """
+    Hapus fragment hari match ini. `before` = standings.snapshot() sebelum
+    ditulis, supaya hari lama ikut dibersihkan kalau tipoff dipindah.
+    """
+    days = set()
+    if before:
+        days.add(local_day(before[6]))
+    if match.tipoff_at:
+        days.add(local_day(match.tipoff_at))
+    invalidate(*days)
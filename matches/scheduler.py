@@ -0,0 +1,78 @@
+# matches/scheduler.py
+"""
+Transisi status otomatis berdasarkan tipoff_at.
+
+  scheduled -> live      saat tipoff_at <= sekarang
+  live      -> finished  saat tipoff_at <= sekarang - GAME_DURATION, dan skor tidak seri
+
+GAME_DURATION (3 jam, bisa diubah lewat --duration-minutes) hanya perkiraan
+kasar; basket tidak bisa berakhir seri, jadi match live yang skornya masih
+sama (termasuk 0-0 karena skor belum diisi) tidak ditutup otomatis. Match
+seperti itu dibiarkan live dan dilaporkan `overdue()` untuk dicek manual.
+
+Kandidat diambil per batch lewat index (status, tipoff_at), lalu dipindah
+dengan satu UPDATE per batch yang tetap mensyaratkan status lama (aman kalau
+admin/scorekeeper mengubah match yang sama di saat bersamaan). Setiap batch
+mengirim `signals.match_status_changed`.
+"""
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Match
+from .signals import match_status_changed
+
+GAME_DURATION = timedelta(hours=3)
+BATCH_SIZE = 500
+
+
+# skor seri / belum diisi: jangan ditutup otomatis
+TIED = Q(home_score=F("away_score"))
+
+
+def transition(old_status, new_status, cutoff, batch_size=BATCH_SIZE, exclude=None):
+    """Pindahkan match `old_status` dengan tipoff_at <= cutoff (kecuali yang cocok `exclude`) ke `new_status`."""
+    candidates = Match.objects.filter(status=old_status, tipoff_at__lte=cutoff)
+    if exclude is not None:
+        candidates = candidates.exclude(exclude)
+    total = 0
+    while True:
+        ids = list(
+            candidates
+            .order_by("tipoff_at")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        updated = Match.objects.filter(pk__in=ids, status=old_status).update(
+            status=new_status, version=F("version") + 1
+        )
+        total += updated
+        if updated:
+            changed = list(Match.objects.filter(pk__in=ids, status=new_status).with_periods())
+            match_status_changed.send(
+                sender=Match, matches=changed, old_status=old_status, new_status=new_status
+            )
+        if len(ids) < batch_size:
+            break
+    return total
+
+
+def run(now=None, duration=GAME_DURATION, batch_size=BATCH_SIZE):
+    """Satu putaran scheduler. Return jumlah match per status tujuan."""
+    now = now or timezone.now()
+    return {
+        Match.Status.FINISHED: transition(
+            Match.Status.LIVE, Match.Status.FINISHED, now - duration, batch_size, exclude=TIED
+        ),
+        Match.Status.LIVE: transition(
+            Match.Status.SCHEDULED, Match.Status.LIVE, now, batch_size
+        ),
+    }
+
+
+def overdue(now=None, duration=GAME_DURATION):
+    """Match live yang sudah lewat `duration` tapi tidak ditutup karena skornya seri."""
+    now = now or timezone.now()
+    return Match.objects.filter(status=Match.Status.LIVE, tipoff_at__lte=now - duration).filter(TIED)
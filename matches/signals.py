@@ -0,0 +1,60 @@
+# matches/signals.py
+"""
+Satu tempat untuk semua efek samping penulisan Match.
+
+`match_written()` / `matches_written()` dipanggil setiap kali match dibuat,
+diubah, atau dihapus (view CRUD/skor, API Flutter, import_matches_xlsx, dan
+scheduler lewat sinyal di bawah). Urutannya: Standing, cache
+head-to-head/jadwal per hari/facet/leaderboard, lalu live scoreboard. Cache
+atau feed baru cukup ditambahkan di sini.
+
+`match_status_changed` dikirim scheduler (lihat scheduler.py) sekali per batch
+transisi status dengan argumen `matches` (list instance yang sudah berstatus
+baru), `old_status`, dan `new_status`; receiver bawaan meneruskannya ke
+`matches_written()`.
+
+Scheduler biasanya berjalan sebagai proses sendiri (advance_match_status), jadi
+receiver ini tidak berjalan di worker web: invalidasi cache hanya sampai ke
+worker lain karena production memakai cache bersama (settings.CACHES), dan
+event live sampai ke viewer lewat broker LISTEN/NOTIFY PostgreSQL (live.py).
+"""
+from django.dispatch import Signal, receiver
+
+from . import facets, h2h, leaderboards, live, schedule_days, standings
+
+match_status_changed = Signal()
+
+
+def match_written(match, before=None, deleted_pk=None):
+    """
+    Efek samping satu penulisan. `before` = standings.snapshot() sebelum ditulis
+    (None untuk match baru); `deleted_pk` = id match kalau baru saja dihapus
+    (Model.delete() mengosongkan pk instance).
+    """
+    matches_written([(match, before, deleted_pk)])
+
+
+def matches_written(writes):
+    """Versi batch `match_written()`: `writes` = [(match, before, deleted_pk), ...]."""
+    keys = set()
+    for match, before, deleted_pk in writes:
+        keys |= standings.keys_for_match(match, before, deleted=deleted_pk is not None)
+    standings.refresh(keys)
+
+    for match, before, _ in writes:
+        h2h.invalidate_for_match(match, before)
+        schedule_days.invalidate_for_match(match, before)
+        leaderboards.invalidate_for_match(match, before)
+    if writes:
+        facets.invalidate()
+
+    for match, _, deleted_pk in writes:
+        if deleted_pk is not None:
+            live.publish_deleted(deleted_pk)
+        else:
+            live.publish_match(match)
+
+
+@receiver(match_status_changed, dispatch_uid="matches.match_written")
+def status_changed(sender, matches, **kwargs):
+    matches_written([(m, None, None) for m in matches])
@@ -0,0 +1,168 @@
+# matches/standings.py
+"""
+Pemeliharaan tabel Standing.
+
+Setiap penulisan Match yang relevan (status jadi/berhenti `finished`, skor,
+tim, atau season berubah) hanya menghitung ulang baris (season, team) yang
+terkena — dua tim per match — dengan satu aggregate + satu query streak.
+`rebuild_all()` menghitung ulang seluruh tabel dari nol untuk verifikasi.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Sum, When
+
+from .models import Match, Standing
+
+STAT_FIELDS = (
+    "wins", "losses", "points_for", "points_against",
+    "home_wins", "home_losses", "away_wins", "away_losses", "streak",
+)
+
+
+def snapshot(match):
+    """
+    Simpan keadaan match sebelum ditulis; dipakai refresh_for_match() dan
+    invalidasi cache lain. Tipoff ikut karena urutan match menentukan streak.
+    """
+    if match.pk is None:
+        return None
+    return (
+        match.season_id, match.home_team_id, match.away_team_id,
+        match.status, match.home_score, match.away_score, match.tipoff_at,
+    )
+
+
+def affected_keys(state):
+    """(season_id, team_id) yang standing-nya bergantung pada snapshot `state`."""
+    if not state or state[3] != Match.Status.FINISHED:
+        return set()
+    season_id, home_team_id, away_team_id = state[:3]
+    return {(season_id, home_team_id), (season_id, away_team_id)}
+
+
+def keys_for_match(match, before=None, deleted=False):
+    """
+    (season_id, team_id) yang perlu di-refresh setelah `match` disimpan/dihapus.
+    `before` = hasil snapshot() sebelum perubahan (None untuk match baru).
+    """
+    after = None if deleted else snapshot(match)
+    if before == after:
+        return set()
+    return affected_keys(before) | affected_keys(after)
+
+
+def refresh_for_match(match, before=None, deleted=False):
+    """Perbarui standing kedua tim setelah `match` disimpan/dihapus."""
+    refresh(keys_for_match(match, before, deleted))
+
+
+def refresh(keys):
+    for season_id, team_id in keys:
+        recompute(season_id, team_id)
+
+
+def recompute(season_id, team_id):
+    """Hitung ulang satu baris Standing dari match finished milik tim tsb."""
+    games = Match.objects.filter(status=Match.Status.FINISHED, season_id=season_id).filter(
+        Q(home_team_id=team_id) | Q(away_team_id=team_id)
+    )
+    is_home = Q(home_team_id=team_id)
+    stats = games.aggregate(
+        home_wins=Count("pk", filter=is_home & Q(home_score__gt=F("away_score"))),
+        home_losses=Count("pk", filter=is_home & Q(home_score__lt=F("away_score"))),
+        away_wins=Count("pk", filter=~is_home & Q(away_score__gt=F("home_score"))),
+        away_losses=Count("pk", filter=~is_home & Q(away_score__lt=F("home_score"))),
+        points_for=Sum(Case(When(is_home, then=F("home_score")), default=F("away_score"))),
+        points_against=Sum(Case(When(is_home, then=F("away_score")), default=F("home_score"))),
+    )
+
+    lookup = {"season_id": season_id, "team_id": team_id}
+    if stats["points_for"] is None:
+        # tidak ada lagi match finished untuk tim ini di season ini
+        Standing.objects.filter(**lookup).delete()
+        return None
+
+    stats["wins"] = stats["home_wins"] + stats["away_wins"]
+    stats["losses"] = stats["home_losses"] + stats["away_losses"]
+    stats["streak"] = _current_streak(games, team_id)
+    standing, _ = Standing.objects.update_or_create(**lookup, defaults=stats)
+    return standing
+
+
+def _outcome(team_id, home_team_id, home_score, away_score):
+    """+1 menang, -1 kalah, 0 seri dari sudut pandang tim `team_id`."""
+    diff = home_score - away_score if home_team_id == team_id else away_score - home_score
+    return (diff > 0) - (diff < 0)
+
+
+def _current_streak(games, team_id):
+    streak = 0
+    rows = games.order_by("-tipoff_at", "-id").values_list("home_team_id", "home_score", "away_score")
+    for home_team_id, home_score, away_score in rows.iterator():
+        result = _outcome(team_id, home_team_id, home_score, away_score)
+        if result == 0 or (streak and (result > 0) != (streak > 0)):
+            break
+        streak += result
+    return streak
+
+
+def compute_all():
+    """
+    Hitung seluruh klasemen dari nol dalam satu pass berurutan atas match finished.
+    Return: {(season_id, team_id): {field: value}}
+    """
+    table = {}
+    rows = (
+        Match.objects.filter(status=Match.Status.FINISHED)
+        .order_by("tipoff_at", "id")
+        .values_list("season_id", "home_team_id", "away_team_id", "home_score", "away_score")
+    )
+    for season_id, home_team_id, away_team_id, home_score, away_score in rows.iterator(chunk_size=2000):
+        for team_id, side, pf, pa in (
+            (home_team_id, "home", home_score, away_score),
+            (away_team_id, "away", away_score, home_score),
+        ):
+            row = table.setdefault((season_id, team_id), dict.fromkeys(STAT_FIELDS, 0))
+            row["points_for"] += pf
+            row["points_against"] += pa
+            result = (pf > pa) - (pf < pa)
+            if result > 0:
+                row["wins"] += 1
+                row[f"{side}_wins"] += 1
+            elif result < 0:
+                row["losses"] += 1
+                row[f"{side}_losses"] += 1
+            if result == 0:
+                row["streak"] = 0
+            elif row["streak"] and (result > 0) == (row["streak"] > 0):
+                row["streak"] += result
+            else:
+                row["streak"] = result
+    return table
+
+
+def diff_all():
+    """Bandingkan tabel Standing dengan compute_all(); return list perbedaan."""
+    expected = compute_all()
+    problems = []
+    for s in Standing.objects.all().iterator():
+        key = (s.season_id, s.team_id)
+        want = expected.pop(key, None)
+        if want is None:
+            problems.append((key, "extra row"))
+            continue
+        got = {f: getattr(s, f) for f in STAT_FIELDS}
+        if got != want:
+            problems.append((key, {f: (got[f], want[f]) for f in STAT_FIELDS if got[f] != want[f]}))
+    problems.extend((key, "missing row") for key in expected)
+    return problems
+
+
+@transaction.atomic
+def rebuild_all():
+    table = compute_all()
+    Standing.objects.all().delete()
+    Standing.objects.bulk_create(
+        Standing(season_id=season_id, team_id=team_id, **stats)
+        for (season_id, team_id), stats in table.items()
+    )
+    return len(table)
@@ -0,0 +1,81 @@
+# matches/stats.py
+"""
+Agregasi statistik box score yang dihitung langsung di database.
+"""
+from django.db.models import Count, F, FloatField, Q, Sum, Window
+from django.db.models.functions import Cast, Coalesce, NullIf, RowNumber
+
+from .models import PlayerBoxScore
+
+LEADER_STATS = ("pts", "reb", "ast")
+
+TOTAL_FIELDS = (
+    "pts", "reb", "ast", "stl", "blk", "tov", "pf",
+    "fg_made", "fg_att", "tp_made", "tp_att", "ft_made", "ft_att",
+)
+
+
+def _pct(made, att):
+    """SUM(made)/SUM(att) sebagai float di SQL; 0.0 kalau tidak ada attempt."""
+    return Coalesce(
+        Cast(Sum(made), FloatField()) / Cast(NullIf(Sum(att), 0), FloatField()),
+        0.0,
+        output_field=FloatField(),
+    )
+
+
+def team_totals(match_id):
+    """
+    Total per tim untuk satu match dalam satu GROUP BY query.
+    Return: {team: {"players": n, "pts": .., ..., "fg_pct": .., "tp_pct": .., "ft_pct": ..}}
+    """
+    rows = (
+        PlayerBoxScore.objects.filter(match_id=match_id)
+        .order_by()
+        .values("team")
+        .annotate(
+            players=Count("id"),
+            fg_pct=_pct("fg_made", "fg_att"),
+            tp_pct=_pct("tp_made", "tp_att"),
+            ft_pct=_pct("ft_made", "ft_att"),
+            # alias sum_* karena nama kolom asli tidak boleh dipakai sebagai annotation
+            **{f"sum_{f}": Sum(f) for f in TOTAL_FIELDS},
+        )
+    )
+    totals = {}
+    for row in rows:
+        team = row.pop("team")
+        totals[team] = {k.removeprefix("sum_"): v for k, v in row.items()}
+    return totals
+
+
+def match_leaders(match_ids):
+    """
+    Pemimpin pts/reb/ast tiap tim di setiap match dalam satu query:
+    ROW_NUMBER() OVER (PARTITION BY match, team ORDER BY stat DESC, id) per stat,
+    lalu hanya baris yang rank 1 di salah satu stat yang dikirim balik.
+    Return: {match_id: {team_id: {"pts": {"player", "value"}, ...}}}; stat 0 dilewati.
+    """
+    if not match_ids:
+        return {}
+    partition = [F("match_id"), F("team_id")]
+    ranks = {
+        f"{stat}_rank": Window(RowNumber(), partition_by=partition, order_by=[F(stat).desc(), F("id").asc()])
+        for stat in LEADER_STATS
+    }
+    top = Q()
+    for name in ranks:
+        top |= Q(**{name: 1})
+    rows = (
+        PlayerBoxScore.objects.filter(match_id__in=match_ids)
+        .annotate(**ranks)
+        .filter(top)
+        .values("match_id", "team_id", "player__full_name", *LEADER_STATS, *ranks)
+    )
+    leaders = {}
+    for row in rows:
+        team = leaders.setdefault(row["match_id"], {}).setdefault(row["team_id"], {})
+        for stat in LEADER_STATS:
+            if row[f"{stat}_rank"] == 1 and row[stat]:
+                team[stat] = {"player": row["player__full_name"], "value": row[stat]}
+    return leaders
@@ -0,0 +1,81 @@
+# matches/streaming.py
+"""
+Generator untuk export besar (JSON/XML) yang dikirim lewat StreamingHttpResponse.
+
+Baris diambil dengan `.values()` + `.iterator(chunk_size=...)` sehingga tidak ada
+instance model yang dibuat dan memori puncak hanya sebesar satu chunk.
+"""
+import json
+from xml.sax.saxutils import escape
+
+from django.db.models import F
+
+CHUNK_SIZE = 2000
+
+# Kolom yang dikirim ke client (Flutter) — urutan = urutan key di JSON
+MATCH_EXPORT_FIELDS = (
+    "uuid", "home_team", "away_team", "tipoff_at",
+    "venue", "status", "home_score", "away_score",
+)
+
+
+def match_export_rows(qs, chunk_size=CHUNK_SIZE):
+    """Iterasi dict per match (uuid & tipoff_at sudah jadi string, tim = nama)."""
+    rows = qs.values(
+        *(f for f in MATCH_EXPORT_FIELDS if f not in ("home_team", "away_team")),
+        home_team_name=F("home_team__name"),
+        away_team_name=F("away_team__name"),
+    )
+    for row in rows.iterator(chunk_size=chunk_size):
+        row["home_team"] = row.pop("home_team_name")
+        row["away_team"] = row.pop("away_team_name")
+        row["uuid"] = str(row["uuid"])
+        row["tipoff_at"] = row["tipoff_at"].isoformat()
+        yield {f: row[f] for f in MATCH_EXPORT_FIELDS}
+
+
+def iter_json_array(rows, chunk_size=CHUNK_SIZE):
+    """
+    Tulis `rows` sebagai satu JSON array secara bertahap.
+    Satu potongan di-yield per `chunk_size` baris supaya byte pertama keluar
+    segera tanpa overhead satu write per baris.
+    """
+    yield "["
+    buf = []
+    first = True
+    for row in rows:
+        encoded = json.dumps(row)
+        buf.append(encoded if first else "," + encoded)
+        first = False
+        if len(buf) >= chunk_size:
+            yield "".join(buf)
+            buf = []
+    if buf:
+        yield "".join(buf)
+    yield "]"
+
+
+def iter_xml_elements(rows, root, item, pretty=False, chunk_size=CHUNK_SIZE):
+    """
+    Tulis `rows` (iterable of dict) sebagai dokumen XML secara bertahap:
+    <root><item><key>value</key>...</item>...</root>.
+    `pretty=True` menambah indentasi 2 spasi langsung saat menulis, tanpa parse ulang.
+    """
+    nl, ind1, ind2 = ("\n", "  ", "    ") if pretty else ("", "", "")
+    yield f'<?xml version="1.0" encoding="utf-8"?>{nl}<{root}>{nl}'
+    buf = []
+    for row in rows:
+        parts = [f"{ind1}<{item}>{nl}"]
+        for key, value in row.items():
+            if value is None or value == "":
+                parts.append(f"{ind2}<{key}/>{nl}")
+            else:
+                parts.append(f"{ind2}<{key}>{escape(str(value))}</{key}>{nl}")
+        parts.append(f"{ind1}</{item}>{nl}")
+        buf.append("".join(parts))
+        if len(buf) >= chunk_size:
+            yield "".join(buf)
+            buf = []
+    if buf:
+        yield "".join(buf)
+    yield f"</{root}>{nl}"
@@ -1,11 +1,14 @@
 # matches/tests.py
+import json
 import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
+from unittest import mock, skipUnless
 
 from django.contrib.admin.sites import AdminSite
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
 from django.http import HttpResponse
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
@@ -14,11 +17,15 @@ from django.utils.timezone import make_aware
 from openpyxl import Workbook
 
 from matches.forms import MatchForm, TeamForm, PlayerForm, MatchScoreForm, PlayerBoxScoreForm
-from matches.models import Match, Player, PlayerBoxScore
+from matches.models import Match, MatchPeriod, Player, PlayerBoxScore, Standing, Team
 
 User = get_user_model()
 
 
+def _team(name):
+    return Team.objects.get_or_create(name=name)[0]
+
+
 # ---- Model -------------------------------------------------------------------
 class MatchModelTests(TestCase):
     def test_str_method_current_format(self):
@@ -28,8 +35,8 @@ class MatchModelTests(TestCase):
         """
         tip = make_aware(datetime(2025, 10, 24, 8, 36, 0))
         m = Match.objects.create(
-            home_team="Los Angeles Lakers",
-            away_team="Golden State Warriors",
+            home_team=_team("Los Angeles Lakers"),
+            away_team=_team("Golden State Warriors"),
             tipoff_at=tip,
             status="scheduled",
         )
@@ -38,41 +45,41 @@ class MatchModelTests(TestCase):
 
     def test_winner_home_away(self):
         m1 = Match.objects.create(
-            home_team="A", away_team="B", tipoff_at=timezone.now(),
+            home_team=_team("A"), away_team=_team("B"), tipoff_at=timezone.now(),
             status="finished", home_score=101, away_score=99
         )
         self.assertEqual(m1.winner(), "home")
 
         m2 = Match.objects.create(
-            home_team="A", away_team="B", tipoff_at=timezone.now(),
+            home_team=_team("A"), away_team=_team("B"), tipoff_at=timezone.now(),
             status="finished", home_score=95, away_score=100
         )
         self.assertEqual(m2.winner(), "away")
 
     def test_winner_tie(self):
         m = Match.objects.create(
-            home_team="A", away_team="B", tipoff_at=timezone.now(),
+            home_team=_team("A"), away_team=_team("B"), tipoff_at=timezone.now(),
             status="finished", home_score=100, away_score=100
         )
         self.assertEqual(m.winner(), "tie")
 
     def test_went_to_ot_property(self):
         m1 = Match.objects.create(
-            home_team="A", away_team="B", tipoff_at=timezone.now(),
+            home_team=_team("A"), away_team=_team("B"), tipoff_at=timezone.now(),
             status="finished", home_score=101, away_score=99
         )
         self.assertFalse(m1.went_to_ot)
 
         m2 = Match.objects.create(
-            home_team="A", away_team="B", tipoff_at=timezone.now(),
+            home_team=_team("A"), away_team=_team("B"), tipoff_at=timezone.now(),
             status="finished", home_score=101, away_score=99,
-            ot1_home=5, ot1_away=3
         )
+        MatchPeriod.objects.create(match=m2, number=5, home_points=5, away_points=3)
         self.assertTrue(m2.went_to_ot)
 
     def test_status_properties(self):
         m1 = Match.objects.create(
-            home_team="A", away_team="B", tipoff_at=timezone.now(),
+            home_team=_team("A"), away_team=_team("B"), tipoff_at=timezone.now(),
             status="scheduled"
         )
         self.assertTrue(m1.is_scheduled)
@@ -80,7 +87,7 @@ class MatchModelTests(TestCase):
         self.assertFalse(m1.is_finished)
 
         m2 = Match.objects.create(
-            home_team="A", away_team="B", tipoff_at=timezone.now(),
+            home_team=_team("A"), away_team=_team("B"), tipoff_at=timezone.now(),
             status="live"
         )
         self.assertFalse(m2.is_scheduled)
@@ -88,7 +95,7 @@ class MatchModelTests(TestCase):
         self.assertFalse(m2.is_finished)
 
         m3 = Match.objects.create(
-            home_team="A", away_team="B", tipoff_at=timezone.now(),
+            home_team=_team("A"), away_team=_team("B"), tipoff_at=timezone.now(),
             status="finished"
         )
         self.assertFalse(m3.is_scheduled)
@@ -198,6 +205,7 @@ class PlayerFormTests(TestCase):
 class MatchScoreFormTests(TestCase):
     def test_match_score_form_valid(self):
         form = MatchScoreForm(data={
+            "version": 1,
             "q1_home": 25, "q1_away": 20,
             "q2_home": 30, "q2_away": 25,
             "q3_home": 20, "q3_away": 30,
@@ -215,7 +223,7 @@ class MatchScoreFormTests(TestCase):
 class PlayerBoxScoreFormTests(TestCase):
     def setUp(self):
         self.match = Match.objects.create(
-            home_team="LAL", away_team="GSW",
+            home_team=_team("LAL"), away_team=_team("GSW"),
             tipoff_at=timezone.now(), status="finished"
         )
         self.player = Player.objects.create(
@@ -277,7 +285,7 @@ class PlayerBoxScoreFormTests(TestCase):
     def test_player_boxscore_form_edit_mode(self):
         # Test edit mode with existing instance
         boxscore = PlayerBoxScore.objects.create(
-            match=self.match, player=self.player, team="LAL", minutes=32.5
+            match=self.match, player=self.player, team=_team("LAL"), minutes=32.5
         )
         form = PlayerBoxScoreForm(instance=boxscore, match=self.match)
         # Should have initial minutes in mm:ss format
@@ -307,7 +315,7 @@ class MatchesViewsSmokeTests(TestCase):
     def setUp(self):
         self.u = User.objects.create_user("tester", "pass")
         self.m = Match.objects.create(
-            home_team="LAL", away_team="GSW",
+            home_team=_team("LAL"), away_team=_team("GSW"),
             tipoff_at=timezone.now(), status="scheduled"
         )
 
@@ -367,7 +375,7 @@ class MatchViewsTests(TestCase):
     def setUp(self):
         self.user = get_user_model().objects.create_user("tester", "pass")
         self.match = Match.objects.create(
-            home_team="LAL", away_team="GSW",
+            home_team=_team("LAL"), away_team=_team("GSW"),
             tipoff_at=timezone.now(), status="scheduled"
         )
 
@@ -379,7 +387,7 @@ class MatchViewsTests(TestCase):
     def test_match_results_view(self):
         # Create a finished match
         finished_match = Match.objects.create(
-            home_team="BOS", away_team="MIA",
+            home_team=_team("BOS"), away_team=_team("MIA"),
             tipoff_at=timezone.now(), status="finished",
             home_score=108, away_score=102
         )
@@ -435,6 +443,7 @@ class MatchViewsTests(TestCase):
     def test_match_edit_post_valid(self):
         self.client.force_login(self.user)
         resp = self.client.post(reverse("matches:edit", args=[self.match.pk]), {
+            "version": self.match.version,
             "home_team": "LAL",
             "away_team": "BOS",  # Changed
             "tipoff_at": timezone.now().isoformat(),
@@ -468,6 +477,7 @@ class MatchViewsTests(TestCase):
     def test_match_update_score_post(self):
         self.client.force_login(self.user)
         resp = self.client.post(reverse("matches:score", args=[self.match.pk]), {
+            "version": self.match.version,
             "q1_home": 25, "q1_away": 20,
             "q2_home": 30, "q2_away": 25,
         })
@@ -482,7 +492,7 @@ class MatchViewsTests(TestCase):
         self.client.force_login(self.user)
         player = Player.objects.create(team="LAL", full_name="Test Player")
         boxscore = PlayerBoxScore.objects.create(
-            match=self.match, player=player, team="LAL"
+            match=self.match, player=player, team=_team("LAL")
         )
         resp = self.client.get(reverse("matches:boxscore_edit", args=[self.match.pk, boxscore.pk]))
         self.assertEqual(resp.status_code, 200)
@@ -517,7 +527,7 @@ class MatchViewsTests(TestCase):
         self.client.force_login(self.user)
         player = Player.objects.create(team="LAL", full_name="Test Player")
         boxscore = PlayerBoxScore.objects.create(
-            match=self.match, player=player, team="LAL"
+            match=self.match, player=player, team=_team("LAL")
         )
         resp = self.client.post(reverse("matches:boxscore_edit", args=[self.match.pk, boxscore.pk]), {
             "player": player.pk,
@@ -545,13 +555,976 @@ class MatchViewsTests(TestCase):
     def test_matches_json_view(self):
         resp = self.client.get(reverse("matches:api_json"))
         self.assertEqual(resp.status_code, 200)
-        self.assertIn("matches", resp.json())
+        self.assertTrue(resp.streaming)
+        data = json.loads(b"".join(resp.streaming_content))
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["uuid"], str(self.match.uuid))
+        self.assertEqual(data[0]["tipoff_at"], self.match.tipoff_at.isoformat())
+        self.assertEqual(
+            set(data[0]),
+            {"uuid", "home_team", "away_team", "tipoff_at", "venue", "status", "home_score", "away_score"},
+        )
+
+    def test_matches_json_streams_in_chunks(self):
+        from matches.streaming import iter_json_array
+        rows = [{"n": i} for i in range(5)]
+        parts = list(iter_json_array(iter(rows), chunk_size=2))
+        self.assertEqual(len(parts), 5)  # "[", 3 chunk, "]"
+        self.assertEqual(json.loads("".join(parts)), rows)
+
+    def test_matches_json_empty_table(self):
+        Match.objects.all().delete()
+        resp = self.client.get(reverse("matches:api_json"))
+        self.assertEqual(json.loads(b"".join(resp.streaming_content)), [])
 
     def test_matches_xml_view(self):
         resp = self.client.get(reverse("matches:api_xml"))
         self.assertEqual(resp.status_code, 200)
         self.assertIn("application/xml", resp["Content-Type"])
 
+    def test_matches_xml_streams_valid_document(self):
+        from xml.etree.ElementTree import fromstring
+        self.match.venue = "Crypto.com <Arena> & Co"
+        self.match.save()
+        for params in ({}, {"pretty": "1"}):
+            resp = self.client.get(reverse("matches:api_xml"), params)
+            self.assertTrue(resp.streaming)
+            body = b"".join(resp.streaming_content).decode()
+            root = fromstring(body)
+            self.assertEqual(root.tag, "matches")
+            self.assertEqual(root.find("match/uuid").text, str(self.match.uuid))
+            self.assertEqual(root.find("match/venue").text, "Crypto.com <Arena> & Co")
+        self.assertIn("\n  <match>\n    <uuid>", body)
+
+
+# ---- Keyset pagination -------------------------------------------------------
+class MatchKeysetPaginationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        base = make_aware(datetime(2025, 1, 1, 19, 0, 0))
+        # dua match berbagi tipoff_at yang sama untuk menguji tie-breaker id
+        self.matches = [
+            Match.objects.create(
+                home_team=_team("LAL"), away_team=_team(f"T{i}"),
+                tipoff_at=base + timedelta(days=i // 2),
+                status="finished", venue="Arena",
+            )
+            for i in range(5)
+        ]
+
+    def _schedule_days(self):
+        days, cursor = [], None
+        while True:
+            params = {"size": 1}
+            if cursor:
+                params["cursor"] = cursor
+            resp = self.client.get(reverse("matches:schedule"), params)
+            self.assertEqual(resp.status_code, 200)
+            days += resp.context["days"]
+            cursor = resp.context["next_cursor"]
+            if not cursor:
+                break
+        return days
+
+    def test_schedule_pages_cover_all_rows_in_order(self):
+        # putaran kedua dilayani dari fragment hari final di cache; hasilnya harus sama
+        for _ in range(2):
+            days = self._schedule_days()
+            self.assertEqual([d["day"] for d in days],
+                             sorted({timezone.localdate(m.tipoff_at) for m in self.matches}))
+            self.assertEqual(sum(d["games"] for d in days), len(self.matches))
+            html = "".join(d["html"] for d in days)
+            positions = [html.index(f'href="{reverse("matches:detail", args=[m.pk])}"') for m in self.matches]
+            self.assertEqual(positions, sorted(positions))
+
+    def test_results_ajax_returns_descending_page_and_cursor(self):
+        resp = self.client.get(
+            reverse("matches:results"), {"size": 3},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        data = resp.json()
+        self.assertTrue(data["ok"])
+        self.assertEqual([m["id"] for m in data["matches"]], [m.pk for m in reversed(self.matches)][:3])
+        self.assertIsNotNone(data["next_cursor"])
+        self.assertIn("rows_html", data)
+
+        resp = self.client.get(
+            reverse("matches:results"), {"size": 3, "cursor": data["next_cursor"]},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        data = resp.json()
+        self.assertEqual([m["id"] for m in data["matches"]], [m.pk for m in reversed(self.matches)][3:])
+        self.assertIsNone(data["next_cursor"])
+
+    def test_load_more_link_keeps_size_and_search(self):
+        resp = self.client.get(reverse("matches:results"), {"size": 2, "q": "LAL"})
+        cursor = resp.context["next_cursor"]
+        self.assertContains(resp, f'href="?q=LAL&size=2&cursor={cursor}"')
+
+    def test_search_is_kept_and_invalid_cursor_falls_back_to_first_page(self):
+        resp = self.client.get(reverse("matches:schedule"), {"q": "T3", "cursor": "not-a-cursor"})
+        self.assertEqual([m.pk for m in resp.context["matches"]], [self.matches[3].pk])
+
+
+# ---- Jadwal per hari ---------------------------------------------------------
+class ScheduleDayTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        # 23:30 dan 00:30 WIB = hari berbeda walau sama-sama 1 Jan di UTC
+        self.late = Match.objects.create(home_team=_team("LAL"), away_team=_team("GSW"),
+                                         tipoff_at=make_aware(datetime(2025, 1, 1, 23, 30)), status="finished")
+        self.early = Match.objects.create(home_team=_team("BOS"), away_team=_team("MIA"),
+                                          tipoff_at=make_aware(datetime(2025, 1, 2, 0, 30)), status="finished")
+        self.url = reverse("matches:schedule")
+
+    def test_groups_by_local_day(self):
+        resp = self.client.get(self.url)
+        self.assertEqual([d["day"].isoformat() for d in resp.context["days"]], ["2025-01-01", "2025-01-02"])
+        self.assertContains(resp, 'data-day="2025-01-02"')
+
+    def test_final_days_come_from_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):  # hanya GROUP BY hari
+            resp = self.client.get(self.url)
+        self.assertContains(resp, "GSW")
+        self.assertEqual(resp.context["matches"], [])
+
+    def test_today_and_open_days_are_rendered_every_time(self):
+        Match.objects.create(home_team=_team("LAL"), away_team=_team("BOS"), tipoff_at=timezone.now())
+        self.client.get(self.url)
+        resp = self.client.get(self.url)
+        self.assertEqual([m.home_team.name for m in resp.context["matches"]], ["LAL"])
+
+    def test_writing_a_match_drops_its_day_fragment(self):
+        self.client.get(self.url)
+        self.client.force_login(get_user_model().objects.create_user("scorer", "pass"))
+        self.client.post(reverse("matches:score", args=[self.late.pk]),
+                         {"version": self.late.version, "q1_home": 77, "q1_away": 70})
+        self.assertContains(self.client.get(self.url), "77")
+
+    def test_ajax_pages_by_day(self):
+        resp = self.client.get(self.url, {"size": 1}, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        data = resp.json()
+        self.assertEqual(([d["date"] for d in data["days"]], data["next_cursor"]), (["2025-01-01"], "2025-01-01"))
+        data = self.client.get(self.url, {"size": 1, "cursor": data["next_cursor"]},
+                               HTTP_X_REQUESTED_WITH="XMLHttpRequest").json()
+        self.assertEqual(([d["date"] for d in data["days"]], data["next_cursor"]), (["2025-01-02"], None))
+        self.assertIn("MIA", data["rows_html"])
+
+
+# ---- Query API multi-filter --------------------------------------------------
+class MatchQueryApiTests(TestCase):
+    def setUp(self):
+        from matches.models import Season
+        self.season = Season.objects.create(name="2025", start_date="2025-01-01", end_date="2025-06-30")
+        base = make_aware(datetime(2025, 1, 1, 19, 0))
+        rows = [("LAL", "GSW", "finished", "Arena", 0), ("BOS", "LAL", "finished", "Garden", 1),
+                ("BOS", "MIA", "live", "Garden", 1), ("LAL", "MIA", "scheduled", "Arena", 5)]
+        self.matches = [
+            Match.objects.create(home_team=_team(h), away_team=_team(a), status=st, venue=v,
+                                 season=self.season if d < 5 else None, tipoff_at=base + timedelta(days=d))
+            for h, a, st, v, d in rows
+        ]
+        self.url = reverse("matches:api")
+
+    def _ids(self, **params):
+        resp = self.client.get(self.url, params)
+        self.assertEqual(resp.status_code, 200)
+        return [m["id"] for m in resp.json()["matches"]]
+
+    def test_filters_combine_in_tipoff_order(self):
+        m = self.matches
+        self.assertEqual(self._ids(), [x.pk for x in m])
+        self.assertEqual(self._ids(team=_team("LAL").pk), [m[0].pk, m[1].pk, m[3].pk])
+        self.assertEqual(self._ids(team=_team("LAL").pk, venue="Arena", season=self.season.pk), [m[0].pk])
+        self.assertEqual(self._ids(status="finished", date_from="2025-01-02", date_to="2025-01-02"), [m[1].pk])
+
+    def test_keyset_pages_and_bad_filters(self):
+        data = self.client.get(self.url, {"size": 3}).json()
+        self.assertEqual(len(data["matches"]), 3)
+        data = self.client.get(self.url, {"size": 3, "cursor": data["next_cursor"]}).json()
+        self.assertEqual([x["id"] for x in data["matches"]], [self.matches[3].pk])
+
+        # filter tim = cabang home + away; cursor berlaku di kedua cabang
+        lal = _team("LAL").pk
+        data = self.client.get(self.url, {"team": lal, "size": 2}).json()
+        self.assertEqual([x["id"] for x in data["matches"]], [self.matches[0].pk, self.matches[1].pk])
+        data = self.client.get(self.url, {"team": lal, "size": 2, "cursor": data["next_cursor"]}).json()
+        self.assertEqual([x["id"] for x in data["matches"]], [self.matches[3].pk])
+        self.assertIsNone(data["next_cursor"])
+
+        resp = self.client.get(self.url, {"status": "bogus", "date_from": "2025-02-01", "date_to": "2025-01-01"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(set(resp.json()["errors"]), {"status", "date_to"})
+
+    @skipUnless(connection.vendor == "sqlite", "format EXPLAIN khusus SQLite")
+    def test_every_filter_combination_uses_an_index(self):
+        import re
+        from itertools import combinations
+        from matches.forms import MatchQueryForm
+        from matches.pagination import keyset_query
+        values = {"team": 1, "status": "live", "season": 1, "venue": "Arena"}
+        for n in range(len(values) + 1):
+            for keys in combinations(values, n):
+                for dates in ({}, {"date_from": "2025-01-01"}, {"date_from": "2025-01-01", "date_to": "2025-01-31"}):
+                    form = MatchQueryForm({**{k: values[k] for k in keys}, **dates})
+                    self.assertTrue(form.is_valid())
+                    plan = keyset_query(form.apply(Match.objects.all()))[:21].explain()
+                    with self.subTest(filters=keys, dates=dates):
+                        self.assertIsNone(re.search(r"SCAN (TABLE )?matches_match(?! USING)", plan), plan)
+                        # urutan (tipoff_at, id) datang dari index, bukan sort semua baris yang cocok
+                        self.assertNotIn("TEMP B-TREE", plan)
+
+
+# ---- Facet status/tim -----------------------------------------------------------
+class MatchFacetTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        now = timezone.now()
+        for home, away, status in [("LAL", "GSW", "finished"), ("LAL", "BOS", "live"),
+                                   ("BOS", "GSW", "scheduled"), ("MIA", "BOS", "canceled")]:
+            Match.objects.create(home_team=_team(home), away_team=_team(away), tipoff_at=now, status=status)
+
+    def _facets(self, q=""):
+        from matches import facets
+        from matches.views import _search
+        return facets.for_search(q, _search)
+
+    def test_status_and_team_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            data = self._facets()
+        self.assertEqual({f["status"]: f["count"] for f in data["statuses"]},
+                         {"scheduled": 1, "live": 1, "finished": 1, "canceled": 1})
+        self.assertEqual([(t["name"], t["count"]) for t in data["teams"]],
+                         [("BOS", 3), ("GSW", 2), ("LAL", 2), ("MIA", 1)])
+
+        data = self._facets("lal")
+        self.assertEqual(data["total"], 2)
+        self.assertEqual({t["name"]: t["count"] for t in data["teams"]}, {"LAL": 2, "GSW": 1, "BOS": 1})
+
+    def test_cached_per_search_and_dropped_on_match_write(self):
+        self._facets("lal")
+        with self.assertNumQueries(0):
+            self._facets("LAL ")
+        self.client.force_login(get_user_model().objects.create_user("editor", "pass"))
+        m = Match.objects.get(status="canceled")
+        self.client.post(reverse("matches:delete", args=[m.pk]))
+        with self.assertNumQueries(1):
+            self.assertEqual(self._facets("lal")["total"], 2)
+        self.assertEqual(self._facets()["total"], 3)
+
+    def test_pages_render_facets(self):
+        self.assertContains(self.client.get(reverse("matches:schedule")), "Live (1)")
+        self.assertContains(self.client.get(reverse("matches:results"), {"q": "MIA"}), "Canceled (1)")
+
+
+# ---- Game log pemain ---------------------------------------------------------
+class PlayerGameLogTests(TestCase):
+    def setUp(self):
+        base = make_aware(datetime(2025, 1, 1, 19, 0, 0))
+        lal = _team("LAL")
+        self.player = Player.objects.create(team="LAL", full_name="LeBron James")
+        self.boxes = []
+        for i in range(3):
+            home, away = (lal, _team(f"T{i}")) if i % 2 == 0 else (_team(f"T{i}"), lal)
+            m = Match.objects.create(home_team=home, away_team=away, tipoff_at=base + timedelta(days=i),
+                                     status="finished", home_score=100 + i, away_score=90)
+            self.boxes.append(PlayerBoxScore.objects.create(match=m, player=self.player, team=lal, pts=20 + i))
+        self.url = reverse("matches:player_game_log_json", args=[self.player.pk])
+
+    def test_pages_newest_first(self):
+        data = self.client.get(self.url, {"size": 2}).json()
+        self.assertEqual([g["pts"] for g in data["games"]], [22, 21])
+        self.assertEqual((data["games"][1]["is_home"], data["games"][1]["opponent"]), (False, "T1"))
+        self.assertEqual((data["games"][1]["team_score"], data["games"][1]["opponent_score"]), (90, 101))
+
+        data = self.client.get(self.url, {"size": 2, "cursor": data["next_cursor"]}).json()
+        self.assertEqual([g["pts"] for g in data["games"]], [20])
+        self.assertIsNone(data["next_cursor"])
+
+    def test_constant_queries(self):
+        # player + satu halaman (join match/team)
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+        resp = self.client.get(reverse("matches:player_game_log", args=[self.player.pk]))
+        self.assertContains(resp, "T1")
+
+    def test_tipoff_copy_follows_match(self):
+        m = Match.objects.get(pk=self.boxes[0].match_id)
+        # tipoff_at tidak berubah -> hanya UPDATE match, box score tidak disentuh
+        m.venue = "Arena 2"
+        with self.assertNumQueries(1):
+            m.save()
+        m.tipoff_at = m.tipoff_at + timedelta(days=10)
+        with self.assertNumQueries(2):
+            m.save()
+        self.boxes[0].refresh_from_db()
+        self.assertEqual(self.boxes[0].tipoff_at, m.tipoff_at)
+        self.assertEqual(self.client.get(self.url).json()["games"][0]["match_id"], m.pk)
+
+    @skipUnless(connection.vendor == "sqlite", "format EXPLAIN khusus SQLite")
+    def test_page_query_uses_gamelog_index_without_sort(self):
+        plan = PlayerBoxScore.objects.filter(player=self.player).order_by("-tipoff_at", "-id")[:20].explain()
+        self.assertIn("boxscore_player_gamelog_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan.upper())
+
+
+# ---- Optimistic score updates ------------------------------------------------
+class MatchScoreVersioningTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("scorer", "pass")
+        self.client.force_login(self.user)
+        self.m = Match.objects.create(home_team=_team("LAL"), away_team=_team("GSW"), tipoff_at=timezone.now(), status="live")
+
+    def test_apply_period_scores_query_count(self):
+        # savepoint + UPDATE match + DELETE periode lama + upsert periode + release
+        with self.assertNumQueries(5):
+            ok = self.m.apply_period_scores({"q1_home": 20, "q1_away": 18, "q2_home": 25}, self.m.version)
+        self.assertTrue(ok)
+        self.m.refresh_from_db()
+        self.assertEqual((self.m.home_score, self.m.away_score, self.m.version), (45, 18, 2))
+
+    def test_stale_version_is_rejected_with_409(self):
+        stale = self.m.version
+        self.client.post(reverse("matches:score", args=[self.m.pk]), {"q1_home": 20, "q1_away": 18, "version": stale})
+        resp = self.client.post(
+            reverse("matches:score", args=[self.m.pk]),
+            {"q1_home": 99, "q1_away": 0, "version": stale},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json()["version"], stale + 1)
+        self.m.refresh_from_db()
+        self.assertEqual((self.m.period_scores()[0], self.m.home_score), (("q1", 20, 18), 20))
+
+        resp = self.client.post(reverse("matches:score", args=[self.m.pk]), {"q1_home": 99, "version": stale})
+        self.assertEqual(resp.status_code, 409)
+
+    def test_missing_version_is_rejected_with_400(self):
+        resp = self.client.post(reverse("matches:score", args=[self.m.pk]), {"q1_home": 20, "q1_away": 18},
+                                HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("version", resp.json()["errors"])
+        self.assertEqual(self.client.post(reverse("matches:score", args=[self.m.pk]), {"q1_home": 20}).status_code, 400)
+        self.m.refresh_from_db()
+        self.assertEqual((self.m.home_score, self.m.version), (0, 1))
+
+    def test_stale_full_edit_is_rejected_with_409(self):
+        data = {"home_team": "LAL", "away_team": "GSW", "tipoff_at": "2025-01-01T19:00",
+                "status": "live", "home_score": 50, "away_score": 40, "version": self.m.version}
+        self.client.post(reverse("matches:score", args=[self.m.pk]), {"q1_home": 20, "version": self.m.version})
+        resp = self.client.post(reverse("matches:edit", args=[self.m.pk]), data, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(resp.status_code, 409)
+        self.m.refresh_from_db()
+        self.assertEqual((self.m.home_score, self.m.version), (20, 2))
+
+        data["version"] = 2
+        self.assertEqual(self.client.post(reverse("matches:edit", args=[self.m.pk]), data).status_code, 302)
+        self.m.refresh_from_db()
+        self.assertEqual((self.m.home_score, self.m.version), (50, 3))
+
+    def test_regular_save_bumps_version(self):
+        self.m.venue = "Arena"
+        self.m.save()
+        self.m.recalc_totals_from_periods(save=True)
+        self.m.refresh_from_db()
+        self.assertEqual(self.m.version, 3)
+
+
+# ---- Skor per periode ----------------------------------------------------------
+class MatchPeriodTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("scorer", "pass")
+        self.client.force_login(self.user)
+        self.m = Match.objects.create(home_team=_team("LAL"), away_team=_team("GSW"), tipoff_at=timezone.now(), status="live")
+
+    def test_fourth_overtime_via_score_view(self):
+        data = {"version": self.m.version, "q1_home": 20, "q1_away": 20, "ot4_home": 7, "ot4_away": 5}
+        self.client.post(reverse("matches:score", args=[self.m.pk]), data)
+        self.m.refresh_from_db()
+        self.assertEqual(self.m.period_scores(), [("q1", 20, 20), ("ot4", 7, 5)])
+        self.assertEqual((self.m.home_score, self.m.away_score), (27, 25))
+        self.assertTrue(self.m.went_to_ot)
+
+    def test_form_offers_spare_overtime_slot(self):
+        MatchPeriod.objects.create(match=self.m, number=6, home_points=3, away_points=2)
+        form = MatchScoreForm(instance=self.m)
+        self.assertIn("ot2_home", form.fields)
+        self.assertIn("ot3_away", form.fields)
+        self.assertEqual(form.fields["ot2_home"].initial, 3)
+
+    def test_with_period_totals(self):
+        MatchPeriod.objects.bulk_create([
+            MatchPeriod(match=self.m, number=1, home_points=20, away_points=18),
+            MatchPeriod(match=self.m, number=5, home_points=4, away_points=None),
+        ])
+        m = Match.objects.with_period_totals().get(pk=self.m.pk)
+        self.assertEqual((m.home_period_total, m.away_period_total, m.last_period), (24, 18, 5))
+
+    def test_results_page_query_count_is_constant(self):
+        self.m.status = "finished"
+        self.m.save()
+        for i in range(5):
+            m = Match.objects.create(home_team=_team("LAL"), away_team=_team("GSW"), tipoff_at=timezone.now(), status="finished")
+            MatchPeriod.objects.create(match=m, number=1 + i, home_points=i, away_points=i)
+        self.client.get(reverse("matches:results"))  # isi cache facet
+        # session + user + halaman + prefetch periode + pemimpin stat
+        with self.assertNumQueries(5):
+            self.client.get(reverse("matches:results"))
+
+
+# ---- Bulk box score ----------------------------------------------------------
+class BulkBoxScoreTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("scorer", "pass")
+        self.client.force_login(self.user)
+        self.m = Match.objects.create(home_team=_team("LAL"), away_team=_team("GSW"), tipoff_at=timezone.now(), status="finished")
+        self.roster = [Player.objects.create(team="LAL", full_name=f"Player {i}") for i in range(13)]
+        self.url = reverse("matches:boxscore_bulk", args=[self.m.pk])
+
+    def _post(self, payload):
+        return self.client.post(self.url, json.dumps(payload), content_type="application/json")
+
+    def test_full_roster_written_in_one_request(self):
+        rows = [{"player": p.pk, "minutes": "20:30", "pts": i, "fg_made": 1, "fg_att": 2} for i, p in enumerate(self.roster)]
+        resp = self._post({"team": "LAL", "players": rows})
+        self.assertEqual(resp.json(), {"ok": True, "created": 13, "updated": 0, "deleted": 0})
+        self.assertEqual(PlayerBoxScore.objects.filter(match=self.m, team__name="LAL").count(), 13)
+        self.assertEqual(str(PlayerBoxScore.objects.get(player=self.roster[0]).minutes), "20.50")
+
+        # kirim ulang -> update, bukan duplikat (unique match+player)
+        rows[0]["pts"] = 40
+        resp = self._post({"team": "LAL", "players": rows[:5], "replace": True})
+        self.assertEqual(resp.json(), {"ok": True, "created": 0, "updated": 5, "deleted": 8})
+        self.assertEqual(PlayerBoxScore.objects.get(player=self.roster[0]).pts, 40)
+
+    def test_invalid_rows_reject_whole_payload(self):
+        other = Player.objects.create(team="GSW", full_name="Other")
+        resp = self._post({"team": "LAL", "players": [
+            {"player": self.roster[0].pk, "pts": 10},
+            {"player": other.pk},
+            {"player": self.roster[1].pk, "fg_made": 5, "fg_att": 2},
+            {"player": self.roster[0].pk},
+            {"player": self.roster[2].pk, "reb": -1},
+        ]})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(set(resp.json()["errors"]), {"1", "2", "3", "4"})
+        self.assertFalse(PlayerBoxScore.objects.exists())
+
+    def test_team_must_belong_to_match(self):
+        resp = self._post({"team": "BOS", "players": [{"player": self.roster[0].pk}]})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("team", resp.json()["errors"])
+
+
+# ---- Match detail box score --------------------------------------------------
+class MatchDetailBoxScoreTests(TestCase):
+    def setUp(self):
+        self.m = Match.objects.create(home_team=_team("LAL"), away_team=_team("GSW"), tipoff_at=timezone.now(), status="finished")
+        for i in range(5):
+            p = Player.objects.create(team="LAL", full_name=f"Laker {i}")
+            PlayerBoxScore.objects.create(match=self.m, player=p, team=_team("LAL"), pts=10, fg_made=4, fg_att=8, tp_att=0)
+        p = Player.objects.create(team="GSW", full_name="Warrior")
+        PlayerBoxScore.objects.create(match=self.m, player=p, team=_team("GSW"), pts=30, fg_made=10, fg_att=20, ft_made=9, ft_att=10)
+
+    def test_detail_query_count_is_constant(self):
+        with self.assertNumQueries(3):
+            resp = self.client.get(reverse("matches:detail", args=[self.m.pk]))
+        self.assertContains(resp, "Laker 4")
+        home, away = resp.context["box_sections"]
+        self.assertEqual((home["team"].name, len(home["rows"])), ("LAL", 5))
+        self.assertEqual(home["totals"]["pts"], 50)
+        self.assertAlmostEqual(home["totals"]["fg_pct"], 0.5)
+        self.assertEqual(home["totals"]["tp_pct"], 0.0)
+
+    def test_detail_json(self):
+        data = self.client.get(reverse("matches:detail_json", args=[self.m.pk])).json()
+        self.assertEqual(len(data["box_scores"]["home"]["players"]), 5)
+        away = data["box_scores"]["away"]
+        self.assertEqual(away["totals"]["pts"], 30)
+        self.assertAlmostEqual(away["totals"]["ft_pct"], 0.9)
+
+
+# ---- Standings ---------------------------------------------------------------
+class StandingsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("scorer", "pass")
+        self.client.force_login(self.user)
+        self.t0 = make_aware(datetime(2025, 1, 1, 19, 0, 0))
+
+    def _finished(self, home, away, hs, as_, day):
+        return Match.objects.create(
+            home_team=_team(home), away_team=_team(away), tipoff_at=self.t0 + timedelta(days=day),
+            status="finished", home_score=hs, away_score=as_,
+        )
+
+    def test_edit_to_finished_updates_both_teams(self):
+        m = Match.objects.create(home_team=_team("LAL"), away_team=_team("GSW"), tipoff_at=self.t0, status="scheduled")
+        self.client.post(reverse("matches:edit", args=[m.pk]), {
+            "version": m.version, "home_team": "LAL", "away_team": "GSW",
+            "tipoff_at": "2025-01-01T19:00", "status": "finished",
+            "home_score": 110, "away_score": 100,
+        })
+        lal = Standing.objects.get(team__name="LAL", season=None)
+        gsw = Standing.objects.get(team__name="GSW", season=None)
+        self.assertEqual((lal.wins, lal.losses, lal.home_wins, lal.streak), (1, 0, 1, 1))
+        self.assertEqual((gsw.wins, gsw.losses, gsw.away_losses, gsw.streak), (0, 1, 1, -1))
+        self.assertEqual((lal.points_for, lal.points_against), (110, 100))
+
+    def test_score_update_and_delete_keep_table_in_sync(self):
+        m = self._finished("LAL", "GSW", 0, 0, 0)
+        self.client.post(reverse("matches:score", args=[m.pk]), {"version": m.version, "q1_home": 20, "q1_away": 30})
+        self.assertEqual(Standing.objects.get(team__name="GSW").wins, 1)
+        self.assertEqual(Standing.objects.get(team__name="LAL").points_against, 30)
+
+        self.client.post(reverse("matches:delete", args=[m.pk]))
+        self.assertFalse(Standing.objects.exists())
+
+    def test_streak_and_rebuild_match_incremental(self):
+        from matches import standings
+        self._finished("LAL", "GSW", 100, 90, 0)
+        self._finished("BOS", "LAL", 100, 90, 1)
+        self._finished("LAL", "BOS", 80, 95, 2)
+        standings.refresh({(None, _team(n).pk) for n in ("LAL", "GSW", "BOS")})
+        self.assertEqual(Standing.objects.get(team__name="LAL").streak, -2)
+        self.assertEqual(Standing.objects.get(team__name="BOS").streak, 2)
+        self.assertEqual(standings.diff_all(), [])
+
+        Standing.objects.filter(team__name="LAL").update(wins=99)
+        self.assertEqual(len(standings.diff_all()), 1)
+        standings.rebuild_all()
+        self.assertEqual(standings.diff_all(), [])
+        self.assertEqual(Standing.objects.get(team__name="LAL").wins, 1)
+
+    def test_standings_json(self):
+        self._finished("LAL", "GSW", 100, 90, 0)
+        from django.core.management import call_command
+        call_command("rebuild_standings")
+        data = self.client.get(reverse("matches:standings_json")).json()
+        self.assertEqual([r["team"] for r in data["standings"]], ["LAL", "GSW"])
+        self.assertEqual(self.client.get(reverse("matches:standings_json"), {"season": "abc"}).status_code, 400)
+
+
+# ---- Head to head ------------------------------------------------------------
+class HeadToHeadTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = get_user_model().objects.create_user("scorer", "pass")
+        self.client.force_login(self.user)
+        self.lal, self.gsw = _team("LAL"), _team("GSW")
+        t0 = make_aware(datetime(2025, 1, 1, 19, 0, 0))
+        for day, (home, away, hs, as_) in enumerate([
+            (self.lal, self.gsw, 110, 100),
+            (self.gsw, self.lal, 95, 105),
+            (self.gsw, self.lal, 120, 100),
+        ]):
+            Match.objects.create(home_team=home, away_team=away, tipoff_at=t0 + timedelta(days=day),
+                                 status="finished", home_score=hs, away_score=as_)
+        # match lain tidak ikut dihitung
+        Match.objects.create(home_team=self.lal, away_team=_team("BOS"), tipoff_at=t0,
+                             status="finished", home_score=90, away_score=80)
+        self.url = reverse("matches:head_to_head_json", args=[self.lal.pk, self.gsw.pk])
+
+    def test_series_from_both_sides(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["series"], {"games": 3, "wins": 2, "losses": 1, "ties": 0, "avg_margin": 0.0})
+        self.assertEqual(data["recent"][0]["home_team"], "GSW")
+
+        other = self.client.get(reverse("matches:head_to_head_json", args=[self.gsw.pk, self.lal.pk])).json()
+        self.assertEqual((other["series"]["wins"], other["series"]["losses"]), (1, 2))
+
+    def test_constant_queries_and_cache(self):
+        # teams + aggregate + recent + periode; aggregate dari cache di request berikutnya
+        with self.assertNumQueries(6):  # +2 untuk session/user
+            self.client.get(self.url)
+        with self.assertNumQueries(5):
+            resp = self.client.get(self.url + "?limit=1")
+        self.assertEqual(len(resp.json()["recent"]), 1)
+
+    def test_write_between_pair_invalidates_cache(self):
+        self.client.get(self.url)
+        m = Match.objects.get(home_team=self.gsw, home_score=120)
+        self.client.post(reverse("matches:score", args=[m.pk]), {"version": m.version, "q1_home": 10, "q1_away": 30})
+        data = self.client.get(self.url).json()
+        self.assertEqual((data["series"]["wins"], data["series"]["losses"]), (3, 0))
+
+    def test_page_and_unknown_team(self):
+        resp = self.client.get(reverse("matches:head_to_head", args=[self.lal.pk, self.gsw.pk]))
+        self.assertContains(resp, "Pertemuan Terakhir")
+        resp = self.client.get(reverse("matches:head_to_head", args=[self.lal.pk, 9999]))
+        self.assertEqual(resp.status_code, 404)
+
+
+# ---- Leaderboard season ------------------------------------------------------
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from matches import standings
+        from matches.models import Season
+        cache.clear()
+        self.user = get_user_model().objects.create_user("scorer", "pass")
+        self.client.force_login(self.user)
+        self.season = Season.objects.create(name="2025/26", start_date="2025-10-01", end_date="2026-06-30")
+        lal, gsw = _team("LAL"), _team("GSW")
+        t0 = make_aware(datetime(2025, 11, 1, 19, 0, 0))
+        self.matches = [
+            Match.objects.create(home_team=lal, away_team=gsw, season=self.season, status="finished",
+                                 tipoff_at=t0 + timedelta(days=i), home_score=100, away_score=90)
+            for i in range(3)
+        ]
+        self.a = Player.objects.create(team="LAL", full_name="Alpha")
+        self.b = Player.objects.create(team="LAL", full_name="Bravo")
+        self.c = Player.objects.create(team="GSW", full_name="Charlie")
+        for m, pts in zip(self.matches, (30, 20, 10)):
+            PlayerBoxScore.objects.create(match=m, player=self.a, team=lal, pts=pts, reb=5)
+        PlayerBoxScore.objects.create(match=self.matches[0], player=self.b, team=lal, pts=40)
+        for m in self.matches[:2]:
+            PlayerBoxScore.objects.create(match=m, player=self.c, team=gsw, pts=20, reb=12)
+        standings.rebuild_all()
+        self.url = reverse("matches:leaderboards_json")
+
+    def test_ranks_with_qualifier_and_ties(self):
+        data = self.client.get(self.url, {"season": self.season.pk}).json()
+        self.assertEqual(data["min_games"], 2)  # 3 game tim * 0.5, dibulatkan ke atas
+        pts = data["leaders"]["pts"]
+        # Bravo (1 game) tidak lolos; Alpha & Charlie seri di rank 1
+        self.assertEqual([(r["rank"], r["player"], r["per_game"]) for r in pts],
+                         [(1, "Alpha", 20.0), (1, "Charlie", 20.0)])
+        self.assertEqual(data["leaders"]["reb"][0]["player"], "Charlie")
+        self.assertEqual(set(data["leaders"]), {"pts", "reb", "ast", "stl", "blk"})
+
+    def test_one_query_per_stat_then_cached(self):
+        from matches import leaderboards
+        with self.assertNumQueries(1 + len(leaderboards.STATS)):
+            leaderboards.season_leaders(self.season.pk)
+        with self.assertNumQueries(0):
+            leaderboards.season_leaders(self.season.pk)
+
+    def test_box_score_write_invalidates_season(self):
+        self.client.get(self.url, {"season": self.season.pk})
+        resp = self.client.post(
+            reverse("matches:boxscore_bulk", args=[self.matches[1].pk]),
+            json.dumps({"team": "LAL", "players": [{"player": self.b.pk, "pts": 50}]}),
+            content_type="application/json",
+        )
+        self.assertTrue(resp.json()["ok"])
+        pts = self.client.get(self.url, {"season": self.season.pk}).json()["leaders"]["pts"]
+        self.assertEqual((pts[0]["player"], pts[0]["per_game"]), ("Bravo", 45.0))
+
+    def test_page_and_bad_season(self):
+        resp = self.client.get(reverse("matches:leaderboards"), {"season": self.season.pk})
+        self.assertContains(resp, "Alpha")
+        self.assertEqual(self.client.get(self.url, {"season": "x"}).status_code, 400)
+
+
+# ---- Today's games (micro-cache) ----------------------------------------------
+class TodayGamesTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        now = timezone.now()
+        self.live = Match.objects.create(home_team=_team("LAL"), away_team=_team("GSW"),
+                                         tipoff_at=now - timedelta(days=1), status="live", home_score=50)
+        self.today = Match.objects.create(home_team=_team("BOS"), away_team=_team("MIA"), tipoff_at=now)
+        Match.objects.create(home_team=_team("BOS"), away_team=_team("MIA"), tipoff_at=now + timedelta(days=3))
+
+    def test_json_lists_today_and_live_games(self):
+        resp = self.client.get(reverse("matches:today_json"))
+        self.assertEqual(resp["Cache-Control"], "public, max-age=1")
+        ids = [m["id"] for m in resp.json()["matches"]]
+        self.assertEqual(ids, [self.live.pk, self.today.pk])
+        self.assertEqual(resp.json()["matches"][0]["home_score"], 50)
+
+    def test_fragment_is_served_from_cache_within_ttl(self):
+        url = reverse("matches:today")
+        self.assertContains(self.client.get(url), "BOS")
+        with self.assertNumQueries(0):
+            self.client.get(url)
+            self.client.get(reverse("matches:today_json"))
+
+    def test_stale_snapshot_served_while_another_request_rebuilds(self):
+        from django.core.cache import cache
+        from matches import today
+        first = today.snapshot()
+        cache.add(today._lock_key(timezone.localdate()), 1)  # request lain sedang rebuild
+        with mock.patch("matches.today.time.time", return_value=first["fresh_until"] + 1):
+            with self.assertNumQueries(0):
+                self.assertEqual(today.snapshot()["data"]["generated_at"], first["data"]["generated_at"])
+        cache.delete(today._lock_key(timezone.localdate()))
+        with mock.patch("matches.today.time.time", return_value=first["fresh_until"] + 1):
+            with self.assertNumQueries(2):
+                today.snapshot()
+
+
+# ---- Live scoreboard (SSE) ---------------------------------------------------
+class LiveScoreboardTests(TestCase):
+    def setUp(self):
+        self.m = Match.objects.create(
+            home_team=_team("LAL"), away_team=_team("GSW"), tipoff_at=timezone.now(),
+            status="live", home_score=10, away_score=8,
+        )
+
+    def _data(self, chunk):
+        return json.loads(chunk.split("data: ", 1)[1])
+
+    def test_stream_sends_snapshot_then_deltas(self):
+        from matches.live import LocalBroker, event_stream, match_state
+        broker = LocalBroker()
+        stream = event_stream(source=broker, heartbeat=0.01)
+        self.assertTrue(next(stream).startswith("retry:"))
+        snapshot = next(stream)
+        self.assertIn("event: snapshot", snapshot)
+        self.assertEqual(self._data(snapshot)[0]["home_score"], 10)
+        self.assertEqual(broker.subscriber_count, 1)
+
+        self.m.home_score = 12
+        MatchPeriod.objects.create(match=self.m, number=1, home_points=12)
+        broker.publish("match", match_state(self.m))
+        delta = self._data(next(stream))
+        self.assertEqual(delta, {"id": self.m.pk, "home_score": 12, "periods": {"q1": [12, None]}})
+
+        self.m.status = "finished"
+        broker.publish("match", match_state(self.m))
+        self.assertEqual(self._data(next(stream)), {"id": self.m.pk, "status": "finished"})
+
+        # sudah tidak live -> tidak dikirim lagi, hanya heartbeat
+        broker.publish("match", match_state(self.m))
+        self.assertEqual(next(stream), ": ping\n\n")
+
+        stream.close()
+        self.assertEqual(broker.subscriber_count, 0)
+
+    def test_score_write_publishes_to_broker(self):
+        from matches import live
+        q = live.broker.subscribe()
+        try:
+            user = get_user_model().objects.create_user("scorer", "pass")
+            self.client.force_login(user)
+            self.client.post(reverse("matches:score", args=[self.m.pk]),
+                             {"version": self.m.version, "q1_home": 30, "q1_away": 20})
+            event, state = q.get_nowait()
+            self.assertEqual(event, "match")
+            self.assertEqual((state["home_score"], state["away_score"]), (30, 20))
+        finally:
+            live.broker.unsubscribe(q)
+
+    def test_publish_costs_one_query_unless_periods_prefetched(self):
+        from matches import live
+        MatchPeriod.objects.create(match=self.m, number=1, home_points=10, away_points=8)
+        with self.assertNumQueries(1):
+            live.publish_match(self.m)
+        m = Match.objects.with_periods().get(pk=self.m.pk)
+        with self.assertNumQueries(0):
+            live.publish_match(m)
+
+    def test_async_stream_for_asgi(self):
+        from asgiref.sync import async_to_sync
+        from matches.live import DELETED, LocalBroker, aevent_stream
+        broker = LocalBroker()
+
+        async def scenario():
+            stream = aevent_stream(source=broker, heartbeat=0.01)
+            self.assertTrue((await anext(stream)).startswith("retry:"))
+            self.assertEqual(self._data(await anext(stream))[0]["home_score"], 10)
+            self.assertEqual(await anext(stream), ": ping\n\n")
+            broker.publish("match", {"id": self.m.pk, "status": DELETED})
+            self.assertEqual(self._data(await anext(stream)), {"id": self.m.pk, "status": DELETED})
+            self.assertEqual(broker.subscriber_count, 1)
+            await stream.aclose()
+
+        async_to_sync(scenario)()
+        self.assertEqual(broker.subscriber_count, 0)
+
+    def test_delete_publishes_to_broker(self):
+        from matches import live
+        q = live.broker.subscribe()
+        try:
+            self.client.force_login(get_user_model().objects.create_user("scorer", "pass"))
+            pk = self.m.pk
+            self.client.post(reverse("matches:delete", args=[pk]))
+            self.assertEqual(q.get_nowait(), ("match", {"id": pk, "status": live.DELETED}))
+        finally:
+            live.broker.unsubscribe(q)
+
+    def test_stream_view_headers(self):
+        resp = self.client.get(reverse("matches:live_stream"))
+        self.assertEqual(resp["Content-Type"], "text/event-stream")
+        self.assertEqual(resp["Cache-Control"], "no-cache")
+        resp.close()
+
+
+# ---- Scheduler status otomatis -----------------------------------------------
+class MatchSchedulerTests(TestCase):
+    def setUp(self):
+        self.now = make_aware(datetime(2025, 1, 10, 20, 0, 0))
+        lal, gsw = _team("LAL"), _team("GSW")
+
+        def mk(status, hours_ago, **kw):
+            return Match.objects.create(home_team=lal, away_team=gsw, status=status,
+                                        tipoff_at=self.now - timedelta(hours=hours_ago), **kw)
+
+        self.due = [mk("scheduled", 0.5), mk("scheduled", 1)]
+        self.future = mk("scheduled", -2)
+        self.over = mk("live", 4, home_score=100, away_score=90)
+        self.running = mk("live", 1)
+
+    def test_run_flips_due_matches_and_emits_events(self):
+        from matches import live, scheduler
+        from matches.signals import match_status_changed
+        batches = []
+
+        def listener(sender, matches, old_status, new_status, **kwargs):
+            batches.append((old_status, new_status, sorted(m.pk for m in matches)))
+
+        match_status_changed.connect(listener)
+        q = live.broker.subscribe()
+        try:
+            counts = scheduler.run(now=self.now, batch_size=1)
+        finally:
+            match_status_changed.disconnect(listener)
+            live.broker.unsubscribe(q)
+
+        self.assertEqual(counts, {"finished": 1, "live": 2})
+        statuses = dict(Match.objects.values_list("pk", "status"))
+        self.assertEqual(statuses[self.over.pk], "finished")
+        self.assertEqual(statuses[self.running.pk], "live")
+        self.assertEqual(statuses[self.future.pk], "scheduled")
+        self.assertTrue(all(statuses[m.pk] == "live" for m in self.due))
+        # batch_size=1 -> satu event per match, urut tipoff_at
+        self.assertEqual(batches, [
+            ("live", "finished", [self.over.pk]),
+            ("scheduled", "live", [self.due[1].pk]),
+            ("scheduled", "live", [self.due[0].pk]),
+        ])
+        self.assertEqual(q.qsize(), 3)
+        self.assertEqual(Standing.objects.get(team__name="LAL").wins, 1)
+        self.assertEqual(Match.objects.get(pk=self.over.pk).version, self.over.version + 1)
+
+    def test_tied_or_unscored_live_match_is_not_auto_finished(self):
+        from matches import scheduler
+        tied = Match.objects.create(home_team=_team("LAL"), away_team=_team("GSW"), status="live",
+                                    tipoff_at=self.now - timedelta(hours=5), home_score=88, away_score=88)
+        counts = scheduler.run(now=self.now)
+        self.assertEqual(counts["finished"], 1)
+        self.assertEqual(Match.objects.get(pk=tied.pk).status, "live")
+        self.assertEqual(list(scheduler.overdue(now=self.now)), [tied])
+
+    def test_batch_is_one_update(self):
+        from matches import scheduler
+        # select id + UPDATE + refetch (+ periode) untuk emit event
+        with self.assertNumQueries(4):
+            scheduler.transition("scheduled", "live", self.now, batch_size=10)
+
+    def test_command(self):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command("advance_match_status", stdout=out)
+        self.assertIn("match jadi live", out.getvalue())
+        self.assertFalse(Match.objects.filter(status="scheduled", tipoff_at__lte=timezone.now()).exists())
+
+
+# ---- Pemimpin stat di halaman hasil ---------------------------------------------
+class ResultLeadersTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        lal, gsw = _team("LAL"), _team("GSW")
+        self.players = [Player.objects.create(team="LAL", full_name=f"P{i}") for i in range(4)]
+        base = make_aware(datetime(2025, 1, 1, 19, 0))
+        self.matches = []
+        for d in range(6):
+            m = Match.objects.create(home_team=lal, away_team=gsw, tipoff_at=base + timedelta(days=d), status="finished")
+            PlayerBoxScore.objects.create(match=m, player=self.players[0], team=lal, pts=30 + d, reb=4, ast=9)
+            PlayerBoxScore.objects.create(match=m, player=self.players[1], team=lal, pts=10, reb=12, ast=9)
+            PlayerBoxScore.objects.create(match=m, player=self.players[2], team=gsw, pts=25, reb=7, ast=0)
+            self.matches.append(m)
+
+    def test_leaders_per_team(self):
+        from matches.stats import match_leaders
+        with self.assertNumQueries(1):
+            leaders = match_leaders([self.matches[0].pk])
+        lal = leaders[self.matches[0].pk][_team("LAL").pk]
+        self.assertEqual(lal["pts"], {"player": "P0", "value": 30})
+        self.assertEqual(lal["reb"], {"player": "P1", "value": 12})
+        self.assertEqual(lal["ast"]["player"], "P0")  # seri -> id terkecil
+        self.assertNotIn("ast", leaders[self.matches[0].pk][_team("GSW").pk])
+
+    def test_results_page_query_count_is_independent_of_page_size(self):
+        url = reverse("matches:results")
+        self.client.get(url)  # isi cache facet
+        for size in (2, 6):
+            # halaman + periode + pemimpin stat
+            with self.assertNumQueries(3):
+                resp = self.client.get(url, {"size": size})
+            self.assertContains(resp, "P0 35 pts")  # match terbaru di atas
+        self.assertContains(resp, "P1 12 reb", count=6)
+
+
+# ---- Rekonsiliasi box score ---------------------------------------------------
+class ReconcileBoxScoreTests(TestCase):
+    def setUp(self):
+        lal, gsw = _team("LAL"), _team("GSW")
+        self.players = [Player.objects.create(team="LAL", full_name=f"P{i}") for i in range(3)]
+        self.ok = Match.objects.create(home_team=lal, away_team=gsw, tipoff_at=timezone.now(),
+                                       status="finished", home_score=30, away_score=12)
+        self.bad = Match.objects.create(home_team=lal, away_team=gsw, tipoff_at=timezone.now(),
+                                        status="finished", home_score=40, away_score=12)
+        for m in (self.ok, self.bad):
+            PlayerBoxScore.objects.create(match=m, player=self.players[0], team=lal, pts=20, fg_made=8, fg_att=15)
+            PlayerBoxScore.objects.create(match=m, player=self.players[1], team=lal, pts=10)
+            PlayerBoxScore.objects.create(match=m, player=self.players[2], team=gsw, pts=12, ft_made=5, ft_att=4)
+
+    def test_grouped_queries_report_only_bad_matches(self):
+        from matches import reconcile
+        # dua daftar ber-LIMIT + dua COUNT + COUNT gabungan match bermasalah
+        with self.assertNumQueries(5):
+            result = reconcile.run()
+        self.assertEqual((result["score_count"], result["shooting_count"], result["problems"]), (1, 2, 2))
+        self.assertEqual(len(reconcile.run(limit=1)["shooting"]), 1)
+        self.assertEqual([r["match_id"] for r in result["scores"]], [self.bad.pk])
+        self.assertEqual(reconcile.format_score(result["scores"][0]), f"match={self.bad.pk} home pts=30 skor=40")
+        self.assertEqual([(r["match_id"], r["ft"], r["fg"]) for r in result["shooting"]],
+                         [(self.ok.pk, 1, 0), (self.bad.pk, 1, 0)])
+
+    def test_command_fails_with_compact_report(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("reconcile_boxscores", "--limit", "1", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn(f"match={self.bad.pk} home pts=30 skor=40", lines)
+        self.assertIn("... 1 match lain (tembakan)", lines)
+
+        PlayerBoxScore.objects.filter(ft_made=5).update(ft_att=5)
+        Match.objects.filter(pk=self.bad.pk).update(home_score=30)
+        call_command("reconcile_boxscores", stdout=out)
+        self.assertIn("0 match skor tidak cocok", out.getvalue())
+
+    def test_loop_survives_failed_round(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import DatabaseError
+        from matches import reconcile
+
+        class Stop(Exception):
+            pass
+
+        out, err = StringIO(), StringIO()
+        with mock.patch("matches.reconcile.run", side_effect=[DatabaseError("boom"), reconcile.run(50)]), \
+                mock.patch("main.management.commands.reconcile_boxscores.time.sleep", side_effect=[None, Stop]), \
+                self.assertLogs("main.management.commands.reconcile_boxscores", "ERROR"):
+            with self.assertRaises(Stop):
+                call_command("reconcile_boxscores", "--loop", stdout=out, stderr=err)
+        self.assertIn("boom", err.getvalue())
+        self.assertIn(f"match={self.bad.pk} home pts=30 skor=40", out.getvalue())
+
 
 # ---- Management command: import_matches_xlsx ---------------------------------
 class ImportMatchesXlsxCommandTests(TestCase):
@@ -584,15 +1557,15 @@ class ImportMatchesXlsxCommandTests(TestCase):
         call_command("import_matches_xlsx", str(path))
 
         self.assertEqual(Match.objects.count(), 2)
-        self.assertEqual(Match.objects.get(home_team="Boston Celtics").status, "finished")
+        self.assertEqual(Match.objects.get(home_team__name="Boston Celtics").status, "finished")
 
     def test_import_updates_existing(self):
         from django.core.management import call_command
 
         tip = make_aware(datetime(2025, 10, 24, 19, 30, 0))
         Match.objects.create(
-            home_team="Los Angeles Lakers",
-            away_team="Golden State Warriors",
+            home_team=_team("Los Angeles Lakers"),
+            away_team=_team("Golden State Warriors"),
             tipoff_at=tip,
             venue="Crypto.com Arena",
             status="scheduled",
@@ -609,10 +1582,29 @@ class ImportMatchesXlsxCommandTests(TestCase):
         call_command("import_matches_xlsx", str(path))
 
         self.assertEqual(Match.objects.count(), 1)  # updated not duplicated
-        m = Match.objects.get(home_team="Los Angeles Lakers", away_team="Golden State Warriors")
+        m = Match.objects.get(home_team__name="Los Angeles Lakers", away_team__name="Golden State Warriors")
         self.assertEqual(m.status, "finished")
         self.assertEqual(m.home_score, 112)
         self.assertEqual(m.away_score, 105)
+        self.assertEqual(Standing.objects.get(team__name="Los Angeles Lakers").wins, 1)
+        self.assertEqual(Standing.objects.get(team__name="Golden State Warriors").losses, 1)
+
+    def test_import_runs_the_shared_write_fan_out(self):
+        from django.core.management import call_command
+        from matches import live
+
+        rows = [["Los Angeles Lakers", "Golden State Warriors", "2025-10-24 19:30:00",
+                 "Crypto.com Arena", "live", 50, 48, "https://example.com/lal-gsw.jpg"]]
+        path = self._make_xlsx(rows)
+        q = live.broker.subscribe()
+        try:
+            with mock.patch("matches.signals.facets.invalidate") as invalidate:
+                call_command("import_matches_xlsx", str(path))
+            event, state = q.get_nowait()
+        finally:
+            live.broker.unsubscribe(q)
+        invalidate.assert_called_once_with()
+        self.assertEqual((event, state["status"], state["home_score"]), ("match", "live", 50))
 
     def test_import_invalid_data(self):
         from django.core.management import call_command
@@ -0,0 +1,114 @@
+# matches/today.py
+"""
+Snapshot "pertandingan hari ini" (tanggal lokal Asia/Jakarta + semua match live)
+untuk endpoint yang paling ramai di malam pertandingan.
+
+Snapshot (JSON + fragment HTML) dibangun sekali lalu dipakai bersama semua
+request selama FRESH_SECONDS. Setelah itu hanya satu request yang boleh
+membangun ulang (kunci via `cache.add`, atomik di backend cache mana pun);
+request lain tetap dilayani snapshot lama sampai yang baru siap. Jadi berapa pun
+jumlah viewer, database hanya kena ~2 query per detik per cache.
+"""
+import time
+from datetime import datetime, time as dtime, timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .live import match_state
+from .models import Match
+
+FRESH_SECONDS = 1
+# snapshot basi masih boleh dilayani selama ini saat rebuild sedang berjalan
+STALE_SECONDS = 30
+LOCK_SECONDS = 5
+# request pertama saat cache kosong: tunggu builder lain sebentar sebelum ikut query
+WAIT_SECONDS = 0.5
+POLL_SECONDS = 0.02
+
+
+def cache_key(day):
+    return f"matches:today:{day.isoformat()}"
+
+
+def _lock_key(day):
+    return f"{cache_key(day)}:lock"
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, dtime.min))
+    return start, start + timedelta(days=1)
+
+
+def games(day):
+    """Match yang tip-off di `day` (waktu lokal) ditambah semua yang sedang live; 2 query."""
+    start, end = _day_bounds(day)
+    return list(
+        Match.objects.filter(Q(tipoff_at__gte=start, tipoff_at__lt=end) | Q(status=Match.Status.LIVE))
+        .select_related("home_team", "away_team")
+        .with_periods()
+        .order_by("tipoff_at", "id")
+    )
+
+
+def _game_to_dict(m):
+    return {
+        **match_state(m),
+        "home_team": m.home_team.name,
+        "away_team": m.away_team.name,
+        "tipoff_at": m.tipoff_at.isoformat(),
+        "venue": m.venue,
+    }
+
+
+def build(day):
+    matches = games(day)
+    return {
+        "fresh_until": time.time() + FRESH_SECONDS,
+        "data": {
+            "date": day.isoformat(),
+            "generated_at": timezone.now().isoformat(),
+            "matches": [_game_to_dict(m) for m in matches],
+        },
+        "html": render_to_string("matches/_today.html", {"matches": matches}),
+    }
+
+
+def _rebuild(day):
+    entry = build(day)
+    cache.set(cache_key(day), entry, STALE_SECONDS)
+    return entry
+
+
+def snapshot(day=None):
+    """
+    Return {"data": {...}, "html": "..."} untuk `day` (default: hari ini).
+    Hanya pemegang kunci yang query; yang lain memakai snapshot lama atau
+    menunggu sebentar kalau belum ada sama sekali.
+    """
+    day = day or timezone.localdate()
+    key = cache_key(day)
+    entry = cache.get(key)
+    if entry is not None and entry["fresh_until"] > time.time():
+        return entry
+
+    lock = _lock_key(day)
+    if cache.add(lock, 1, LOCK_SECONDS):
+        try:
+            return _rebuild(day)
+        finally:
+            cache.delete(lock)
+
+    if entry is not None:
+        return entry
+
+    deadline = time.time() + WAIT_SECONDS
+    while time.time() < deadline:
+        time.sleep(POLL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    # builder lain macet/terlalu lama: lebih baik query sendiri daripada gagal
+    return _rebuild(day)
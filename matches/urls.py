@@ -8,12 +8,25 @@ urlpatterns = [
     path("results/", views.match_results, name="results"),
     path("create/", views.match_create, name="create"),
     path("<int:pk>/", views.match_detail, name="detail"),
+    path("<int:pk>/json/", views.match_detail_json, name="detail_json"),
     path("<int:pk>/edit/", views.match_edit, name="edit"),
     path("<int:pk>/score/", views.match_update_score, name="score"),
     path("<int:pk>/delete/", views.match_delete, name="delete"),
     path("<int:pk>/boxscore/add/", views.boxscore_add, name="boxscore_add"),
+    path("<int:pk>/boxscore/bulk/", views.boxscore_bulk, name="boxscore_bulk"),
     path("<int:pk>/boxscore/<int:box_id>/edit/", views.boxscore_edit, name="boxscore_edit"),
+    path("players/<int:player_id>/games/", views.player_game_log, name="player_game_log"),
+    path("players/<int:player_id>/games/json/", views.player_game_log_json, name="player_game_log_json"),
+    path("api/", views.matches_api, name="api"),
     path("json/", views.matches_json, name="api_json"),
     path("api/xml/", views.matches_xml, name="api_xml"),
+    path("today/", views.today_games, name="today"),
+    path("today/json/", views.today_games_json, name="today_json"),
+    path("live/stream/", views.live_scoreboard, name="live_stream"),
+    path("standings/json/", views.standings_json, name="standings_json"),
+    path("leaders/", views.leaderboards_page, name="leaderboards"),
+    path("leaders/json/", views.leaderboards_json, name="leaderboards_json"),
+    path("h2h/<int:team_a>/<int:team_b>/", views.head_to_head, name="head_to_head"),
+    path("h2h/<int:team_a>/<int:team_b>/json/", views.head_to_head_json, name="head_to_head_json"),
     path('create-flutter/', views.create_match_flutter, name='create_match_flutter'),
 ]
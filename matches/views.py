@@ -1,18 +1,23 @@
 # matches/views.py
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
-from django.http import HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError
+from django.db.models import F, Q
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_http_methods, require_POST
 
-from .forms import MatchForm, MatchScoreForm, PlayerBoxScoreForm
-from .models import Match, PlayerBoxScore
-
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+from .forms import (
+    BOXSCORE_STAT_FIELDS, BulkBoxScoreForm, MatchForm, MatchQueryForm, MatchScoreForm, PlayerBoxScoreForm,
+)
+from .models import Match, Player, PlayerBoxScore, Season, Standing, Team
+from .pagination import keyset_page, parse_page_size
+from .stats import match_leaders, team_totals
+from . import facets, h2h, leaderboards, live, schedule_days, signals, standings, today
+from .streaming import iter_json_array, iter_xml_elements, match_export_rows
 
 import json
 from django.http import JsonResponse
@@ -26,38 +31,213 @@ def _is_ajax(request):
     return request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
 
-# ---- public pages ------------------------------------------------------------
-def match_schedule(request):
-    q = (request.GET.get("q") or "").strip()
-    qs = Match.objects.select_related("season").order_by("tipoff_at")
+def _search(qs, q):
     if q:
         qs = qs.filter(
-            Q(home_team__icontains=q)
-            | Q(away_team__icontains=q)
+            Q(home_team__name__icontains=q)
+            | Q(away_team__name__icontains=q)
             | Q(venue__icontains=q)
         )
-    return render(request, "matches/match_schedule.html", {"matches": qs, "q": q})
+    return qs
 
 
-def match_results(request):
+def _match_to_dict(m):
+    return {
+        "id": m.pk,
+        "uuid": str(m.uuid),
+        "home_team": m.home_team.name,
+        "away_team": m.away_team.name,
+        "tipoff_at": m.tipoff_at.isoformat(),
+        "venue": m.venue,
+        "status": m.status,
+        "home_score": m.home_score,
+        "away_score": m.away_score,
+    }
+
+
+def _paged_list(request, qs, template, row_template, descending, decorate=None):
+    """
+    Render satu halaman keyset (?cursor=...&size=...).
+      - normal: render halaman penuh
+      - AJAX:   return {"ok": True, "matches": [...], "rows_html": "...", "next_cursor": "..."}
+    `decorate(matches)` dipanggil sekali per halaman untuk menempelkan data tambahan.
+    """
     q = (request.GET.get("q") or "").strip()
-    qs = (
-        Match.objects.select_related("season")
-        .filter(status="finished")
-        .order_by("-tipoff_at")
+    matches, next_cursor = keyset_page(
+        _search(qs, q),
+        cursor=request.GET.get("cursor"),
+        descending=descending,
+        size=parse_page_size(request.GET.get("size")),
     )
-    if q:
-        qs = qs.filter(
-            Q(home_team__icontains=q)
-            | Q(away_team__icontains=q)
-            | Q(venue__icontains=q)
+    if decorate:
+        decorate(matches)
+    if _is_ajax(request):
+        rows_html = "".join(
+            render_to_string(row_template, {"m": m}, request=request) for m in matches
         )
-    return render(request, "matches/match_results.html", {"matches": qs, "q": q})
+        return JsonResponse({
+            "ok": True,
+            "matches": [_match_to_dict(m) for m in matches],
+            "rows_html": rows_html,
+            "next_cursor": next_cursor,
+        })
+    return render(request, template, {
+        "matches": matches, "q": q, "next_cursor": next_cursor, "facets": facets.for_search(q, _search),
+    })
+
+
+# ---- public pages ------------------------------------------------------------
+def match_schedule(request):
+    """
+    Jadwal per hari lokal, `?size=` hari per halaman dan `?cursor=` = hari terakhir
+    halaman sebelumnya. Fragment hari yang sudah final diambil dari cache; hasil
+    pencarian (?q=) selalu dirender ulang.
+      - AJAX: return {"ok": True, "days": [...], "rows_html": "...", "next_cursor": "..."}
+    """
+    q = (request.GET.get("q") or "").strip()
+    days, matches, next_cursor = schedule_days.page(
+        _search(Match.objects.all(), q),
+        cursor=request.GET.get("cursor"),
+        size=parse_page_size(request.GET.get("size"), default=schedule_days.DAYS_PER_PAGE),
+        use_cache=not q,
+    )
+    if _is_ajax(request):
+        return JsonResponse({
+            "ok": True,
+            "days": [{"date": d["day"].isoformat(), "games": d["games"]} for d in days],
+            "rows_html": "".join(d["html"] for d in days),
+            "next_cursor": next_cursor,
+        })
+    return render(request, "matches/match_schedule.html", {
+        "days": days, "matches": matches, "q": q, "next_cursor": next_cursor,
+        "facets": facets.for_search(q, _search),
+    })
+
+
+def match_results(request):
+    qs = (
+        Match.objects.select_related("season", "home_team", "away_team")
+        .with_periods()
+        .filter(status=Match.Status.FINISHED)
+    )
+    return _paged_list(
+        request, qs, "matches/match_results.html", "matches/_result_row.html", descending=True,
+        decorate=_attach_leaders,
+    )
+
+
+def _attach_leaders(matches):
+    """`m.leaders` = [(tim, {"pts": .., "reb": .., "ast": ..}), ...] dari satu query window."""
+    leaders = match_leaders([m.pk for m in matches])
+    for m in matches:
+        by_team = leaders.get(m.pk, {})
+        m.leaders = [(team, by_team[team.pk]) for team in (m.home_team, m.away_team) if by_team.get(team.pk)]
+
+
+def _box_score_sections(m):
+    """
+    Semua box score match + pemainnya dalam satu query (select_related), dan total
+    per tim dari satu GROUP BY. Return list section home lalu away.
+    """
+    boxes = list(PlayerBoxScore.objects.filter(match=m).select_related("player"))
+    totals = team_totals(m.pk)
+    return [
+        {
+            "side": side,
+            "team": team,
+            "rows": [b for b in boxes if b.team_id == team.pk],
+            "totals": totals.get(team.pk),
+        }
+        for side, team in (("home", m.home_team), ("away", m.away_team))
+    ]
+
+
+def _box_score_to_dict(b):
+    data = {"id": b.pk, "player_id": b.player_id, "player": b.player.full_name,
+            "is_starter": b.is_starter, "minutes": float(b.minutes)}
+    for f in BOXSCORE_STAT_FIELDS:
+        data[f] = getattr(b, f)
+    return data
 
 
 def match_detail(request, pk):
-    m = get_object_or_404(Match.objects.select_related("season"), pk=pk)
-    return render(request, "matches/match_detail.html", {"match": m})
+    m = get_object_or_404(Match.objects.select_related("season", "home_team", "away_team"), pk=pk)
+    return render(request, "matches/match_detail.html", {"match": m, "box_sections": _box_score_sections(m)})
+
+
+def match_detail_json(request, pk):
+    m = get_object_or_404(Match.objects.select_related("home_team", "away_team"), pk=pk)
+    data = _match_to_dict(m)
+    data["box_scores"] = {
+        section["side"]: {
+            "team": section["team"].name,
+            "players": [_box_score_to_dict(b) for b in section["rows"]],
+            "totals": section["totals"],
+        }
+        for section in _box_score_sections(m)
+    }
+    return JsonResponse(data)
+
+
+# ---- Game log pemain ---------------------------------------------------------
+def _game_log(request, player_id):
+    """
+    Satu halaman game log (terbaru dulu) dibaca dari index (player, -tipoff_at, -id);
+    join ke Match/Team hanya untuk baris di halaman ini.
+    """
+    player = get_object_or_404(Player, pk=player_id)
+    qs = PlayerBoxScore.objects.filter(player=player).select_related(
+        "match__home_team", "match__away_team"
+    )
+    games, next_cursor = keyset_page(
+        qs,
+        cursor=request.GET.get("cursor"),
+        descending=True,
+        size=parse_page_size(request.GET.get("size")),
+    )
+    for b in games:
+        m = b.match
+        b.is_home = b.team_id == m.home_team_id
+        b.opponent = m.away_team if b.is_home else m.home_team
+        b.team_score, b.opp_score = (m.home_score, m.away_score) if b.is_home else (m.away_score, m.home_score)
+    return player, games, next_cursor
+
+
+def _game_log_to_dict(b):
+    data = {
+        "match_id": b.match_id,
+        "tipoff_at": b.tipoff_at.isoformat(),
+        "status": b.match.status,
+        "is_home": b.is_home,
+        "opponent": b.opponent.name,
+        "team_score": b.team_score,
+        "opponent_score": b.opp_score,
+        "is_starter": b.is_starter,
+        "minutes": float(b.minutes),
+    }
+    for f in BOXSCORE_STAT_FIELDS:
+        data[f] = getattr(b, f)
+    return data
+
+
+def player_game_log(request, player_id):
+    player, games, next_cursor = _game_log(request, player_id)
+    if _is_ajax(request):
+        rows_html = "".join(
+            render_to_string("matches/_game_log_row.html", {"b": b}, request=request) for b in games
+        )
+        return JsonResponse({"ok": True, "rows_html": rows_html, "next_cursor": next_cursor})
+    return render(request, "matches/player_game_log.html",
+                  {"player": player, "games": games, "next_cursor": next_cursor})
+
+
+def player_game_log_json(request, player_id):
+    player, games, next_cursor = _game_log(request, player_id)
+    return JsonResponse({
+        "player": {"id": player.pk, "full_name": player.full_name, "team": player.team},
+        "games": [_game_log_to_dict(b) for b in games],
+        "next_cursor": next_cursor,
+    })
 
 
 # ---- CRUD: Match -------------------------------------------------------------
@@ -82,6 +262,7 @@ def match_create(request):
     form = MatchForm(request.POST)
     if form.is_valid():
         match = form.save()
+        signals.match_written(match)
         if _is_ajax(request):
             row_html = render_to_string("matches/_match_row.html", {"m": match}, request=request)
             return JsonResponse({
@@ -111,7 +292,7 @@ def match_edit(request, pk):
       - POST normal: redirect
       - POST AJAX:  return {"ok": True} atau {"ok": False, "html_form": "..."}
     """
-    m = get_object_or_404(Match, pk=pk)
+    m = get_object_or_404(Match.objects.select_related("home_team", "away_team"), pk=pk)
 
     if request.method == "GET":
         form = MatchForm(instance=m)
@@ -121,9 +302,18 @@ def match_edit(request, pk):
         return render(request, "matches/match_form.html", {"form": form, "title": "Edit Pertandingan"})
 
     # POST
+    before = standings.snapshot(m)
     form = MatchForm(request.POST, instance=m)
     if form.is_valid():
-        form.save()
+        # version dari form sudah basi (orang lain menyimpan duluan) -> 409, tidak ada yang ditulis
+        if not form.save_if_current():
+            msg = "Match sudah diubah oleh pengguna lain. Muat ulang halaman lalu coba lagi."
+            if _is_ajax(request):
+                current = Match.objects.filter(pk=m.pk).values_list("version", flat=True).first()
+                return JsonResponse({"ok": False, "message": msg, "version": current}, status=409)
+            messages.error(request, msg)
+            return render(request, "matches/match_form.html", {"form": form, "title": "Edit Pertandingan"}, status=409)
+        signals.match_written(m, before)
         if _is_ajax(request):
             return JsonResponse({"ok": True, "message": "Match berhasil diperbarui!"})
         messages.success(request, "Match berhasil diperbarui!")
@@ -140,9 +330,11 @@ def match_edit(request, pk):
 @login_required
 @require_http_methods(["GET", "POST"])
 def match_delete(request, pk):
-    m = get_object_or_404(Match, pk=pk)
+    m = get_object_or_404(Match.objects.select_related("home_team", "away_team"), pk=pk)
     if request.method == "POST":
+        before = standings.snapshot(m)
         m.delete()
+        signals.match_written(m, before, deleted_pk=pk)
         messages.success(request, "Match berhasil dihapus!")
         return redirect("matches:schedule")
     return render(request, "matches/match_confirm_delete.html", {"match": m})
@@ -151,17 +343,36 @@ def match_delete(request, pk):
 @login_required
 @require_http_methods(["GET", "POST"])
 def match_update_score(request, pk):
-    m = get_object_or_404(Match, pk=pk)
+    """
+    Skor per-kuarter + total + version ditulis dalam satu UPDATE bersyarat.
+    Kalau version di form sudah basi (scorekeeper lain menyimpan duluan) -> 409.
+    """
+    m = get_object_or_404(Match.objects.select_related("home_team", "away_team"), pk=pk)
     if request.method == "POST":
+        before = standings.snapshot(m)
         form = MatchScoreForm(request.POST, instance=m)
         if form.is_valid():
-            form.save()
-            m.recalc_totals_from_periods(save=True)
-            messages.info(request, "Skor per-kuarter diperbarui dan direkalkulasi.")
-            return redirect("matches:detail", pk=m.pk)
+            if m.apply_period_scores(form.cleaned_data, form.cleaned_data["version"]):
+                signals.match_written(m, before)
+                if _is_ajax(request):
+                    return JsonResponse({"ok": True, "version": m.version,
+                                         "home_score": m.home_score, "away_score": m.away_score})
+                messages.info(request, "Skor per-kuarter diperbarui dan direkalkulasi.")
+                return redirect("matches:detail", pk=m.pk)
+
+            msg = "Skor sudah diubah oleh pengguna lain. Muat ulang halaman lalu coba lagi."
+            if _is_ajax(request):
+                current = Match.objects.filter(pk=m.pk).values_list("version", flat=True).first()
+                return JsonResponse({"ok": False, "message": msg, "version": current}, status=409)
+            messages.error(request, msg)
+            return render(request, "matches/match_score_form.html",
+                          {"form": form, "match": m, "title": "Update Skor Per-Kuarter"}, status=409)
+        if _is_ajax(request):
+            return JsonResponse({"ok": False, "errors": form.errors}, status=400)
         messages.error(request, "Gagal menyimpan skor. Periksa input Anda.")
-    else:
-        form = MatchScoreForm(instance=m)
+        return render(request, "matches/match_score_form.html",
+                      {"form": form, "match": m, "title": "Update Skor Per-Kuarter"}, status=400)
+    form = MatchScoreForm(instance=m)
     return render(request, "matches/match_score_form.html", {"form": form, "match": m, "title": "Update Skor Per-Kuarter"})
 
 
@@ -169,16 +380,17 @@ def match_update_score(request, pk):
 @login_required
 @require_http_methods(["GET", "POST"])
 def boxscore_add(request, pk):
-    m = get_object_or_404(Match, pk=pk)
+    m = get_object_or_404(Match.objects.select_related("home_team", "away_team"), pk=pk)
     if request.method == "POST":
         form = PlayerBoxScoreForm(request.POST, match=m)
         if form.is_valid():
             box = form.save(commit=False)
             box.match = m
-            if box.team not in (m.home_team, m.away_team):
+            if box.team_id not in (m.home_team_id, m.away_team_id):
                 messages.error(request, "Team boxscore harus home atau away pada match ini.")
                 return redirect("matches:detail", pk=m.pk)
             box.save()
+            leaderboards.invalidate(m.season_id)
             messages.success(request, "Box score ditambahkan.")
             return redirect("matches:detail", pk=m.pk)
         messages.error(request, "Gagal menyimpan box score. Periksa input Anda.")
@@ -190,16 +402,17 @@ def boxscore_add(request, pk):
 @login_required
 @require_http_methods(["GET", "POST"])
 def boxscore_edit(request, pk, box_id):
-    m = get_object_or_404(Match, pk=pk)
+    m = get_object_or_404(Match.objects.select_related("home_team", "away_team"), pk=pk)
     box = get_object_or_404(PlayerBoxScore, pk=box_id, match=m)
     if request.method == "POST":
         form = PlayerBoxScoreForm(request.POST, instance=box, match=m)
         if form.is_valid():
             b = form.save(commit=False)
-            if b.team not in (m.home_team, m.away_team):
+            if b.team_id not in (m.home_team_id, m.away_team_id):
                 messages.error(request, "Team boxscore harus home atau away pada match ini.")
                 return redirect("matches:detail", pk=m.pk)
             b.save()
+            leaderboards.invalidate(m.season_id)
             messages.success(request, "Box score diperbarui.")
             return redirect("matches:detail", pk=m.pk)
         messages.error(request, "Gagal menyimpan perubahan. Periksa input Anda.")
@@ -208,39 +421,172 @@ def boxscore_edit(request, pk, box_id):
     return render(request, "matches/boxscore_form.html", {"form": form, "match": m, "title": "Edit Box Score"})
 
 
+@login_required
+@require_POST
+def boxscore_bulk(request, pk):
+    """
+    Simpan box score satu tim sekaligus.
+    Body JSON: {"team": "...", "players": [{"player": <id>, "minutes": "32:15", "pts": 20, ...}],
+                "replace": false}
+    `replace: true` menghapus baris tim ini yang tidak ada di payload.
+    """
+    m = get_object_or_404(Match.objects.select_related("home_team", "away_team"), pk=pk)
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"ok": False, "message": "Body harus JSON."}, status=400)
+
+    form = BulkBoxScoreForm(m, data)
+    if not form.is_valid():
+        return JsonResponse({"ok": False, "errors": form.errors}, status=400)
+    try:
+        created, updated, deleted = form.save()
+    except IntegrityError:
+        return JsonResponse({"ok": False, "message": "Box score sedang diubah pengguna lain, coba lagi."}, status=409)
+    leaderboards.invalidate(m.season_id)
+    return JsonResponse({"ok": True, "created": created, "updated": updated, "deleted": deleted})
+
+
 # ---- Data endpoints (JSON/XML) ----------------------------------------------
+def matches_api(request):
+    """
+    Query match dengan filter `date_from`, `date_to`, `team`, `status`, `season`,
+    `venue`; urutan tetap (tipoff_at, id) dengan keyset `?cursor=` / `?size=`.
+    Setiap kombinasi filter dilayani index `(kolom_filter, tipoff_at)` di Match.
+    """
+    form = MatchQueryForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"ok": False, "errors": form.errors}, status=400)
+    matches, next_cursor = keyset_page(
+        form.apply(Match.objects.select_related("home_team", "away_team")),
+        cursor=request.GET.get("cursor"),
+        size=parse_page_size(request.GET.get("size")),
+    )
+    return JsonResponse({
+        "ok": True,
+        "matches": [{**_match_to_dict(m), "season_id": m.season_id} for m in matches],
+        "next_cursor": next_cursor,
+    })
+
+
 def matches_json(request):
-    matches = Match.objects.select_related("season").all()
-    data = [{
-        "uuid": str(m.uuid),
-        "home_team": m.home_team,
-        "away_team": m.away_team,
-        "tipoff_at": m.tipoff_at.isoformat(),
-        "venue": m.venue,
-        "status": m.status,
-        "home_score": m.home_score,
-        "away_score": m.away_score,
-    } for m in matches]
-    return JsonResponse(data, safe=False)
+    """Stream seluruh tabel match sebagai JSON array (memori tetap, byte pertama langsung)."""
+    rows = match_export_rows(Match.objects.all())
+    return StreamingHttpResponse(iter_json_array(rows), content_type="application/json")
 
 
 def matches_xml(request):
-    matches = Match.objects.select_related("season").all()
-    root = Element("matches")
-    for m in matches:
-        e = SubElement(root, "match")
-        SubElement(e, "uuid").text = str(m.uuid)
-        SubElement(e, "home_team").text = m.home_team
-        SubElement(e, "away_team").text = m.away_team
-        SubElement(e, "tipoff_at").text = m.tipoff_at.isoformat()
-        SubElement(e, "venue").text = m.venue or ""
-        SubElement(e, "status").text = m.status
-        SubElement(e, "home_score").text = str(m.home_score)
-        SubElement(e, "away_score").text = str(m.away_score)
-
-    xml_str = tostring(root, encoding="unicode")
-    pretty_xml = minidom.parseString(xml_str).toprettyxml(indent="  ")
-    return HttpResponse(pretty_xml, content_type="application/xml")
+    """Stream seluruh tabel match sebagai XML; `?pretty=1` untuk output berindentasi."""
+    pretty = request.GET.get("pretty") in ("1", "true", "yes")
+    rows = match_export_rows(Match.objects.all())
+    return StreamingHttpResponse(
+        iter_xml_elements(rows, root="matches", item="match", pretty=pretty),
+        content_type="application/xml",
+    )
+
+def live_scoreboard(request):
+    """
+    Server-Sent Events untuk match live: event `snapshot` lalu `score` (delta).
+    `?match=<pk>` untuk mengikuti satu pertandingan saja.
+    """
+    try:
+        match_id = int(request.GET["match"]) if request.GET.get("match") else None
+    except ValueError:
+        return JsonResponse({"ok": False, "message": "Parameter match tidak valid."}, status=400)
+    # di ASGI viewer cukup berupa coroutine; di WSGI tiap viewer memegang satu thread worker
+    stream = live.aevent_stream if isinstance(request, ASGIRequest) else live.event_stream
+    resp = StreamingHttpResponse(stream(match_id), content_type="text/event-stream")
+    resp["Cache-Control"] = "no-cache"
+    resp["X-Accel-Buffering"] = "no"
+    return resp
+
+
+def _season_param(request):
+    """`?season=<id>`; kosong = match tanpa season. Return (ok, season_id)."""
+    raw = request.GET.get("season") or None
+    if raw is None:
+        return True, None
+    try:
+        return True, int(raw)
+    except ValueError:
+        return False, None
+
+
+def standings_json(request):
+    """Klasemen dari tabel Standing; `?season=<id>` (kosong = match tanpa season)."""
+    ok, season = _season_param(request)
+    if not ok:
+        return JsonResponse({"ok": False, "message": "season harus berupa id."}, status=400)
+    rows = Standing.objects.filter(season_id=season).values(
+        "wins", "losses", "points_for", "points_against",
+        "home_wins", "home_losses", "away_wins", "away_losses", "streak",
+        team_name=F("team__name"),
+    )
+    rows = [{"team": r.pop("team_name"), **r} for r in rows]
+    return JsonResponse({"season": season, "standings": rows})
+
+def _head_to_head(request, team_a, team_b):
+    """Dua tim + rekap seri (cache / 1 query) + N match terakhir + periodenya: paling banyak 4 query."""
+    teams = Team.objects.in_bulk([team_a, team_b])
+    if team_a == team_b or len(teams) != 2:
+        raise Http404("Tim tidak ditemukan.")
+    try:
+        limit = min(max(int(request.GET.get("limit", h2h.RECENT_LIMIT)), 1), h2h.MAX_RECENT_LIMIT)
+    except (TypeError, ValueError):
+        limit = h2h.RECENT_LIMIT
+    return {
+        "team_a": teams[team_a],
+        "team_b": teams[team_b],
+        "series": h2h.series(team_a, team_b),
+        "recent": h2h.recent(team_a, team_b, limit),
+    }
+
+
+def head_to_head(request, team_a, team_b):
+    return render(request, "matches/head_to_head.html", _head_to_head(request, team_a, team_b))
+
+
+def head_to_head_json(request, team_a, team_b):
+    ctx = _head_to_head(request, team_a, team_b)
+    return JsonResponse({
+        "team_a": {"id": ctx["team_a"].pk, "name": ctx["team_a"].name},
+        "team_b": {"id": ctx["team_b"].pk, "name": ctx["team_b"].name},
+        "series": ctx["series"],
+        "recent": [_match_to_dict(m) for m in ctx["recent"]],
+    })
+
+
+def leaderboards_page(request):
+    ok, season = _season_param(request)
+    if not ok:
+        raise Http404("Season tidak valid.")
+    return render(request, "matches/leaderboards.html", {
+        "season": season,
+        "seasons": Season.objects.all(),
+        **leaderboards.season_leaders(season),
+    })
+
+
+def leaderboards_json(request):
+    ok, season = _season_param(request)
+    if not ok:
+        return JsonResponse({"ok": False, "message": "season harus berupa id."}, status=400)
+    return JsonResponse({"season": season, **leaderboards.season_leaders(season)})
+
+
+def _micro_cached(resp):
+    resp["Cache-Control"] = f"public, max-age={today.FRESH_SECONDS}"
+    return resp
+
+
+def today_games(request):
+    """Fragment HTML pertandingan hari ini; dipoll halaman jadwal di malam pertandingan."""
+    return _micro_cached(HttpResponse(today.snapshot()["html"]))
+
+
+def today_games_json(request):
+    return _micro_cached(JsonResponse(today.snapshot()["data"]))
+
 
 @csrf_exempt
 def create_match_flutter(request):
@@ -252,8 +598,8 @@ def create_match_flutter(request):
             # Contoh format: "2025-10-24T19:30:00"
             
             new_match = Match.objects.create(
-                home_team=data["home_team"],
-                away_team=data["away_team"],
+                home_team=Team.objects.get_or_create(name=data["home_team"].strip())[0],
+                away_team=Team.objects.get_or_create(name=data["away_team"].strip())[0],
                 tipoff_at=parse_datetime(data["tipoff_at"]),
                 venue=data["venue"],
                 image_url=data["image_url"],
@@ -263,6 +609,7 @@ def create_match_flutter(request):
             )
             
             new_match.save()
+            signals.match_written(new_match)
             return JsonResponse({"status": "success"}, status=200)
         except Exception as e:
             return JsonResponse({"status": "error", "message": str(e)}, status=500)
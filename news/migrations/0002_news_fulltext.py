@@ -0,0 +1,56 @@
+"""
+Full-text index untuk News (lihat news/search.py). Tidak ada perubahan model:
+struktur index-nya khusus per backend, jadi dibuat dengan SQL mentah.
+  - PostgreSQL: kolom generated tsvector + index GIN.
+  - SQLite: tabel FTS5 (rowid = rowid news_news) diisi dari baris yang sudah
+    ada; selanjutnya disinkronkan News.save()/delete().
+"""
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE news_news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX news_search_vector_gin ON news_news USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS news_search_vector_gin",
+    "ALTER TABLE news_news DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE news_news_fts USING fts5(
+        title, content, tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO news_news_fts(rowid, title, content) SELECT rowid, title, content FROM news_news",
+]
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS news_news_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,63 @@
+"""
+Kolom excerpt + word_count untuk kartu berita, lalu isi dari content yang
+sudah ada. Di SQLite AddField membangun ulang tabel news_news (rowid bisa
+bergeser), jadi tabel FTS dari 0002 ikut dibangun ulang.
+"""
+from django.db import migrations, models
+
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    # salinan beku news.models.make_excerpt saat migrasi ini dibuat
+    text = " ".join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip(".,;:!?") + "…"
+
+
+def backfill(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    batch = []
+    for news in News.objects.only('id', 'content').iterator(chunk_size=500):
+        news.excerpt = make_excerpt(news.content)
+        news.word_count = len(news.content.split())
+        batch.append(news)
+        if len(batch) >= 500:
+            News.objects.bulk_update(batch, ['excerpt', 'word_count'])
+            batch = []
+    News.objects.bulk_update(batch, ['excerpt', 'word_count'])
+
+
+def rebuild_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DELETE FROM news_news_fts")
+    schema_editor.execute(
+        "INSERT INTO news_news_fts(rowid, title, content) SELECT rowid, title, content FROM news_news"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_news_sort_indexes'),
+    ]
+
+    operations = [
+        # saat dibalik: bangun ulang FTS setelah kolom dibuang (operasi terakhir yang dibalik)
+        migrations.RunPython(migrations.RunPython.noop, rebuild_fts),
+        migrations.AddField(
+            model_name='news',
+            name='excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=201),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(rebuild_fts, migrations.RunPython.noop),
+    ]
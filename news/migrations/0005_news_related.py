@@ -0,0 +1,41 @@
+"""
+Index TF-IDF + tabel tetangga untuk berita terkait (lihat news/related.py).
+Hanya membuat tabel; isi untuk berita yang sudah ada dengan
+`python manage.py rebuild_related_news` setelah migrasi.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_news_excerpt_word_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.FloatField()),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='news.news')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term'], name='news_term_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedNews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='news.news')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='news.news')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['news', '-score'], name='news_related_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+"""
+Tabel FTS5 SQLite dikaitkan ke news_news lewat UUID (`id UNINDEXED`), bukan
+rowid: AddField/AlterField di SQLite membangun ulang news_news dan menomori
+ulang rowid, yang sebelumnya diam-diam memutus index. PostgreSQL tidak
+berubah (kolom generated di baris yang sama).
+"""
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    "DROP TABLE IF EXISTS news_news_fts",
+    """
+    CREATE VIRTUAL TABLE news_news_fts USING fts5(
+        id UNINDEXED, title, content, tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO news_news_fts(id, title, content) SELECT id, title, content FROM news_news",
+]
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS news_news_fts",
+    """
+    CREATE VIRTUAL TABLE news_news_fts USING fts5(
+        title, content, tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO news_news_fts(rowid, title, content) SELECT rowid, title, content FROM news_news",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for sql in statements:
+                schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_news_related'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(SQLITE_FORWARD), _run(SQLITE_BACKWARD)),
+    ]
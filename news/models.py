@@ -1,6 +1,20 @@
 from django.db import models
 import uuid
 
+from news import related, search
+
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """Cuplikan untuk kartu berita: spasi dirapikan, dipotong di batas kata."""
+    text = " ".join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip(".,;:!?") + "…"
+
+
 class News(models.Model):
     CATEGORY_CHOICES = [
         ('nba', 'NBA'),
@@ -19,6 +33,63 @@ class News(models.Model):
     category = models.CharField(max_length=50, choices=CATEGORY_CHOICES)
     published_at = models.DateTimeField(auto_now_add=True)
     thumbnail = models.URLField(blank=True, null=True)
+    # dihitung dari content setiap kali disimpan; dipakai list/kartu supaya
+    # tidak perlu memuat content penuh
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH + 1, blank=True, default='', editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        # satu index per kunci urut di show_news_page, dengan dan tanpa filter
+        # kategori; arah DESC (newest/title_desc) dilayani scan mundur index yang sama
+        indexes = [
+            models.Index(fields=['published_at'], name='news_published_idx'),
+            models.Index(fields=['category', 'published_at'], name='news_category_published_idx'),
+            models.Index(fields=['title'], name='news_title_idx'),
+            models.Index(fields=['category', 'title'], name='news_category_title_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.excerpt = make_excerpt(self.content)
+            self.word_count = len(self.content.split())
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt', 'word_count'}
+        super().save(*args, **kwargs)
+        if update_fields is None or {'title', 'content'} & set(update_fields):
+            search.index(self)
+            related.schedule(self)
+
+    def delete(self, *args, **kwargs):
+        search.unindex(self)
+        return super().delete(*args, **kwargs)
+
+    def __str__(self):
+        return self.title
+
+
+class NewsTerm(models.Model):
+    """Inverted index TF-IDF untuk berita terkait (lihat news/related.py)."""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=related.TERM_MAX_LENGTH)
+    weight = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['term'], name='news_term_idx'),
+        ]
+
+
+class RelatedNews(models.Model):
+    """Top-K tetangga satu berita, dihitung saat berita disimpan (news/related.py)."""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(News, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['news', '-score'], name='news_related_score_idx'),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.news_id} -> {self.related_id} ({self.score:.3f})"
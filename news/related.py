@@ -0,0 +1,196 @@
+"""
+Berita terkait berbasis TF-IDF yang dihitung di muka.
+
+Dua tabel (lihat news/models.py):
+  - NewsTerm: inverted index (term, news, weight). `weight` = tf-idf yang
+    dinormalisasi per berita (panjang vektor 1), jadi skor cosine dua berita
+    cukup jumlah hasil kali weight pada term yang sama. Kata di judul
+    dihitung TITLE_BOOST kali.
+  - RelatedNews: TOP_K tetangga per berita beserta skornya; halaman detail
+    dan JSON API cukup membaca baris ini lewat index (news, -score).
+
+`index(news)` dijalankan setelah commit (News.save() -> `schedule()`) saat
+judul/konten berubah, di luar transaksi request dan tanpa menggagalkan save
+kalau indexing error (error dicatat ke log): vektor berita
+itu ditulis ulang, tetangganya dicari hanya lewat QUERY_TERMS term paling
+khas (postings term umum tidak disentuh), lalu berita itu disisipkan ke daftar
+tetangga berita lain bila skornya masuk TOP_K mereka. IDF memakai statistik
+saat berita disimpan; `rebuild()` (command rebuild_related_news) menghitung
+ulang semuanya dengan IDF terbaru dan mengisi ulang daftar yang berkurang
+karena berita dihapus/diedit.
+"""
+import logging
+import math
+from collections import Counter, defaultdict
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count
+
+from news.search import tokens
+
+TOP_K = 5
+QUERY_TERMS = 25
+TITLE_BOOST = 3
+MIN_TERM_LENGTH = 3
+TERM_MAX_LENGTH = 64
+BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def _models(apps=None):
+    apps = apps or global_apps
+    return (
+        apps.get_model('news', 'News'),
+        apps.get_model('news', 'NewsTerm'),
+        apps.get_model('news', 'RelatedNews'),
+    )
+
+
+def term_counts(title, content):
+    """Frekuensi term judul+konten; angka dan kata pendek dibuang."""
+    counts = Counter()
+    for text, boost in ((title, TITLE_BOOST), (content, 1)):
+        for word in tokens(text):
+            if len(word) >= MIN_TERM_LENGTH and not word.isdigit():
+                counts[word[:TERM_MAX_LENGTH]] += boost
+    return counts
+
+
+def weigh(counts, df, total):
+    """Vektor tf-idf ter-normalisasi: {term: weight}."""
+    # idf dihaluskan (+1) supaya term yang ada di semua berita tetap berbobot kecil, bukan nol
+    vector = {
+        term: (1 + math.log(count)) * (math.log((1 + total) / (1 + df.get(term, 0))) + 1)
+        for term, count in counts.items()
+    }
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    if not norm:
+        return {}
+    return {term: w / norm for term, w in vector.items()}
+
+
+def _scores(NewsTerm, news_id, vector):
+    """Skor cosine berita lain terhadap `vector`, lewat QUERY_TERMS term terberat saja."""
+    query = dict(sorted(vector.items(), key=lambda item: -item[1])[:QUERY_TERMS])
+    scores = defaultdict(float)
+    postings = (
+        NewsTerm.objects.filter(term__in=list(query))
+        .exclude(news_id=news_id)
+        .values_list('news_id', 'term', 'weight')
+    )
+    for other_id, term, weight in postings:
+        scores[other_id] += query[term] * weight
+    return scores
+
+
+def _top(scores):
+    return sorted(scores.items(), key=lambda item: -item[1])[:TOP_K]
+
+
+def _replace_terms(NewsTerm, news_id, vector):
+    NewsTerm.objects.filter(news_id=news_id).delete()
+    NewsTerm.objects.bulk_create(
+        [NewsTerm(news_id=news_id, term=term, weight=weight) for term, weight in vector.items()],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _replace_neighbours(RelatedNews, news_id, top):
+    RelatedNews.objects.filter(news_id=news_id).delete()
+    RelatedNews.objects.bulk_create(
+        [RelatedNews(news_id=news_id, related_id=other_id, score=score) for other_id, score in top]
+    )
+
+
+def schedule(news):
+    """Jadwalkan `index()` untuk berita ini setelah transaksi yang sedang berjalan commit."""
+    transaction.on_commit(lambda pk=news.pk: _index_committed(pk))
+
+
+def _index_committed(pk):
+    News, _, _ = _models()
+    try:
+        news = News.objects.only('id', 'title', 'content').filter(pk=pk).first()
+        if news is not None:
+            index(news)
+    except Exception:
+        # berita terkait hanya pelengkap; rebuild_related_news memperbaikinya nanti
+        logger.exception("Gagal memperbarui berita terkait untuk %s", pk)
+
+
+def index(news):
+    """Perbarui vektor dan tetangga satu berita."""
+    _, NewsTerm, RelatedNews = _models()
+    counts = term_counts(news.title, news.content)
+    with transaction.atomic():
+        total = type(news).objects.count()
+        df = dict(
+            NewsTerm.objects.filter(term__in=list(counts)).exclude(news_id=news.pk)
+            .values_list('term').annotate(n=Count('id'))
+        )
+        # berita ini sendiri ikut dihitung di df
+        df = {term: df.get(term, 0) + 1 for term in counts}
+        vector = weigh(counts, df, total)
+        _replace_terms(NewsTerm, news.pk, vector)
+
+        top = _top(_scores(NewsTerm, news.pk, vector)) if vector else []
+        _replace_neighbours(RelatedNews, news.pk, top)
+
+        # daftar berita lain: buang skor lama ke berita ini, sisipkan skor baru
+        RelatedNews.objects.filter(related_id=news.pk).delete()
+        for other_id, score in top:
+            kept = list(
+                RelatedNews.objects.filter(news_id=other_id).order_by('-score').values_list('pk', 'score')
+            )
+            if len(kept) < TOP_K or score > kept[-1][1]:
+                RelatedNews.objects.create(news_id=other_id, related_id=news.pk, score=score)
+                RelatedNews.objects.filter(pk__in=[pk for pk, _ in kept[TOP_K - 1:]]).delete()
+
+
+def rebuild(apps=None):
+    """Hitung ulang seluruh index dengan IDF terbaru; mengembalikan jumlah berita."""
+    News, NewsTerm, RelatedNews = _models(apps)
+    rows = News.objects.only('id', 'title', 'content')
+
+    df = Counter()
+    for news in rows.iterator(chunk_size=BATCH_SIZE):
+        df.update(term_counts(news.title, news.content).keys())
+    total = News.objects.count()
+
+    with transaction.atomic():
+        RelatedNews.objects.all().delete()
+        NewsTerm.objects.all().delete()
+        vectors = {}
+        batch = []
+        for news in rows.iterator(chunk_size=BATCH_SIZE):
+            vectors[news.pk] = weigh(term_counts(news.title, news.content), df, total)
+            batch.extend(NewsTerm(news_id=news.pk, term=t, weight=w) for t, w in vectors[news.pk].items())
+            if len(batch) >= BATCH_SIZE:
+                NewsTerm.objects.bulk_create(batch)
+                batch = []
+        NewsTerm.objects.bulk_create(batch)
+
+        batch = []
+        for news_id, vector in vectors.items():
+            if not vector:
+                continue
+            top = _top(_scores(NewsTerm, news_id, vector))
+            batch.extend(RelatedNews(news_id=news_id, related_id=other_id, score=score) for other_id, score in top)
+        RelatedNews.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+    return total
+
+
+def related_news(news, limit=TOP_K):
+    """Tetangga tersimpan satu berita, satu query (index news+score, join ke News)."""
+    _, _, RelatedNews = _models()
+    return list(
+        RelatedNews.objects.filter(news_id=news.pk)
+        .select_related('related')
+        .only(
+            'score', 'related__id', 'related__title', 'related__excerpt',
+            'related__category', 'related__thumbnail', 'related__published_at',
+        )
+        .order_by('-score')[:limit]
+    )
@@ -0,0 +1,102 @@
+"""
+Full-text search berita.
+
+Index-nya dibuat di migrasi 0002 sesuai backend:
+  - PostgreSQL: kolom generated `search_vector` (tsvector, judul bobot A,
+    konten bobot B) + index GIN. Kolom generated selalu ikut berubah saat
+    baris di-INSERT/UPDATE, jadi tidak perlu sinkronisasi di Python.
+  - SQLite (dev): tabel FTS5 `news_news_fts(id UNINDEXED, title, content)`
+    (migrasi 0006), disinkronkan News.save()/delete() lewat `index()`/`unindex()`.
+    Baris FTS dikaitkan lewat UUID `id`, bukan rowid news_news, jadi migrasi
+    yang membangun ulang tabel news_news (rowid bergeser) tidak merusak index.
+
+`search(qs, query)` menyaring `qs` lewat index tsb dan menambahkan anotasi
+`search_rank` (makin besar makin relevan).
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "news_news_fts"
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokens(query):
+    """Kata-kata dari input bebas; tanda baca/operator dibuang supaya aman untuk MATCH/tsquery."""
+    return _TOKEN_RE.findall((query or "").lower())
+
+
+def _sqlite_only(func):
+    def wrapper(*args, **kwargs):
+        if connection.vendor == "sqlite":
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _db_pk(news):
+    return news._meta.pk.get_db_prep_value(news.pk, connection)
+
+
+@_sqlite_only
+def unindex(news):
+    """Hapus baris FTS satu berita (dipanggil News.delete())."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE id = %s", [_db_pk(news)])
+
+
+@_sqlite_only
+def index(news):
+    """Tulis ulang baris FTS satu berita (dipanggil News.save())."""
+    unindex(news)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(id, title, content) "
+            "SELECT id, title, content FROM news_news WHERE id = %s",
+            [_db_pk(news)],
+        )
+
+
+@_sqlite_only
+def rebuild():
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(f"INSERT INTO {FTS_TABLE}(id, title, content) SELECT id, title, content FROM news_news")
+
+
+def _sqlite(qs, words):
+    # setiap kata sebagai prefix ("kata"*), digabung AND
+    match = " ".join(f'"{w}"*' for w in words)
+    hit = RawSQL(
+        f"news_news.id IN (SELECT id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)",
+        [match], output_field=BooleanField(),
+    )
+    # bm25(): makin kecil makin relevan; judul diberi bobot 10x konten
+    rank = RawSQL(
+        f"(SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.id = news_news.id)",
+        [match], output_field=FloatField(),
+    )
+    return qs.filter(hit).annotate(search_rank=rank)
+
+
+def _postgresql(qs, words):
+    tsquery = " & ".join(f"{w}:*" for w in words)
+    hit = RawSQL(
+        "news_news.search_vector @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField()
+    )
+    rank = RawSQL(
+        "ts_rank(news_news.search_vector, to_tsquery('simple', %s))", [tsquery], output_field=FloatField()
+    )
+    return qs.filter(hit).annotate(search_rank=rank)
+
+
+def search(qs, query):
+    """Saring `qs` dengan full-text index; query tanpa kata apa pun -> `qs` apa adanya."""
+    words = tokens(query)
+    if not words:
+        return qs
+    if connection.vendor == "postgresql":
+        return _postgresql(qs, words)
+    return _sqlite(qs, words)
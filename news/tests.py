@@ -1,6 +1,11 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
 from django.test import TestCase, Client
 from django.urls import reverse
-from news.models import News
+from news.models import News, RelatedNews
+from news import related, search
+from news.views import SORT_ORDERING
 from main.models import CustomUser
 import json
 import uuid
@@ -451,9 +456,13 @@ class NewsPageTests(TestCase):
         self.assertIn('created_at', data[0])
         self.assertIn('id', data[0])
         self.assertIn('title', data[0])
-        self.assertIn('content', data[0])
+        self.assertIn('excerpt', data[0])
         self.assertIn('category', data[0])
         self.assertIn('thumbnail', data[0])
+        # content penuh hanya kalau diminta
+        self.assertNotIn('content', data[0])
+        data = self.client.get(reverse('news:show_json'), {'fields': 'card,content,user_id'}).json()
+        self.assertIn('content', data[0])
         self.assertIn('user_id', data[0])
     
     def test_show_json_data_structure(self):
@@ -507,8 +516,10 @@ class NewsPageTests(TestCase):
         response = self.client.get(reverse('news:show_xml'))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'application/xml')
-        self.assertContains(response, 'First News')
-        self.assertContains(response, 'Second News')
+        # response streaming hanya bisa dibaca sekali
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('First News', body)
+        self.assertIn('Second News', body)
     
     def test_show_xml_by_id_endpoint(self):
         """Test XML by ID endpoint"""
@@ -585,4 +596,226 @@ class NewsPageTests(TestCase):
     
     def test_news_app_configured(self):
         """Test news app terkonfigurasi dengan benar"""
-        self.assertTrue(True)
\ No newline at end of file
+        self.assertTrue(True)
+
+class NewsFullTextSearchTests(TestCase):
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='reader', password='testpass123', role='user')
+        self.lebron = News.objects.create(
+            title='LeBron James cetak rekor',
+            content='Lakers menang tipis atas Warriors.',
+            category='nba',
+        )
+        self.mention = News.objects.create(
+            title='Ringkasan pekan ini',
+            content='Catatan singkat: LeBron kembali bermain setelah cedera.',
+            category='nba',
+        )
+        self.other = News.objects.create(title='Timnas FIBA', content='Persiapan Asia Cup.', category='fiba')
+
+    def test_title_match_ranks_above_content_match(self):
+        """Judul berbobot lebih tinggi dari konten"""
+        results = list(search.search(News.objects.all(), 'lebron').order_by('-search_rank'))
+        self.assertEqual(results, [self.lebron, self.mention])
+
+    def test_index_follows_edit_and_delete(self):
+        """Index ikut berubah saat berita disimpan/dihapus"""
+        self.other.title = 'Timnas Indonesia vs Jepang'
+        self.other.save()
+        self.assertEqual(list(search.search(News.objects.all(), 'jepang')), [self.other])
+        self.assertFalse(search.search(News.objects.all(), 'fiba').exists())
+
+        self.lebron.delete()
+        self.assertEqual(list(search.search(News.objects.all(), 'lebron')), [self.mention])
+
+    @skipUnless(connection.vendor == 'sqlite', 'tabel FTS5 khusus SQLite')
+    def test_index_survives_rowid_renumbering(self):
+        """Rowid news_news bergeser (tabel dibangun ulang) tanpa memutus index"""
+        with connection.cursor() as cursor:
+            cursor.execute('UPDATE news_news SET rowid = rowid + 1000')
+        results = list(search.search(News.objects.all(), 'lebron').order_by('-search_rank'))
+        self.assertEqual(results, [self.lebron, self.mention])
+        self.mention.delete()
+        self.assertEqual(list(search.search(News.objects.all(), 'lebron')), [self.lebron])
+
+    def test_prefix_and_operator_characters_are_safe(self):
+        """Input bebas (tanda kutip/operator) tidak merusak query"""
+        self.assertEqual(list(search.search(News.objects.all(), 'warr"*')), [self.lebron])
+        self.assertEqual(search.search(News.objects.all(), '"!!"').count(), 3)
+
+    def test_page_defaults_to_relevance_when_searching(self):
+        """Halaman berita memakai index dan urutan relevansi"""
+        self.client.login(username='reader', password='testpass123')
+        response = self.client.get(reverse('news:show_news_page'), {'search': 'lebron'})
+        self.assertEqual(response.context['selected_sort'], 'relevance')
+        self.assertEqual(list(response.context['news_list']), [self.lebron, self.mention])
+
+    def test_search_json_endpoint(self):
+        """Endpoint JSON search mengembalikan hasil berperingkat"""
+        response = self.client.get(reverse('news:search_json'), {'q': 'lebron', 'limit': 1})
+        data = response.json()
+        self.assertEqual([r['id'] for r in data['results']], [str(self.lebron.id)])
+        self.assertIn('rank', data['results'][0])
+        self.assertEqual(self.client.get(reverse('news:search_json')).status_code, 400)
+
+
+class NewsSortIndexTests(TestCase):
+
+    # (mode urut, ada filter kategori) -> index yang harus dipakai
+    EXPECTED_INDEX = {
+        ('newest', False): 'news_published_idx',
+        ('oldest', False): 'news_published_idx',
+        ('title_asc', False): 'news_title_idx',
+        ('title_desc', False): 'news_title_idx',
+        ('newest', True): 'news_category_published_idx',
+        ('oldest', True): 'news_category_published_idx',
+        ('title_asc', True): 'news_category_title_idx',
+        ('title_desc', True): 'news_category_title_idx',
+    }
+
+    @skipUnless(connection.vendor == 'sqlite', 'format EXPLAIN khusus SQLite')
+    def test_every_sort_mode_reads_an_index_without_sorting(self):
+        """Semua mode urut, dengan/tanpa kategori, dilayani index yang tepat tanpa langkah sort"""
+        self.assertEqual({sort for sort, _ in self.EXPECTED_INDEX}, set(SORT_ORDERING))
+        for sort, ordering in SORT_ORDERING.items():
+            for category in ('', 'nba'):
+                qs = News.objects.all()
+                if category:
+                    qs = qs.filter(category=category)
+                plan = qs.order_by(*ordering).explain()
+                index = self.EXPECTED_INDEX[sort, bool(category)]
+                with self.subTest(sort=sort, category=category):
+                    self.assertRegex(plan, rf'USING (COVERING )?INDEX {index}\b')
+                    self.assertNotIn('TEMP B-TREE', plan.upper())
+
+
+class NewsExcerptTests(TestCase):
+
+    def setUp(self):
+        self.body = ' '.join(f'kata{i}' for i in range(120))
+        self.news = News.objects.create(title='Panjang', content=self.body, category='nba')
+
+    def test_excerpt_and_word_count_computed_on_write(self):
+        """Excerpt dan jumlah kata dihitung saat disimpan"""
+        self.assertEqual(self.news.word_count, 120)
+        self.assertTrue(self.news.excerpt.endswith('…'))
+        self.assertLessEqual(len(self.news.excerpt), 201)
+        self.assertTrue(self.body.startswith(self.news.excerpt[:-1]))
+
+        self.news.content = 'Singkat  saja.'
+        self.news.save(update_fields=['content'])
+        self.news.refresh_from_db()
+        self.assertEqual((self.news.excerpt, self.news.word_count), ('Singkat saja.', 2))
+
+    def test_show_json_fields_projection_loads_only_needed_columns(self):
+        """Default field kartu; ?fields= membatasi key JSON dan kolom yang di-SELECT"""
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('news:show_json'))
+        data = response.json()
+        self.assertEqual(set(data[0]), {'id', 'title', 'excerpt', 'word_count', 'category', 'thumbnail', 'created_at'})
+        self.assertNotIn('"content"', ctx.captured_queries[-1]['sql'])
+
+        data = self.client.get(reverse('news:show_json'), {'fields': 'id,word_count'}).json()
+        self.assertEqual(data, [{'id': str(self.news.id), 'word_count': 120}])
+        self.assertEqual(self.client.get(reverse('news:show_json'), {'fields': 'id,password'}).status_code, 400)
+
+    def test_news_page_renders_excerpt_without_loading_content(self):
+        """Halaman list tidak memuat content penuh"""
+        CustomUser.objects.create_user(username='reader', password='testpass123', role='user')
+        self.client.login(username='reader', password='testpass123')
+        response = self.client.get(reverse('news:show_news_page'))
+        self.assertContains(response, self.news.excerpt)
+        self.assertIn('content', response.context['news_list'][0].get_deferred_fields())
+
+
+class NewsXMLStreamTests(TestCase):
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='writer', password='testpass123', role='admin')
+        for i in range(5):
+            News.objects.create(title=f'Berita {i} & <xml>', content=f'Isi {i}', category='nba', user=self.user)
+        News.objects.create(title='Tanpa penulis', content='Isi', category='nba')
+
+    def test_stream_matches_django_xml_serializer(self):
+        """Output streaming identik dengan serializers.serialize("xml") walau dipecah per chunk (mengunci salinan loop serializer Django)"""
+        from django.core import serializers
+        from news.streaming import iter_xml
+        qs = News.objects.order_by('id')
+        chunks = list(iter_xml(qs, chunk_size=2))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(''.join(chunks), serializers.serialize('xml', qs))
+
+    def test_show_xml_is_streaming(self):
+        """Endpoint XML memakai StreamingHttpResponse"""
+        response = self.client.get(reverse('news:show_xml'))
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(body.count('<object model="news.news"'), 6)
+        self.assertIn('<field name="word_count" type="PositiveIntegerField">2</field>', body)
+
+
+class RelatedNewsTests(TestCase):
+
+    def setUp(self):
+        # index berita terkait berjalan lewat transaction.on_commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lakers = News.objects.create(
+                title='Lakers menang atas Celtics', content='LeBron James mencetak triple double, Lakers unggul di kuarter akhir.', category='nba'
+            )
+            self.lakers2 = News.objects.create(
+                title='LeBron bawa Lakers ke playoff', content='Lakers memastikan tiket playoff berkat LeBron James.', category='nba'
+            )
+            self.ibl = News.objects.create(
+                title='Pelita Jaya juara IBL', content='Pelita Jaya mengalahkan Satria Muda di final IBL.', category='ibl'
+            )
+
+    def test_neighbours_updated_on_create_and_edit(self):
+        """Tetangga tersimpan saat berita dibuat dan berubah saat diedit"""
+        self.assertEqual([link.related for link in related.related_news(self.lakers)], [self.lakers2])
+        self.assertEqual([link.related for link in related.related_news(self.lakers2)], [self.lakers])
+        self.assertEqual(related.related_news(self.ibl), [])
+
+        self.ibl.content = 'Satria Muda gagal, Pelita Jaya juara. LeBron James dan Lakers menonton?'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ibl.save()
+        self.assertIn(self.ibl, [link.related for link in related.related_news(self.lakers)])
+        self.assertEqual(related.related_news(self.lakers)[0].related, self.lakers2)
+
+    def test_rebuild_matches_incremental_index(self):
+        """rebuild() menghasilkan daftar yang sama untuk data yang stabil"""
+        before = sorted(RelatedNews.objects.values_list('news_id', 'related_id'))
+        self.assertEqual(related.rebuild(), 3)
+        self.assertEqual(sorted(RelatedNews.objects.values_list('news_id', 'related_id')), before)
+
+    def test_detail_and_json_read_related_in_one_query(self):
+        """Halaman detail dan JSON membaca tetangga dengan satu query"""
+        with self.assertNumQueries(1):
+            links = related.related_news(self.lakers)
+            self.assertEqual(links[0].related.title, self.lakers2.title)
+
+        data = self.client.get(reverse('news:show_json_by_id', args=[self.lakers.id])).json()
+        self.assertEqual([item['id'] for item in data['related']], [str(self.lakers2.id)])
+
+        response = self.client.get(reverse('news:show_news_detail', args=[self.lakers.id]))
+        self.assertEqual(response.context['related_news'], [self.lakers2])
+        self.assertContains(response, 'Related Stories')
+
+    def test_index_runs_after_commit_and_failure_keeps_save(self):
+        """Index berjalan setelah commit; error indexing tidak menggagalkan save"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.ibl.title = 'Lakers juara IBL'
+            self.ibl.save()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(related.related_news(self.ibl), [])
+
+        with mock.patch('news.related.index', side_effect=RuntimeError('boom')), \
+                self.assertLogs('news.related', level='ERROR'):
+            callbacks[0]()
+        self.assertEqual(News.objects.get(pk=self.ibl.pk).title, 'Lakers juara IBL')
+
+    def test_delete_removes_links(self):
+        """Menghapus berita ikut menghapus link ke berita itu"""
+        self.lakers2.delete()
+        self.assertEqual(related.related_news(self.lakers), [])
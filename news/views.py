@@ -2,7 +2,7 @@ import datetime
 from django.http import HttpResponseRedirect, JsonResponse
 from django.urls import reverse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.core import serializers
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib import messages
@@ -12,13 +12,14 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django.utils.html import strip_tags
 from news.models import News
+from news import related, search
+from news.streaming import iter_xml
 from news.forms import NewsForm
 from django.contrib.auth.decorators import login_required
 from main.decorators import login_required_custom
 import json
 import requests
 
-from django.db.models import Q
 
 @csrf_exempt
 def add_news_flutter(request):
@@ -46,31 +47,39 @@ def add_news_flutter(request):
     return JsonResponse({"status": "error", "message": "Invalid method"}, status=405)
 
 
+# urutan yang didukung show_news_page; masing-masing punya index di News.Meta
+SORT_ORDERING = {
+    'newest': ['-published_at'],
+    'oldest': ['published_at'],
+    'title_asc': ['title'],
+    'title_desc': ['-title'],
+}
+
+
 @login_required
 def show_news_page(request):
     category_filter = request.GET.get('category', '')
-    sort_by = request.GET.get('sort', 'newest')
     search_query = request.GET.get('search', '')
+    # hasil pencarian default-nya diurutkan dari yang paling relevan
+    sort_by = request.GET.get('sort') or ('relevance' if search_query else 'newest')
     
-    news_list = News.objects.all()
+    news_list = News.objects.only(
+        'id', 'user_id', 'title', 'excerpt', 'category', 'thumbnail', 'published_at'
+    )
     
     if category_filter:
         news_list = news_list.filter(category=category_filter)
     
-    if search_query:
-        news_list = news_list.filter(
-            Q(title__icontains=search_query) | 
-            Q(content__icontains=search_query)
-        )
+    searching = bool(search.tokens(search_query))
+    if searching:
+        news_list = search.search(news_list, search_query)
+    elif sort_by == 'relevance':
+        sort_by = 'newest'
     
-    if sort_by == 'oldest':
-        news_list = news_list.order_by('published_at')
-    elif sort_by == 'title_asc':
-        news_list = news_list.order_by('title')
-    elif sort_by == 'title_desc':
-        news_list = news_list.order_by('-title')
-    else:  
-        news_list = news_list.order_by('-published_at')
+    if sort_by == 'relevance':
+        news_list = news_list.order_by('-search_rank', '-published_at')
+    else:
+        news_list = news_list.order_by(*SORT_ORDERING.get(sort_by, SORT_ORDERING['newest']))
     
     categories = News.CATEGORY_CHOICES
     
@@ -88,6 +97,7 @@ def show_news_detail(request, news_id):
     news = get_object_or_404(News, id=news_id)
     context = {
         'news': news,
+        'related_news': [link.related for link in related.related_news(news)],
     }
     return render(request, 'news_detail.html', context)
 
@@ -191,9 +201,8 @@ def delete_news(request, id):
         return JsonResponse({"status": "error", "message": str(e)}, status=500)
 
 def show_xml(request):
-    news = News.objects.all()
-    xml_data = serializers.serialize("xml", news)
-    return HttpResponse(xml_data, content_type="application/xml")
+    # skema sama dengan serializers.serialize("xml"), tapi ditulis per chunk
+    return StreamingHttpResponse(iter_xml(News.objects.all()), content_type="application/xml")
 
 def show_xml_by_id(request, id):
     try:
@@ -203,21 +212,55 @@ def show_xml_by_id(request, id):
     except News.DoesNotExist:
         return HttpResponse(status=404)
     
+# key JSON list -> (kolom model yang perlu dimuat, cara membaca nilainya)
+LIST_FIELDS = {
+    'id': ('id', lambda news: str(news.id)),
+    'user_id': ('user_id', lambda news: str(news.user_id) if news.user_id else None),
+    'title': ('title', lambda news: news.title),
+    'content': ('content', lambda news: news.content),
+    'excerpt': ('excerpt', lambda news: news.excerpt),
+    'word_count': ('word_count', lambda news: news.word_count),
+    'category': ('category', lambda news: news.category),
+    'thumbnail': ('thumbnail', lambda news: news.thumbnail),
+    'created_at': ('published_at', lambda news: news.published_at.isoformat()),
+}
+# default semua endpoint list: field kartu saja, content penuh hanya lewat ?fields=
+CARD_FIELDS = ['id', 'title', 'excerpt', 'word_count', 'category', 'thumbnail', 'created_at']
+
+
+def parse_fields(raw, default):
+    """
+    `?fields=id,title,...`; `card` = CARD_FIELDS (mis. `?fields=card,content`).
+    Return (list key, None) atau (None, pesan error) kalau ada key yang tidak dikenal.
+    """
+    if not raw:
+        return default, None
+    fields = []
+    for f in raw.split(','):
+        f = f.strip()
+        keys = CARD_FIELDS if f == 'card' else [f] if f else []
+        fields += [key for key in keys if key not in fields]
+    unknown = [f for f in fields if f not in LIST_FIELDS]
+    if unknown or not fields:
+        return None, f"Unknown fields: {', '.join(unknown) or raw}"
+    return fields, None
+
+
+def project(queryset, fields, extra=None):
+    """
+    `.only()` kolom yang dibutuhkan `fields` lalu ubah tiap baris jadi dict.
+    `extra` = {key: fungsi(news)} untuk nilai anotasi (mis. rank pencarian).
+    """
+    columns = {LIST_FIELDS[f][0] for f in fields}
+    readers = [(f, LIST_FIELDS[f][1]) for f in fields] + list((extra or {}).items())
+    return [{key: read(news) for key, read in readers} for news in queryset.only(*columns)]
+
+
 def show_json(request):
-    news_list = News.objects.all()
-    data = [
-        {
-            'id': str(news.id),
-            'user_id': str(news.user.id) if news.user else None,
-            'title': news.title,
-            'content': news.content,
-            'category': news.category,
-            'thumbnail': news.thumbnail,
-            'created_at': news.published_at.isoformat(), 
-        }
-        for news in news_list
-    ]
-    return JsonResponse(data, safe=False)
+    fields, error = parse_fields(request.GET.get('fields'), CARD_FIELDS)
+    if error:
+        return JsonResponse({"status": "error", "message": error}, status=400)
+    return JsonResponse(project(News.objects.all(), fields), safe=False)
 
 def get_news_json(request, id):
     try:
@@ -235,6 +278,44 @@ def get_news_json(request, id):
         print(f"Error in get_news_json: {str(e)}")
         return JsonResponse({"status": "error", "message": str(e)}, status=500)
 
+def search_json(request):
+    """
+    Full-text search berita: ?q=...&category=...&limit=... (maks 50),
+    diurutkan dari yang paling relevan.
+    """
+    query = request.GET.get('q', '')
+    if not search.tokens(query):
+        return JsonResponse({"status": "error", "message": "q is required"}, status=400)
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), 50))
+    except ValueError:
+        limit = 20
+
+    news_list = News.objects.all()
+    category = request.GET.get('category', '')
+    if category:
+        news_list = news_list.filter(category=category)
+    fields, error = parse_fields(request.GET.get('fields'), CARD_FIELDS)
+    if error:
+        return JsonResponse({"status": "error", "message": error}, status=400)
+    news_list = search.search(news_list, query).order_by('-search_rank', '-published_at')[:limit]
+    data = project(news_list, fields, extra={'rank': lambda news: news.search_rank})
+    return JsonResponse({"query": query, "results": data})
+
+def related_payload(links):
+    return [
+        {
+            'id': str(link.related.id),
+            'title': link.related.title,
+            'excerpt': link.related.excerpt,
+            'category': link.related.category,
+            'thumbnail': link.related.thumbnail,
+            'created_at': link.related.published_at.isoformat() if link.related.published_at else None,
+            'score': round(link.score, 4),
+        }
+        for link in links
+    ]
+
 def show_json_by_id(request, news_id):
     try:
         news = News.objects.select_related('user').get(pk=news_id)
@@ -245,6 +326,7 @@ def show_json_by_id(request, news_id):
             'category': news.category,
             'thumbnail': news.thumbnail,
             'created_at': news.published_at.isoformat() if news.published_at else None,
+            'related': related_payload(related.related_news(news)),
         }
         return JsonResponse(data)
     except News.DoesNotExist: